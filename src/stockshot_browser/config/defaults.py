@@ -169,7 +169,8 @@ DEFAULT_CONFIG = {
         },
     },
     "performance": {
-        "max_concurrent_thumbnails": 4,
+        "max_concurrent_thumbnails": 0,  # 0 = one per CPU core
+        "max_scan_workers": 0,  # 0 = based on CPU count
         "thumbnail_cache_size": 100000,
         "metadata_cache_size": 500000,
         "lazy_loading": True,
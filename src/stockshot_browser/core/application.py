@@ -291,6 +291,9 @@ class StockshotBrowserApp(QObject):
             self._auto_save()
             
             # Shutdown managers
+            if self.multi_metadata_manager:
+                self.multi_metadata_manager.shutdown()
+            
             if self.multi_thumbnail_manager:
                 self.multi_thumbnail_manager.shutdown()
             elif self.thumbnail_manager:
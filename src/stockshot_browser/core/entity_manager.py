@@ -3,7 +3,7 @@ Entity management for Stockshot Browser.
 """
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Set
@@ -30,10 +30,11 @@ class MediaEntity:
     path: Path
     entity_type: EntityType
     name: str
-    files: List[Path]  # For sequences, contains all files
+    files: List[Path] = field(default_factory=list)  # For sequences, contains all files
     frame_range: Optional[tuple] = None  # (start_frame, end_frame)
     file_size: Optional[int] = None  # Total size in bytes
     frame_count: Optional[int] = None  # Number of frames for sequences
+    mtime: Optional[int] = None  # st_mtime_ns of the source file
 
 
 class EntityManager(QObject):
@@ -205,13 +206,16 @@ class EntityManager(QObject):
             # Sort files for consistent ordering
             image_files.sort()
             
-            # Calculate total size
+            # Calculate total size and newest modification time
             total_size = 0
+            mtime = None
             for file_path in image_files:
                 try:
-                    total_size += file_path.stat().st_size
+                    stat = file_path.stat()
                 except OSError:
-                    pass
+                    continue
+                total_size += stat.st_size
+                mtime = max(mtime or 0, stat.st_mtime_ns)
             
             # Try to detect sequences within the folder to get frame range info
             frame_range = (1, len(image_files))  # Default frame range
@@ -233,7 +237,8 @@ class EntityManager(QObject):
                 files=image_files,  # Use all image files sorted
                 frame_range=frame_range,
                 file_size=total_size if total_size > 0 else None,
-                frame_count=len(image_files)
+                frame_count=len(image_files),
+                mtime=mtime
             )
                 
         except Exception as e:
@@ -409,26 +414,31 @@ class EntityManager(QObject):
     def _create_video_entity(self, video_file: Path) -> MediaEntity:
         """Create a video entity."""
         try:
-            file_size = video_file.stat().st_size
+            stat = video_file.stat()
+            file_size, mtime = stat.st_size, stat.st_mtime_ns
         except OSError:
-            file_size = None
+            file_size = mtime = None
         
         return MediaEntity(
             path=video_file,
             entity_type=EntityType.VIDEO,
             name=video_file.stem,
             files=[video_file],
-            file_size=file_size
+            file_size=file_size,
+            mtime=mtime
         )
     
     def _create_sequence_entity(self, sequence_info: dict) -> MediaEntity:
         """Create a sequence entity from sequence detection info."""
         total_size = 0
+        mtime = None
         for file_path in sequence_info['files']:
             try:
-                total_size += file_path.stat().st_size
+                stat = file_path.stat()
             except OSError:
-                pass
+                continue
+            total_size += stat.st_size
+            mtime = max(mtime or 0, stat.st_mtime_ns)
         
         # Create sequence as VIDEO entity to make it appear as single video entity in Content View
         return MediaEntity(
@@ -438,15 +448,17 @@ class EntityManager(QObject):
             files=sequence_info['files'],
             frame_range=sequence_info['frame_range'],
             file_size=total_size if total_size > 0 else None,
-            frame_count=sequence_info['frame_count']
+            frame_count=sequence_info['frame_count'],
+            mtime=mtime
         )
     
     def _create_individual_image_entity(self, image_file: Path) -> MediaEntity:
         """Create an entity for an individual image file."""
         try:
-            file_size = image_file.stat().st_size
+            stat = image_file.stat()
+            file_size, mtime = stat.st_size, stat.st_mtime_ns
         except OSError:
-            file_size = None
+            file_size = mtime = None
         
         # Create individual image as VIDEO entity to make it appear as single video entity in Content View
         return MediaEntity(
@@ -456,7 +468,8 @@ class EntityManager(QObject):
             files=[image_file],
             frame_range=(1, 1),
             file_size=file_size,
-            frame_count=1
+            frame_count=1,
+            mtime=mtime
         )
     
     def get_entity_info(self, entity: MediaEntity) -> dict:
@@ -5,17 +5,155 @@ Metadata export functionality for Stockshot Browser.
 import logging
 import json
 import csv
-import xml.etree.ElementTree as ET
+import re
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from xml.sax.saxutils import escape
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from datetime import date, datetime
+
+from sqlalchemy import func, select, text
 
 from ..config.manager import ConfigurationManager
 from ..database.connection import DatabaseManager
-from ..database.models import Entity, Metadata, Thumbnail, Favorite, Tag
+from ..database.models import Entity, Metadata, Thumbnail, Favorite, Tag, entity_tags
 
 logger = logging.getLogger(__name__)
 
+# Receives (percent, status message) while an export runs
+ProgressCallback = Callable[[int, str], None]
+
+
+# Columns selected for each exported record type. Selecting columns directly
+# (rather than full ORM instances) skips identity-map bookkeeping and lets the
+# rows be materialized straight into dicts.
+_ENTITY_COLUMNS = (
+    Entity.id, Entity.path, Entity.name, Entity.entity_type, Entity.file_size,
+    Entity.file_count, Entity.thumbnail_generated, Entity.created_at,
+    Entity.last_accessed,
+)
+
+_METADATA_COLUMNS = (
+    Metadata.id, Metadata.entity_id, Metadata.category, Metadata.duration,
+    Metadata.fps, Metadata.width, Metadata.height, Metadata.aspect_ratio,
+    Metadata.format, Metadata.codec, Metadata.audio_codec, Metadata.colorspace,
+    Metadata.bit_depth, Metadata.bitrate, Metadata.frame_count,
+    Metadata.has_audio, Metadata.custom_fields, Metadata.extracted_at,
+)
+
+_THUMBNAIL_COLUMNS = (
+    Thumbnail.id, Thumbnail.entity_id, Thumbnail.path, Thumbnail.resolution,
+    Thumbnail.file_size, Thumbnail.generation_time, Thumbnail.source_frame,
+    Thumbnail.is_valid, Thumbnail.generated_at, Thumbnail.extra_data,
+)
+
+_FAVORITE_COLUMNS = (
+    Favorite.id, Favorite.entity_id, Favorite.user_id, Favorite.project_id,
+    Favorite.created_at,
+)
+
+_TAG_COLUMNS = (
+    Tag.id, Tag.name, Tag.color, Tag.description, Tag.created_at,
+)
+
+
+# SQLite page cache used while scanning tables for export (negative values
+# are KiB, i.e. 256 MiB) and result partition size for streamed selects.
+# Memory mapping and in-memory temp storage are already enabled per
+# connection by DatabaseManager.
+_EXPORT_CACHE_SIZE = -262144
+_EXPORT_FETCH_SIZE = 5000
+
+# Upper bound on bound parameters per IN clause (older SQLite builds cap a
+# statement at 999 variables)
+_IN_CLAUSE_BATCH_SIZE = 500
+
+
+def _batched(values: List[Any], size: int = _IN_CLAUSE_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Yield successive slices of ``values`` suitable for an IN clause."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _format_value(value: Any) -> str:
+    """Convert a raw column value to text for CSV/XML output."""
+    if type(value) is str:
+        return value
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+# XML container element and per-record element name for each exported section
+_XML_SECTIONS = (
+    ('entities', 'entity'),
+    ('metadata', 'metadata_record'),
+    ('thumbnails', 'thumbnail'),
+    ('favorites', 'favorite'),
+    ('tags', 'tag'),
+)
+
+
+_XML_FIELD_SEPARATOR = '\x00'
+
+
+def _xml_row_template(tag: str, keys: Tuple[str, ...], indent: str) -> str:
+    """Build a str.format template rendering one record with a child element per key."""
+    child_indent = indent + '  '
+    children = ''.join(
+        f"{child_indent}<{key}>{{{index}}}</{key}>\n" for index, key in enumerate(keys)
+    )
+    return f"{indent}<{tag}>\n{children}{indent}</{tag}>\n"
+
+
+def _render_xml_row(template: str, row: Dict[str, Any]) -> str:
+    """Render a record through a template built for its key order."""
+    values = [_format_value(value) for value in row.values()]
+    
+    # Escape the whole row in one pass, using NUL (not representable in XML
+    # 1.0) as field separator; fall back to per-value escaping if a value
+    # happens to contain one
+    joined = _XML_FIELD_SEPARATOR.join(values)
+    if joined.count(_XML_FIELD_SEPARATOR) == len(values) - 1:
+        return template.format(*escape(joined).split(_XML_FIELD_SEPARATOR))
+    return template.format(*[escape(value) for value in values])
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback serializer for values produced by column selects."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class RawJSON:
+    """Pre-serialized JSON text that the JSON writer emits verbatim."""
+    
+    __slots__ = ('text',)
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    def __str__(self) -> str:
+        return self.text
+    
+    __repr__ = __str__
+
+
+# Placeholder emitted by the JSON encoder for RawJSON values, as it appears
+# once encoded (control characters are always escaped by json)
+_RAW_JSON_PLACEHOLDER = re.compile(r'"\\u0000raw:(\d+)\\u0000"')
+
+
+def _raw_json_field(text: Optional[str]) -> Any:
+    """Wrap a stored JSON object string so it is exported without a parse round trip."""
+    if text and text.startswith('{') and text.endswith('}'):
+        return RawJSON(text)
+    return text
+
 
 class MetadataExporter:
     """Export metadata and project data in various formats."""
@@ -27,13 +165,17 @@ class MetadataExporter:
         # Supported export formats
         self.supported_formats = ['json', 'csv', 'xml']
         
+        # Background executor for the *_async exports, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
         logger.info("MetadataExporter initialized")
     
     def export_project_data(self, output_path: Path, format: str = 'json', 
                            project_name: Optional[str] = None,
                            include_thumbnails: bool = False,
                            include_favorites: bool = True,
-                           include_tags: bool = True) -> bool:
+                           include_tags: bool = True,
+                           progress_callback: Optional[ProgressCallback] = None) -> bool:
         """
         Export complete project data.
         
@@ -44,6 +186,7 @@ class MetadataExporter:
             include_thumbnails: Include thumbnail information
             include_favorites: Include favorites data
             include_tags: Include tags data
+            progress_callback: Called with (percent, status) as the export advances
             
         Returns:
             True if export successful, False otherwise
@@ -58,9 +201,13 @@ class MetadataExporter:
                 project_name=project_name,
                 include_thumbnails=include_thumbnails,
                 include_favorites=include_favorites,
-                include_tags=include_tags
+                include_tags=include_tags,
+                progress_callback=progress_callback
             )
             
+            if progress_callback:
+                progress_callback(80, f"Writing {format.upper()} file...")
+            
             # Export based on format
             if format == 'json':
                 return self._export_json(data, output_path)
@@ -75,6 +222,114 @@ class MetadataExporter:
         
         return False
     
+    def export_project_data_async(self, output_path: Path, format: str = 'json',
+                                 project_name: Optional[str] = None,
+                                 include_thumbnails: bool = False,
+                                 include_favorites: bool = True,
+                                 include_tags: bool = True,
+                                 progress_callback: Optional[ProgressCallback] = None) -> Future:
+        """
+        Run export_project_data on the exporter's background thread.
+        
+        Exports submitted to the same exporter run one at a time; the returned
+        future resolves to the export_project_data result. The progress
+        callback is invoked from the background thread.
+        """
+        return self._submit(
+            self.export_project_data,
+            output_path,
+            format,
+            project_name=project_name,
+            include_thumbnails=include_thumbnails,
+            include_favorites=include_favorites,
+            include_tags=include_tags,
+            progress_callback=progress_callback
+        )
+    
+    def export_entity_list_async(self, entities: List[Any], output_path: Path,
+                                 format: str = 'json') -> Future:
+        """
+        Run export_entity_list on the exporter's background thread.
+        
+        The returned future resolves to the export_entity_list result.
+        """
+        return self._submit(self.export_entity_list, entities, output_path, format)
+    
+    def _submit(self, export: Callable[..., bool], *args, **kwargs) -> Future:
+        """Queue an export on the background thread; exports run one at a time."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-export")
+        return self._executor.submit(export, *args, **kwargs)
+    
+    def close(self) -> None:
+        """Shut down the background export thread, letting a running export finish."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def export_project_data_multi(self, output_dir: Path, formats: List[str],
+                                 file_stem: str = 'stockshot_export',
+                                 project_name: Optional[str] = None,
+                                 include_thumbnails: bool = False,
+                                 include_favorites: bool = True,
+                                 include_tags: bool = True) -> Dict[str, bool]:
+        """
+        Export project data to several formats from a single data collection.
+        
+        The database is read once; the per-format writers then run
+        concurrently since they spend most of their time in file I/O.
+        
+        Args:
+            output_dir: Directory receiving one ``<file_stem>.<format>`` file per format
+            formats: Export formats ('json', 'csv', 'xml')
+            file_stem: Base name of the output files
+            project_name: Specific project to export (None for all)
+            include_thumbnails: Include thumbnail information
+            include_favorites: Include favorites data
+            include_tags: Include tags data
+            
+        Returns:
+            Mapping of format to export success
+        """
+        results = {fmt: False for fmt in formats}
+        
+        unsupported = [fmt for fmt in formats if fmt not in self.supported_formats]
+        if unsupported:
+            logger.error(f"Unsupported export format(s): {', '.join(unsupported)}")
+        
+        writers = {
+            'json': self._export_json,
+            'csv': self._export_csv,
+            'xml': self._export_xml,
+        }
+        targets = [fmt for fmt in dict.fromkeys(formats) if fmt in writers]
+        if not targets:
+            return results
+        
+        try:
+            # Collect data once for every format
+            data = self._collect_project_data(
+                project_name=project_name,
+                include_thumbnails=include_thumbnails,
+                include_favorites=include_favorites,
+                include_tags=include_tags
+            )
+        except Exception as e:
+            logger.error(f"Error exporting project data: {e}")
+            return results
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = {
+                fmt: executor.submit(writers[fmt], data, output_dir / f"{file_stem}.{fmt}")
+                for fmt in targets
+            }
+            for fmt, future in futures.items():
+                results[fmt] = future.result()
+        
+        return results
+    
     def export_entity_list(self, entities: List[Any], output_path: Path, 
                           format: str = 'json') -> bool:
         """
@@ -92,43 +347,69 @@ class MetadataExporter:
             # Convert entities to export format
             entity_data = []
             
+            paths = [str(entity.path) for entity in entities]
+            db_entities = {}
+            metadata_by_entity = {}
+            
             with self.database_manager.get_session() as session:
-                for entity in entities:
-                    # Find entity in database
-                    db_entity = session.query(Entity).filter_by(
-                        path=str(entity.path),
-                        entity_type=entity.entity_type.value
-                    ).first()
-                    
-                    entity_info = {
-                        'name': entity.name,
-                        'path': str(entity.path),
-                        'type': entity.entity_type.value,
-                        'file_size': entity.file_size,
-                        'file_count': len(entity.files) if hasattr(entity, 'files') else 1,
-                        'frame_range': entity.frame_range if hasattr(entity, 'frame_range') else None,
-                        'created_at': datetime.now().isoformat(),
-                    }
-                    
-                    # Add database metadata if available
-                    if db_entity:
-                        entity_info['id'] = db_entity.id
-                        entity_info['thumbnail_generated'] = db_entity.thumbnail_generated
-                        entity_info['last_accessed'] = db_entity.last_accessed.isoformat() if db_entity.last_accessed else None
-                        
-                        # Add metadata
-                        metadata_records = session.query(Metadata).filter_by(entity_id=db_entity.id).all()
-                        if metadata_records:
-                            entity_info['metadata'] = {}
-                            for meta in metadata_records:
-                                entity_info['metadata'][meta.key] = meta.value
+                # Find all entities in database with batched IN queries
+                for batch in _batched(paths):
+                    rows = session.execute(
+                        select(Entity.id, Entity.path, Entity.entity_type,
+                               Entity.thumbnail_generated, Entity.last_accessed)
+                        .where(Entity.path.in_(batch))
+                    ).mappings()
+                    for row in rows:
+                        db_entities[(row['path'], row['entity_type'])] = row
+                
+                # Fetch metadata for every matched entity the same way
+                entity_ids = [row['id'] for row in db_entities.values()]
+                for batch in _batched(entity_ids):
+                    rows = session.execute(
+                        select(*_METADATA_COLUMNS).where(Metadata.entity_id.in_(batch))
+                    ).mappings()
+                    for row in rows:
+                        metadata_by_entity[row['entity_id']] = row
+            
+            # One timestamp for the whole export rather than one per entity
+            now_iso = datetime.now().isoformat()
+            
+            for entity, path in zip(entities, paths):
+                entity_info = {
+                    'name': entity.name,
+                    'path': path,
+                    'type': entity.entity_type.value,
+                    'file_size': entity.file_size,
+                    'file_count': len(entity.files) if hasattr(entity, 'files') else 1,
+                    'frame_range': entity.frame_range if hasattr(entity, 'frame_range') else None,
+                    'created_at': now_iso,
+                }
+                
+                # Add database metadata if available
+                db_entity = db_entities.get((path, entity.entity_type.value))
+                if db_entity:
+                    entity_info['id'] = db_entity['id']
+                    entity_info['thumbnail_generated'] = db_entity['thumbnail_generated']
+                    entity_info['last_accessed'] = db_entity['last_accessed']
                     
-                    entity_data.append(entity_info)
+                    # Add metadata
+                    metadata_row = metadata_by_entity.get(db_entity['id'])
+                    if metadata_row:
+                        entity_info['metadata'] = {
+                            key: value for key, value in metadata_row.items()
+                            if value is not None and key not in ('id', 'entity_id')
+                        }
+                        if 'custom_fields' in entity_info['metadata']:
+                            entity_info['metadata']['custom_fields'] = _raw_json_field(
+                                entity_info['metadata']['custom_fields']
+                            )
+                
+                entity_data.append(entity_info)
             
             # Create export data structure
             export_data = {
                 'export_info': {
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now_iso,
                     'format': format,
                     'entity_count': len(entity_data),
                     'exported_by': 'Stockshot Browser'
@@ -162,91 +443,58 @@ class MetadataExporter:
         """
         try:
             with self.database_manager.get_session() as session:
-                from ..database.models import entity_tags
-                
                 # Get entity
-                entity = session.query(Entity).filter_by(id=entity_id).first()
+                entity = session.execute(
+                    select(*_ENTITY_COLUMNS).where(Entity.id == entity_id)
+                ).mappings().first()
                 if not entity:
                     logger.error(f"Entity not found: {entity_id}")
                     return {}
                 
                 # Build entity data
                 entity_data = {
-                    'entity_info': {
-                        'id': entity.id,
-                        'name': entity.name,
-                        'path': entity.path,
-                        'entity_type': entity.entity_type,
-                        'file_size': entity.file_size,
-                        'file_count': entity.file_count,
-                        'thumbnail_generated': entity.thumbnail_generated,
-                        'created_at': entity.created_at.isoformat() if entity.created_at else None,
-                        'last_accessed': entity.last_accessed.isoformat() if entity.last_accessed else None,
-                    },
+                    'entity_info': dict(entity),
                     'metadata': {},
                     'tags': [],
                     'favorites': [],
                     'thumbnails': []
                 }
                 
-                # Get metadata records
-                metadata_records = session.query(Metadata).filter_by(entity_id=entity.id).all()
-                for meta in metadata_records:
-                    category = meta.category or 'general'
-                    if category not in entity_data['metadata']:
-                        entity_data['metadata'][category] = {}
+                # Get metadata record
+                meta = session.execute(
+                    select(*_METADATA_COLUMNS).where(Metadata.entity_id == entity_id)
+                ).mappings().first()
+                if meta:
+                    category = meta['category'] or 'general'
+                    fields = {
+                        key: value for key, value in meta.items()
+                        if value is not None and key not in ('id', 'entity_id', 'category', 'custom_fields')
+                    }
                     
-                    # Try to parse JSON metadata
-                    try:
-                        if meta.metadata_json:
-                            parsed_data = json.loads(meta.metadata_json)
-                            entity_data['metadata'][category].update(parsed_data)
-                        else:
-                            entity_data['metadata'][category][meta.key] = meta.value
-                    except json.JSONDecodeError:
-                        entity_data['metadata'][category][meta.key] = meta.value
+                    # Merge custom fields stored as JSON
+                    if meta['custom_fields']:
+                        try:
+                            fields.update(json.loads(meta['custom_fields']))
+                        except json.JSONDecodeError:
+                            fields['custom_fields'] = meta['custom_fields']
+                    
+                    entity_data['metadata'][category] = fields
                 
                 # Get tags
-                tags = session.query(Tag).join(entity_tags).filter(
-                    entity_tags.c.entity_id == entity.id
-                ).all()
-                
-                for tag in tags:
-                    tag_data = {
-                        'id': tag.id,
-                        'name': tag.name,
-                        'color': tag.color,
-                        'description': tag.description,
-                        'created_at': tag.created_at.isoformat() if tag.created_at else None,
-                    }
-                    entity_data['tags'].append(tag_data)
+                entity_data['tags'] = self._fetch_rows(
+                    session,
+                    select(*_TAG_COLUMNS).join(entity_tags).where(entity_tags.c.entity_id == entity_id)
+                )
                 
                 # Get favorites
-                favorites = session.query(Favorite).filter_by(entity_id=entity.id).all()
-                for fav in favorites:
-                    favorite_data = {
-                        'id': fav.id,
-                        'user_id': fav.user_id,
-                        'project_id': fav.project_id,
-                        'created_at': fav.created_at.isoformat() if fav.created_at else None,
-                    }
-                    entity_data['favorites'].append(favorite_data)
+                entity_data['favorites'] = self._fetch_rows(
+                    session, select(*_FAVORITE_COLUMNS).where(Favorite.entity_id == entity_id)
+                )
                 
                 # Get thumbnails
-                thumbnails = session.query(Thumbnail).filter_by(entity_id=entity.id).all()
-                for thumb in thumbnails:
-                    thumbnail_data = {
-                        'id': thumb.id,
-                        'path': thumb.path,
-                        'resolution': thumb.resolution,
-                        'file_size': thumb.file_size,
-                        'generation_time': thumb.generation_time,
-                        'source_frame': thumb.source_frame,
-                        'is_valid': thumb.is_valid,
-                        'created_at': thumb.created_at.isoformat() if thumb.created_at else None,
-                        'extra_data': thumb.extra_data
-                    }
-                    entity_data['thumbnails'].append(thumbnail_data)
+                entity_data['thumbnails'] = self._fetch_rows(
+                    session, select(*_THUMBNAIL_COLUMNS).where(Thumbnail.entity_id == entity_id)
+                )
                 
                 # Add export timestamp
                 entity_data['export_info'] = {
@@ -263,8 +511,13 @@ class MetadataExporter:
     def _collect_project_data(self, project_name: Optional[str] = None,
                              include_thumbnails: bool = False,
                              include_favorites: bool = True,
-                             include_tags: bool = True) -> Dict[str, Any]:
+                             include_tags: bool = True,
+                             progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
         """Collect all project data for export."""
+        def report(percent: int, status: str) -> None:
+            if progress_callback:
+                progress_callback(percent, status)
+        
         data = {
             'export_info': {
                 'timestamp': datetime.now().isoformat(),
@@ -280,85 +533,40 @@ class MetadataExporter:
         }
         
         try:
-            with self.database_manager.get_session() as session:
+            with self.database_manager.get_session() as session, self._export_read_pragmas(session):
                 # Get entities
-                entity_query = session.query(Entity)
+                entity_query = select(*_ENTITY_COLUMNS)
                 if project_name:
                     # Filter by project if specified (would need project association)
                     pass  # Project filtering would be implemented here
                 
-                entities = entity_query.all()
-                
-                for entity in entities:
-                    entity_data = {
-                        'id': entity.id,
-                        'path': entity.path,
-                        'name': entity.name,
-                        'entity_type': entity.entity_type,
-                        'file_size': entity.file_size,
-                        'file_count': entity.file_count,
-                        'thumbnail_generated': entity.thumbnail_generated,
-                        'created_at': entity.created_at.isoformat() if entity.created_at else None,
-                        'last_accessed': entity.last_accessed.isoformat() if entity.last_accessed else None,
-                    }
-                    data['entities'].append(entity_data)
+                data['entities'] = self._fetch_rows(session, entity_query)
+                report(30, f"Collected {len(data['entities'])} entities")
                 
-                # Get metadata
-                metadata_records = session.query(Metadata).all()
-                for meta in metadata_records:
-                    metadata_data = {
-                        'id': meta.id,
-                        'entity_id': meta.entity_id,
-                        'key': meta.key,
-                        'value': meta.value,
-                        'data_type': meta.data_type,
-                        'created_at': meta.created_at.isoformat() if meta.created_at else None,
-                    }
-                    data['metadata'].append(metadata_data)
+                # Get metadata; custom fields are already JSON and are passed through as-is
+                data['metadata'] = self._fetch_rows(session, select(*_METADATA_COLUMNS))
+                for meta in data['metadata']:
+                    meta['custom_fields'] = _raw_json_field(meta['custom_fields'])
+                report(50, f"Collected {len(data['metadata'])} metadata records")
                 
                 # Get thumbnails if requested
                 if include_thumbnails:
-                    thumbnail_records = session.query(Thumbnail).all()
-                    for thumb in thumbnail_records:
-                        thumbnail_data = {
-                            'id': thumb.id,
-                            'entity_id': thumb.entity_id,
-                            'path': thumb.path,
-                            'resolution': thumb.resolution,
-                            'file_size': thumb.file_size,
-                            'generation_time': thumb.generation_time,
-                            'source_frame': thumb.source_frame,
-                            'is_valid': thumb.is_valid,
-                            'created_at': thumb.created_at.isoformat() if thumb.created_at else None,
-                            'extra_data': thumb.extra_data
-                        }
-                        data['thumbnails'].append(thumbnail_data)
+                    data['thumbnails'] = self._fetch_rows(session, select(*_THUMBNAIL_COLUMNS))
+                    report(60, f"Collected {len(data['thumbnails'])} thumbnails")
                 
                 # Get favorites if requested
                 if include_favorites:
-                    favorite_records = session.query(Favorite).all()
-                    for fav in favorite_records:
-                        favorite_data = {
-                            'id': fav.id,
-                            'entity_id': fav.entity_id,
-                            'user_id': fav.user_id,
-                            'project_id': fav.project_id,
-                            'created_at': fav.created_at.isoformat() if fav.created_at else None,
-                        }
-                        data['favorites'].append(favorite_data)
+                    data['favorites'] = self._fetch_rows(session, select(*_FAVORITE_COLUMNS))
+                    report(65, f"Collected {len(data['favorites'])} favorites")
                 
-                # Get tags if requested
+                # Get tags if requested (one row per tag assignment)
                 if include_tags:
-                    tag_records = session.query(Tag).all()
-                    for tag in tag_records:
-                        tag_data = {
-                            'id': tag.id,
-                            'entity_id': tag.entity_id,
-                            'name': tag.name,
-                            'color': tag.color,
-                            'created_at': tag.created_at.isoformat() if tag.created_at else None,
-                        }
-                        data['tags'].append(tag_data)
+                    data['tags'] = self._fetch_rows(
+                        session,
+                        select(Tag.id, entity_tags.c.entity_id, Tag.name, Tag.color, Tag.created_at)
+                        .outerjoin(entity_tags, entity_tags.c.tag_id == Tag.id)
+                    )
+                    report(70, f"Collected {len(data['tags'])} tag assignments")
                 
         except Exception as e:
             logger.error(f"Error collecting project data: {e}")
@@ -366,11 +574,53 @@ class MetadataExporter:
         
         return data
     
+    @staticmethod
+    @contextmanager
+    def _export_read_pragmas(session) -> Iterator[None]:
+        """Enlarge the SQLite page cache of the session's connection during export scans."""
+        if session.get_bind().dialect.name != 'sqlite':
+            yield
+            return
+        
+        previous_cache_size = session.execute(text("PRAGMA cache_size")).scalar()
+        session.execute(text(f"PRAGMA cache_size = {_EXPORT_CACHE_SIZE}"))
+        try:
+            yield
+        finally:
+            session.execute(text(f"PRAGMA cache_size = {int(previous_cache_size)}"))
+    
+    @staticmethod
+    def _fetch_rows(session, statement) -> List[Dict[str, Any]]:
+        """Execute a column select and return its rows as plain dicts."""
+        # Every row of a select shares one key tuple, so build dicts straight
+        # from the raw row tuples instead of going through a RowMapping each;
+        # yield_per streams the cursor in partitions rather than one fetchall
+        result = session.execute(statement.execution_options(yield_per=_EXPORT_FETCH_SIZE))
+        keys = tuple(result.keys())
+        return [dict(zip(keys, row)) for row in result]
+    
     def _export_json(self, data: Dict[str, Any], output_path: Path) -> bool:
         """Export data as JSON."""
+        # RawJSON values are swapped for placeholders during encoding and the
+        # stored text is spliced back into the output chunk that carries them
+        raw_fragments: List[str] = []
+        
+        def default(value: Any) -> Any:
+            if isinstance(value, RawJSON):
+                raw_fragments.append(value.text)
+                return f"\x00raw:{len(raw_fragments) - 1}\x00"
+            return _json_default(value)
+        
+        def splice(match) -> str:
+            return raw_fragments[int(match.group(1))]
+        
         try:
+            encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=default)
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                for chunk in encoder.iterencode(data):
+                    if '\\u0000raw:' in chunk:
+                        chunk = _RAW_JSON_PLACEHOLDER.sub(splice, chunk)
+                    f.write(chunk)
             
             logger.info(f"JSON export completed: {output_path}")
             return True
@@ -388,12 +638,7 @@ class MetadataExporter:
                 return False
             
             # Create CSV with entity data
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                if entities:
-                    fieldnames = entities[0].keys()
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(entities)
+            self._write_csv(entities, output_path)
             
             logger.info(f"CSV export completed: {output_path}")
             return True
@@ -409,11 +654,7 @@ class MetadataExporter:
                 logger.warning("No entities to export")
                 return False
             
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = entities[0].keys()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(entities)
+            self._write_csv(entities, output_path)
             
             logger.info(f"Entity CSV export completed: {output_path}")
             return True
@@ -422,62 +663,49 @@ class MetadataExporter:
             logger.error(f"Error exporting entity CSV: {e}")
             return False
     
+    @staticmethod
+    def _write_csv(rows: List[Dict[str, Any]], output_path: Path) -> None:
+        """Write dict rows as CSV with a column for every key found in any row."""
+        # Rows are not guaranteed to share keys (e.g. entities missing from the
+        # database), so the header is the union of keys in first-seen order
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(
+                [_format_value(row.get(key)) for key in fieldnames] for row in rows
+            )
+    
     def _export_xml(self, data: Dict[str, Any], output_path: Path) -> bool:
         """Export data as XML."""
         try:
-            # Create root element
-            root = ET.Element('stockshot_export')
-            
-            # Add export info
-            export_info = ET.SubElement(root, 'export_info')
-            for key, value in data.get('export_info', {}).items():
-                elem = ET.SubElement(export_info, key)
-                elem.text = str(value)
-            
-            # Add entities
-            entities_elem = ET.SubElement(root, 'entities')
-            for entity in data.get('entities', []):
-                entity_elem = ET.SubElement(entities_elem, 'entity')
-                for key, value in entity.items():
-                    elem = ET.SubElement(entity_elem, key)
-                    elem.text = str(value) if value is not None else ''
-            
-            # Add metadata
-            metadata_elem = ET.SubElement(root, 'metadata')
-            for meta in data.get('metadata', []):
-                meta_elem = ET.SubElement(metadata_elem, 'metadata_record')
-                for key, value in meta.items():
-                    elem = ET.SubElement(meta_elem, key)
-                    elem.text = str(value) if value is not None else ''
-            
-            # Add thumbnails
-            thumbnails_elem = ET.SubElement(root, 'thumbnails')
-            for thumb in data.get('thumbnails', []):
-                thumb_elem = ET.SubElement(thumbnails_elem, 'thumbnail')
-                for key, value in thumb.items():
-                    elem = ET.SubElement(thumb_elem, key)
-                    elem.text = str(value) if value is not None else ''
-            
-            # Add favorites
-            favorites_elem = ET.SubElement(root, 'favorites')
-            for fav in data.get('favorites', []):
-                fav_elem = ET.SubElement(favorites_elem, 'favorite')
-                for key, value in fav.items():
-                    elem = ET.SubElement(fav_elem, key)
-                    elem.text = str(value) if value is not None else ''
-            
-            # Add tags
-            tags_elem = ET.SubElement(root, 'tags')
-            for tag in data.get('tags', []):
-                tag_elem = ET.SubElement(tags_elem, 'tag')
-                for key, value in tag.items():
-                    elem = ET.SubElement(tag_elem, key)
-                    elem.text = str(value) if value is not None else ''
-            
-            # Write XML file
-            tree = ET.ElementTree(root)
-            ET.indent(tree, space="  ", level=0)  # Pretty print
-            tree.write(output_path, encoding='utf-8', xml_declaration=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("<?xml version='1.0' encoding='utf-8'?>\n<stockshot_export>\n")
+                
+                # Add export info
+                export_info = data.get('export_info', {})
+                f.write(_render_xml_row(_xml_row_template('export_info', tuple(export_info), '  '), export_info))
+                
+                # Add each record section; rows of a section share their shape,
+                # so the element template is built once per distinct key set
+                for section, tag in _XML_SECTIONS:
+                    rows = data.get(section, [])
+                    if not rows:
+                        f.write(f"  <{section} />\n")
+                        continue
+                    
+                    f.write(f"  <{section}>\n")
+                    templates = {}
+                    for row in rows:
+                        keys = tuple(row)
+                        template = templates.get(keys)
+                        if template is None:
+                            template = templates[keys] = _xml_row_template(tag, keys, '    ')
+                        f.write(_render_xml_row(template, row))
+                    f.write(f"  </{section}>\n")
+                
+                f.write("</stockshot_export>\n")
             
             logger.info(f"XML export completed: {output_path}")
             return True
@@ -497,12 +725,20 @@ class MetadataExporter:
         }
         
         try:
+            # One round trip: each count is a scalar subquery of a single SELECT
+            counts = select(*(
+                select(func.count()).select_from(model).scalar_subquery().label(key)
+                for key, model in (
+                    ('entities', Entity),
+                    ('metadata_records', Metadata),
+                    ('thumbnails', Thumbnail),
+                    ('favorites', Favorite),
+                    ('tags', Tag),
+                )
+            ))
+            
             with self.database_manager.get_session() as session:
-                summary['entities'] = session.query(Entity).count()
-                summary['metadata_records'] = session.query(Metadata).count()
-                summary['thumbnails'] = session.query(Thumbnail).count()
-                summary['favorites'] = session.query(Favorite).count()
-                summary['tags'] = session.query(Tag).count()
+                summary.update(session.execute(counts).mappings().one())
                 
         except Exception as e:
             logger.error(f"Error getting export summary: {e}")
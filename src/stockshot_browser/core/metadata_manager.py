@@ -3,60 +3,114 @@ Metadata management for Stockshot Browser.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import operator
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from PySide6.QtCore import QObject, Signal, QThread, QThreadPool, QRunnable, Slot
+from PySide6.QtCore import QObject, Qt, Signal, QThread
 import json
 
+from sqlalchemy import case, func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload
+
 from ..config.manager import ConfigurationManager
 from ..database.connection import DatabaseManager, database_retry
-from ..database.models import Entity, Metadata
+from ..database.metadata_store import LOOKUP_BATCH_SIZE, upsert_entity_metadata
+from ..database.models import Entity, Metadata, ProbeCacheEntry
 from ..utils.ffmpeg_utils import FFmpegExtractor, FFmpegError
+from ..utils.file_utils import FileUtils
 
 
 logger = logging.getLogger(__name__)
 
+# Writer thread tuning: pending results held in memory, rows per transaction,
+# and how long (seconds) to wait for more results before committing a short batch
+_WRITE_QUEUE_SIZE = 1000
+_WRITE_BATCH_SIZE = 200
+_WRITE_LINGER = 0.25
+
+# Writer commits between WAL checkpoints, bounding -wal file growth during huge scans
+_WAL_CHECKPOINT_INTERVAL = 500
+
+# search_by_metadata filter keys mapped to (column, comparison)
+_SEARCH_FILTERS = {
+    'duration_min': (Metadata.duration, operator.ge),
+    'duration_max': (Metadata.duration, operator.le),
+    'width_min': (Metadata.width, operator.ge),
+    'width_max': (Metadata.width, operator.le),
+    'height_min': (Metadata.height, operator.ge),
+    'height_max': (Metadata.height, operator.le),
+    'format': (Metadata.format, operator.eq),
+    'codec': (Metadata.codec, operator.eq),
+    'colorspace': (Metadata.colorspace, operator.eq),
+    'has_audio': (Metadata.has_audio, operator.eq),
+}
 
-class MetadataExtractionWorker(QRunnable):
-    """Worker for extracting metadata in background thread."""
+# Header fields a sibling's fast probe must share with the archetype before the archetype is reused
+_ARCHETYPE_MATCH_KEYS = ('width', 'height', 'codec', 'pixel_format')
+
+
+class WorkerSignals(QObject):
+    """Signals reporting results from a MetadataExtractionWorker."""
     
-    def __init__(self, entity, ffmpeg_extractor, callback):
-        super().__init__()
-        self.entity = entity
+    done = Signal(object, object, object)  # entity, metadata or None, error or None
+
+
+class MetadataExtractionWorker:
+    """Long-lived worker extracting metadata for entities taken from a queue."""
+    
+    def __init__(self, task_queue: queue.Queue, ffmpeg_extractor, probe=None, frame_probe=None):
+        self.task_queue = task_queue
         self.ffmpeg_extractor = ffmpeg_extractor
-        self.callback = callback
+        self.signals = WorkerSignals()
+        # Optional probe(path, extract) wrappers, e.g. to serve cached results;
+        # frame_probe is used for the first frame of sequences and images
+        self.probe = probe or (lambda path, extract: extract(path))
+        self.frame_probe = frame_probe or self.probe
     
-    @Slot()
     def run(self):
-        """Extract metadata for the entity."""
+        """Extract metadata for queued entities until a None sentinel is taken."""
+        while True:
+            entity = self.task_queue.get()
+            try:
+                if entity is None:
+                    return
+                self.extract(entity)
+            finally:
+                self.task_queue.task_done()
+    
+    def extract(self, entity):
+        """Extract metadata for a single entity and report it through signals.done."""
         try:
-            if self.entity.entity_type.value == "video":
-                metadata = self.ffmpeg_extractor.extract_video_info(self.entity.path)
+            if entity.entity_type.value == "video":
+                metadata = self.probe(entity.path, self.ffmpeg_extractor.extract_video_info)
             else:  # sequence or image
                 # For sequences, analyze the first frame
-                first_file = self.entity.files[0] if self.entity.files else self.entity.path
-                metadata = self.ffmpeg_extractor.extract_image_info(first_file)
+                first_file = entity.files[0] if entity.files else entity.path
+                metadata = self.frame_probe(first_file, self.ffmpeg_extractor.extract_image_info)
                 
                 # Add sequence-specific metadata
-                if len(self.entity.files) > 1:
-                    metadata['frame_count'] = len(self.entity.files)
+                if len(entity.files) > 1:
+                    metadata['frame_count'] = len(entity.files)
                     metadata['is_sequence'] = True
-                    if self.entity.frame_range:
-                        metadata['frame_range'] = f"{self.entity.frame_range[0]}-{self.entity.frame_range[1]}"
+                    if entity.frame_range:
+                        metadata['frame_range'] = f"{entity.frame_range[0]}-{entity.frame_range[1]}"
             
             # Add entity-specific metadata
-            metadata['entity_name'] = self.entity.name
-            metadata['entity_type'] = self.entity.entity_type.value
-            metadata['file_count'] = len(self.entity.files)
+            metadata['entity_name'] = entity.name
+            metadata['entity_type'] = entity.entity_type.value
+            metadata['file_count'] = len(entity.files)
+            metadata['total_size'] = entity.file_size  # None is dropped from custom fields
             
-            if self.entity.file_size:
-                metadata['total_size'] = self.entity.file_size
-            
-            self.callback(self.entity, metadata, None)
+            self.signals.done.emit(entity, metadata, None)
             
         except Exception as e:
-            logger.error(f"Error extracting metadata for {self.entity.name}: {e}")
-            self.callback(self.entity, None, str(e))
+            logger.error(f"Error extracting metadata for {entity.name}: {e}")
+            self.signals.done.emit(entity, None, str(e))
 
 
 class MetadataManager(QObject):
@@ -72,23 +126,65 @@ class MetadataManager(QObject):
         self.config_manager = config_manager
         self.database_manager = database_manager
         
-        # Initialize FFmpeg extractor
+        # Initialize FFmpeg extractor; probes reuse long-lived ffprobe loops. Video
+        # probes keep ffprobe's default stream analysis so fps and duration stay exact;
+        # only the header-only image probe shortens it (extract_image_info_fast)
         try:
-            self.ffmpeg_extractor = FFmpegExtractor(config_manager)
+            self.ffmpeg_extractor = FFmpegExtractor(config_manager, persistent_probe=True)
             self.ffmpeg_available = True
         except FFmpegError as e:
             logger.warning(f"FFmpeg not available: {e}")
             self.ffmpeg_extractor = None
             self.ffmpeg_available = False
         
-        # Thread pool for background processing
-        self.thread_pool = QThreadPool()
-        max_threads = self.config_manager.get('performance.max_concurrent_thumbnails', 4)
-        self.thread_pool.setMaxThreadCount(max_threads)
-        
         # Processing state
         self.processing_entities = []
         self.completed_count = 0
+        self._progress_lock = threading.Lock()
+        
+        # Extracted metadata is stored by a single writer thread in batches;
+        # None is the shutdown sentinel
+        self._write_queue: "queue.Queue[Optional[Tuple[Any, Dict[str, Any]]]]" = queue.Queue(
+            maxsize=_WRITE_QUEUE_SIZE
+        )
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="MetadataWriter", daemon=True
+        )
+        self._writer_thread.start()
+        
+        # First-frame probes per (directory, suffix), reused for sibling sequences
+        self._frame_archetypes: Dict[Tuple[Path, str], Dict[str, Any]] = {}
+        self._archetype_lock = threading.Lock()
+        
+        # Probe results waiting to be written to the probe cache with the next batch
+        self._pending_probes: List[Dict[str, Any]] = []
+        self._probe_lock = threading.Lock()
+        
+        # Fixed pool of extraction threads fed from a task queue; each thread
+        # reuses its own persistent ffprobe process from the extractor, and
+        # exits when it takes a None sentinel
+        self._task_queue: "queue.Queue" = queue.Queue()
+        self._workers: List[MetadataExtractionWorker] = []
+        self._extraction_threads: List[threading.Thread] = []
+        if self.ffmpeg_available:
+            max_threads = (self.config_manager.get('performance.max_concurrent_thumbnails', 0)
+                           or QThread.idealThreadCount())
+            for index in range(max_threads):
+                worker = MetadataExtractionWorker(
+                    self._task_queue,
+                    self.ffmpeg_extractor,
+                    probe=self._probe_cached,
+                    frame_probe=self._probe_sequence_frame
+                )
+                # Direct: the handler only enqueues for the writer, and a full
+                # write queue must throttle extraction threads, not the GUI thread
+                worker.signals.done.connect(self._on_metadata_extracted, Qt.DirectConnection)
+                self._workers.append(worker)
+                thread = threading.Thread(
+                    target=worker.run, name=f"MetadataExtraction-{index}", daemon=True
+                )
+                thread.start()
+                self._extraction_threads.append(thread)
         
         logger.info(f"MetadataManager initialized (FFmpeg available: {self.ffmpeg_available})")
     
@@ -103,11 +199,11 @@ class MetadataManager(QObject):
             logger.warning("FFmpeg not available, skipping metadata extraction")
             return
         
-        # Filter entities that need metadata extraction
-        entities_to_process = []
-        for entity in entities:
-            if self.config_manager.get('metadata.auto_extract', True):
-                entities_to_process.append(entity)
+        if not self.config_manager.get('metadata.auto_extract', True):
+            return
+        
+        # Skip entities whose source is unchanged since metadata was last stored
+        entities_to_process = self._filter_unchanged_entities(list(entities))
         
         if not entities_to_process:
             return
@@ -115,75 +211,215 @@ class MetadataManager(QObject):
         # Reset processing state
         self.processing_entities = entities_to_process
         self.completed_count = 0
+        with self._archetype_lock:
+            self._frame_archetypes.clear()
         
-        # Start extraction for each entity
+        # Queue extraction for each entity
         for entity in entities_to_process:
-            worker = MetadataExtractionWorker(
-                entity,
-                self.ffmpeg_extractor,
-                self._on_metadata_extracted
-            )
-            self.thread_pool.start(worker)
+            self._task_queue.put(entity)
+    
+    def _filter_unchanged_entities(self, entities: List) -> List:
+        """Drop entities whose stored mtime matches the file on disk."""
+        for entity in entities:
+            if entity.mtime is None:
+                # The newest of all files, as the scanner records it for sequences
+                _, entity.mtime = FileUtils.sum_stats(entity.files or [entity.path])
+        
+        paths = [str(entity.path) for entity in entities]
+        stored_mtimes = {}
+        try:
+            with self.database_manager.get_session() as session:
+                for start in range(0, len(paths), LOOKUP_BATCH_SIZE):
+                    stored_mtimes.update(session.query(Entity.path, Entity.mtime).filter(
+                        Entity.path.in_(paths[start:start + LOOKUP_BATCH_SIZE]),
+                        Entity.metadata_extracted == True,
+                    ).all())
+        except Exception as e:
+            logger.error(f"Error looking up stored entity mtimes: {e}")
+            return entities
+        
+        changed = [
+            entity for entity in entities
+            if entity.mtime is None or stored_mtimes.get(str(entity.path)) != entity.mtime
+        ]
+        if len(changed) < len(entities):
+            logger.info(f"Skipping {len(entities) - len(changed)} unchanged entities")
+        return changed
+    
+    def _probe_cached(self, path: Path, extract) -> Dict[str, Any]:
+        """Run extract(path) unless a probe of the unchanged file is cached."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return extract(path)
+        
+        try:
+            with self.database_manager.get_session() as session:
+                payload = session.execute(
+                    select(ProbeCacheEntry.payload).where(
+                        ProbeCacheEntry.path == str(path),
+                        ProbeCacheEntry.mtime == stat.st_mtime_ns,
+                        ProbeCacheEntry.size == stat.st_size,
+                    )
+                ).scalar()
+            if payload:
+                return json.loads(payload)
+        except Exception as e:
+            logger.debug(f"Probe cache lookup failed for {path}: {e}")
+        
+        metadata = extract(path)
+        
+        # The basic-file-info fallback carries no stream data; only cache real probes
+        if 'width' in metadata:
+            with self._probe_lock:
+                self._pending_probes.append({
+                    'path': str(path),
+                    'mtime': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'payload': json.dumps(metadata),
+                })
+        
+        return metadata
+    
+    def _probe_sequence_frame(self, path: Path, extract) -> Dict[str, Any]:
+        """Probe a first frame, reusing a sibling sequence's result when it matches.
+        
+        Sequences in one directory usually share codec, resolution and bit depth,
+        so the first full probe per (directory, suffix) serves as an archetype.
+        Siblings only get the header-only probe, and the archetype is reused when
+        their dimensions, codec and pixel format agree with it.
+        """
+        key = (path.parent, path.suffix.lower())
+        with self._archetype_lock:
+            archetype = self._frame_archetypes.get(key)
+        
+        if archetype:
+            header = self._probe_cached(path, self.ffmpeg_extractor.extract_image_info_fast)
+            if 'width' in header and all(
+                header.get(field) == archetype.get(field) for field in _ARCHETYPE_MATCH_KEYS
+            ):
+                metadata = dict(archetype)
+                metadata.update(header)
+                return metadata
+        
+        metadata = self._probe_cached(path, extract)
+        if 'width' in metadata:
+            with self._archetype_lock:
+                self._frame_archetypes.setdefault(key, dict(metadata))
+        return metadata
+    
+    def _take_pending_probes(self) -> List[Dict[str, Any]]:
+        """Return and clear probe results waiting to be cached."""
+        with self._probe_lock:
+            pending, self._pending_probes = self._pending_probes, []
+        return pending
     
     def _on_metadata_extracted(self, entity, metadata: Optional[Dict], error: Optional[str]):
         """Handle metadata extraction completion."""
-        self.completed_count += 1
-        
         if error:
             logger.error(f"Metadata extraction failed for {entity.name}: {error}")
             self.metadata_extraction_failed.emit(entity, error)
         elif metadata:
             logger.debug(f"Metadata extracted for {entity.name}")
             
-            # Store metadata in database
-            self._store_metadata(entity, metadata)
+            # Hand off to the writer thread; it emits metadata_extracted once stored
+            self._write_queue.put((entity, metadata))
+            return
+        
+        self._report_progress(1)
+    
+    def _report_progress(self, count: int) -> None:
+        """Advance the completed counter and emit progress."""
+        with self._progress_lock:
+            self.completed_count += count
+            completed = self.completed_count
+        self.extraction_progress.emit(completed, len(self.processing_entities))
+    
+    def _writer_loop(self) -> None:
+        """Drain extracted metadata from the queue and store it in batches."""
+        commits_since_checkpoint = 0
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            
+            # Extraction trickles in one result at a time; coalesce into fewer commits
+            stopping = False
+            deadline = time.monotonic() + _WRITE_LINGER
+            while len(batch) < _WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._write_queue.get(timeout=remaining)
+                    else:
+                        item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                self._store_metadata_batch(batch)
+            except Exception as e:
+                # Isolate the offending record by storing the batch one entity at a time
+                logger.error(f"Error storing metadata batch of {len(batch)} entities, retrying individually: {e}")
+                for entity, metadata in batch:
+                    self._store_metadata(entity, metadata)
+            
+            commits_since_checkpoint += 1
+            if commits_since_checkpoint >= _WAL_CHECKPOINT_INTERVAL:
+                self._checkpoint_wal()
+                commits_since_checkpoint = 0
+            
+            # Signals emitted from this thread are queued to receivers in the GUI thread
+            for entity, metadata in batch:
+                self.metadata_extracted.emit(entity, metadata)
+            self._report_progress(len(batch))
             
-            # Emit signal
-            self.metadata_extracted.emit(entity, metadata)
+            if stopping:
+                return
+    
+    def _checkpoint_wal(self) -> None:
+        """Fold the write-ahead log back into the database and truncate it."""
+        try:
+            with self.database_manager.get_session() as session:
+                session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        except Exception as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
+    
+    @database_retry(max_retries=5, base_delay=0.1)
+    def _store_metadata_batch(self, batch: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Upsert entities and their metadata for a batch in one transaction.
         
-        # Emit progress
-        self.extraction_progress.emit(self.completed_count, len(self.processing_entities))
+        Errors propagate so the writer loop can fall back to per-entity storage.
+        """
+        with self.database_manager.get_session() as session:
+            pending_probes = self._take_pending_probes()
+            if pending_probes:
+                probe_stmt = sqlite_insert(ProbeCacheEntry)
+                session.execute(probe_stmt.on_conflict_do_update(
+                    index_elements=['path'],
+                    set_={
+                        'mtime': probe_stmt.excluded.mtime,
+                        'size': probe_stmt.excluded.size,
+                        'payload': probe_stmt.excluded.payload,
+                        'created_at': func.now(),
+                    },
+                ), pending_probes)
+            
+            upsert_entity_metadata(session, batch)
+            
+            logger.debug(f"Stored metadata for {len(batch)} entities")
     
     @database_retry(max_retries=5, base_delay=0.1)
     def _store_metadata(self, entity, metadata: Dict[str, Any]) -> None:
         """Store metadata in database."""
         try:
             with self.database_manager.get_session() as session:
-                # First, ensure entity exists in database
-                db_entity = session.query(Entity).filter_by(
-                    path=str(entity.path),
-                    entity_type=entity.entity_type.value
-                ).first()
-                
-                if not db_entity:
-                    # Create entity in database with proper type conversion
-                    db_entity = Entity(
-                        path=str(entity.path),
-                        entity_type=entity.entity_type.value,
-                        name=str(entity.name),
-                        file_size=int(entity.file_size) if entity.file_size else None,
-                        file_count=int(len(entity.files)) if hasattr(entity, 'files') and entity.files else 1,
-                        metadata_extracted=True,
-                        thumbnail_generated=False
-                    )
-                    session.add(db_entity)
-                    session.flush()  # Get the ID
-                
-                # Check if metadata already exists
-                existing_metadata = session.query(Metadata).filter_by(
-                    entity_id=db_entity.id
-                ).first()
-                
-                if existing_metadata:
-                    # Update existing metadata
-                    self._update_metadata_record(existing_metadata, metadata)
-                else:
-                    # Create new metadata record
-                    metadata_record = self._create_metadata_record(db_entity.id, metadata)
-                    session.add(metadata_record)
-                
-                # Mark entity as having metadata extracted
-                db_entity.metadata_extracted = True
+                upsert_entity_metadata(session, [(entity, metadata)])
                 
                 logger.debug(f"Successfully stored metadata for entity: {entity.name}")
                 
@@ -191,87 +427,14 @@ class MetadataManager(QObject):
             logger.error(f"Error storing metadata for {entity.name}: {e}")
             # Don't re-raise to allow application to continue
     
-    def _create_metadata_record(self, entity_id: int, metadata: Dict[str, Any]) -> Metadata:
-        """Create a new metadata record."""
-        # Helper function to safely convert values
-        def safe_convert(value, target_type):
-            if value is None:
-                return None
-            try:
-                if target_type == float:
-                    return float(value)
-                elif target_type == int:
-                    return int(value)
-                elif target_type == bool:
-                    return bool(value)
-                elif target_type == str:
-                    return str(value)
-                else:
-                    return value
-            except (ValueError, TypeError):
-                return None
-        
-        # Separate standard fields from custom fields with proper type conversion
-        standard_fields = {
-            'duration': safe_convert(metadata.get('duration'), float),
-            'fps': safe_convert(metadata.get('fps'), float),
-            'width': safe_convert(metadata.get('width'), int),
-            'height': safe_convert(metadata.get('height'), int),
-            'aspect_ratio': safe_convert(metadata.get('aspect_ratio'), float),
-            'format': safe_convert(metadata.get('format'), str),
-            'codec': safe_convert(metadata.get('codec'), str),
-            'audio_codec': safe_convert(metadata.get('audio_codec'), str),
-            'colorspace': safe_convert(metadata.get('colorspace'), str),
-            'bit_depth': safe_convert(metadata.get('bit_depth'), int),
-            'bitrate': safe_convert(metadata.get('bitrate'), int),
-            'frame_count': safe_convert(metadata.get('frame_count'), int),
-            'has_audio': safe_convert(metadata.get('has_audio', False), bool),
-        }
-        
-        # Remove None values
-        standard_fields = {k: v for k, v in standard_fields.items() if v is not None}
-        
-        # Custom fields (everything else)
-        custom_fields = {k: v for k, v in metadata.items()
-                        if k not in ['duration', 'fps', 'width', 'height', 'aspect_ratio',
-                                   'format', 'codec', 'audio_codec', 'colorspace', 'bit_depth',
-                                   'bitrate', 'frame_count', 'has_audio'] and v is not None}
-        
-        metadata_record = Metadata(
-            entity_id=int(entity_id),
-            custom_fields=json.dumps(custom_fields) if custom_fields else None,
-            **standard_fields
-        )
-        
-        return metadata_record
-    
-    def _update_metadata_record(self, metadata_record: Metadata, metadata: Dict[str, Any]) -> None:
-        """Update an existing metadata record."""
-        # Update standard fields
-        standard_fields = [
-            'duration', 'fps', 'width', 'height', 'aspect_ratio', 'format',
-            'codec', 'audio_codec', 'colorspace', 'bit_depth', 'bitrate',
-            'frame_count', 'has_audio'
-        ]
-        
-        for field in standard_fields:
-            if field in metadata and metadata[field] is not None:
-                setattr(metadata_record, field, metadata[field])
-        
-        # Update custom fields
-        existing_custom = metadata_record.get_custom_fields()
-        custom_fields = {k: v for k, v in metadata.items()
-                        if k not in standard_fields and v is not None}
-        
-        existing_custom.update(custom_fields)
-        metadata_record.set_custom_fields(existing_custom)
-    
     @database_retry(max_retries=3, base_delay=0.05)
     def get_entity_metadata(self, entity_path: str) -> Optional[Dict[str, Any]]:
         """Get metadata for an entity."""
         try:
             with self.database_manager.get_session() as session:
-                entity = session.query(Entity).filter_by(path=entity_path).first()
+                entity = session.query(Entity).options(
+                    joinedload(Entity.entity_metadata)
+                ).filter_by(path=entity_path).first()
                 if not entity or not entity.entity_metadata:
                     return None
                 
@@ -307,33 +470,16 @@ class MetadataManager(QObject):
         """Search entities by metadata criteria."""
         try:
             with self.database_manager.get_session() as session:
-                query = session.query(Entity).join(Metadata)
+                query = session.query(Entity.path).join(Metadata)
                 
                 # Apply filters
                 for key, value in filters.items():
-                    if key == 'duration_min':
-                        query = query.filter(Metadata.duration >= value)
-                    elif key == 'duration_max':
-                        query = query.filter(Metadata.duration <= value)
-                    elif key == 'width_min':
-                        query = query.filter(Metadata.width >= value)
-                    elif key == 'width_max':
-                        query = query.filter(Metadata.width <= value)
-                    elif key == 'height_min':
-                        query = query.filter(Metadata.height >= value)
-                    elif key == 'height_max':
-                        query = query.filter(Metadata.height <= value)
-                    elif key == 'format':
-                        query = query.filter(Metadata.format == value)
-                    elif key == 'codec':
-                        query = query.filter(Metadata.codec == value)
-                    elif key == 'colorspace':
-                        query = query.filter(Metadata.colorspace == value)
-                    elif key == 'has_audio':
-                        query = query.filter(Metadata.has_audio == value)
+                    search_filter = _SEARCH_FILTERS.get(key)
+                    if search_filter:
+                        column, compare = search_filter
+                        query = query.filter(compare(column, value))
                 
-                results = query.all()
-                return [entity.path for entity in results]
+                return [path for path, in query.all()]
                 
         except Exception as e:
             logger.error(f"Error searching by metadata: {e}")
@@ -344,17 +490,15 @@ class MetadataManager(QObject):
         """Get summary statistics of metadata in database."""
         try:
             with self.database_manager.get_session() as session:
-                total_entities = session.query(Entity).count()
-                entities_with_metadata = session.query(Entity).filter(
-                    Entity.metadata_extracted == True
-                ).count()
+                total_entities, entities_with_metadata = session.query(
+                    func.count(Entity.id),
+                    func.count(case((Entity.metadata_extracted == True, 1))),
+                ).one()
                 
                 # Get format distribution
-                format_query = session.query(Metadata.format,
-                                           session.query(Metadata).filter(
-                                               Metadata.format == Metadata.format
-                                           ).count().label('count')
-                                          ).group_by(Metadata.format).all()
+                format_query = session.query(
+                    Metadata.format, func.count(Metadata.id)
+                ).group_by(Metadata.format).all()
                 
                 format_distribution = {fmt: count for fmt, count in format_query}
                 
@@ -367,4 +511,33 @@ class MetadataManager(QObject):
                 
         except Exception as e:
             logger.error(f"Error getting metadata summary: {e}")
-            return {}
\ No newline at end of file
+            return {}
+    
+    def shutdown(self) -> None:
+        """Stop metadata extraction, dropping entities still waiting in the queue."""
+        logger.info("MetadataManager shutting down")
+        
+        while True:
+            try:
+                self._task_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._task_queue.task_done()
+        
+        # Workers finish the entity they hold, then take a sentinel and exit
+        for _ in self._extraction_threads:
+            self._task_queue.put(None)
+        deadline = time.monotonic() + 5.0  # 5 second timeout
+        for thread in self._extraction_threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if any(thread.is_alive() for thread in self._extraction_threads):
+            logger.warning("Some metadata extraction workers did not complete in time")
+        
+        # Let the writer store what was already extracted, then stop it
+        self._write_queue.put(None)
+        self._writer_thread.join(5.0)
+        if self._writer_thread.is_alive():
+            logger.warning("Metadata writer did not finish storing in time")
+        
+        if self.ffmpeg_extractor:
+            self.ffmpeg_extractor.close()
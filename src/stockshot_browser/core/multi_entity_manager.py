@@ -4,11 +4,18 @@ Multi-context Entity Manager for Stockshot Browser.
 Manages entities across different contexts (general, user, project) based on path.
 """
 
+import hashlib
 import logging
+import operator
+import os
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from PySide6.QtCore import QObject, Signal
 
 from ..config.manager import ConfigurationManager
@@ -20,6 +27,20 @@ from ..utils.file_utils import FileUtils
 
 logger = logging.getLogger(__name__)
 
+# Default number of threads scanning directories in parallel during recursive scans.
+# Kept small so a scan does not flood local disks or NFS servers with concurrent
+# listings; performance.max_scan_workers raises it for high-latency storage
+_DEFAULT_SCAN_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Number of entities per entities_discovered emission during recursive scans
+_ENTITY_BATCH_SIZE = 256
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep the instance __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# DirEntry objects of a single directory listing, bucketed by what they are
+DirClassification = namedtuple('DirClassification', ['subdirs', 'videos', 'images', 'ignored', 'others'])
+
 
 class EntityType(Enum):
     """Types of media entities."""
@@ -27,24 +48,34 @@ class EntityType(Enum):
     SEQUENCE = "sequence"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class MediaEntity:
     """Represents a media entity (video file or image sequence)."""
     path: Path
     entity_type: EntityType
     name: str
-    files: List[Path]  # For sequences, contains all files
+    files: Tuple[Path, ...] = ()  # For sequences, contains all files
     frame_range: Optional[tuple] = None  # (start_frame, end_frame)
     file_size: Optional[int] = None  # Total size in bytes
     frame_count: Optional[int] = None  # Number of frames for sequences
+    mtime: Optional[int] = None  # st_mtime_ns of the source file
+    thumbnail_key: Optional[str] = None  # Cache file key, derived from path and mtime
+    
+    def __post_init__(self):
+        if self.thumbnail_key is None:
+            # A new version of the source gets a new key, so lookups never need to stat it
+            self.thumbnail_key = hashlib.blake2b(
+                f"{self.path}|{self.mtime}".encode(), digest_size=12
+            ).hexdigest()
 
 
 class MultiEntityManager(QObject):
     """Context-aware entity manager that stores entities in appropriate databases."""
     
     # Signals
-    entities_discovered = Signal(list)  # List of MediaEntity objects
+    entities_discovered = Signal(list)  # Batch of MediaEntity objects
     scan_progress = Signal(int, int)  # current, total
+    scan_completed = Signal(int)  # Total number of entities discovered
     
     def __init__(self, config_manager: ConfigurationManager, 
                  multi_database_manager: MultiDatabaseManager,
@@ -58,11 +89,11 @@ class MultiEntityManager(QObject):
         self.sequence_detector = SequenceDetector(config_manager)
         
         # Get supported extensions from config
-        self.video_extensions = set(self.config_manager.get('thumbnails.supported_formats', [
+        self.video_extensions = frozenset(self.config_manager.get('thumbnails.supported_formats', [
             '.mp4', '.mov', '.avi', '.mkv', '.m4v', '.wmv', '.flv', '.webm'
         ]))
         
-        self.image_extensions = set(self.config_manager.get('sequence_detection.supported_extensions', [
+        self.image_extensions = frozenset(self.config_manager.get('sequence_detection.supported_extensions', [
             '.exr', '.png', '.jpg', '.jpeg', '.tiff', '.tif', '.dpx'
         ]))
         
@@ -71,12 +102,12 @@ class MultiEntityManager(QObject):
         
         # Folder-based sequence detection settings
         self.folder_sequence_enabled = self.config_manager.get('sequence_detection.folder_sequence_detection.enabled', True)
-        self.ignored_extensions = set(
+        self.ignored_extensions = frozenset(
             ext.lower() for ext in self.config_manager.get('sequence_detection.folder_sequence_detection.ignored_extensions', [
                 '.tx', '.thumbs', '.thumb', '.tmp', '.bak', '.log', '.txt', '.nfo', '.db', '.DS_Store'
             ])
         )
-        self.ignored_filenames = set(
+        self.ignored_filenames = frozenset(
             name.lower() for name in self.config_manager.get('sequence_detection.folder_sequence_detection.ignored_filenames', [
                 'Thumbs.db', '.DS_Store', 'desktop.ini', '.directory'
             ])
@@ -86,134 +117,188 @@ class MultiEntityManager(QObject):
         self._current_context: ContextType = ContextType.GENERAL
         self._current_path: Optional[str] = None
         
+        # Directories whose whole subtree shares one context: path -> context
+        self._context_prefix_cache: Dict[str, ContextType] = {}
+        
+        # Directory listings for the current scan: path -> DirClassification.
+        # Parallel scan workers take their sequence folders' listings from it
+        self._classification_cache: Dict[str, DirClassification] = {}
+        self._classification_lock = threading.Lock()
     
     def set_current_path(self, path: str) -> None:
         """Set the current path context for entity operations."""
         if path != self._current_path:
             self._current_path = path
-            self._current_context = self.path_context_manager.get_context_for_path(path)
+            self._current_context = self._get_context_for_path(path)
             logger.debug(f"Switched to {self._current_context.value} entity context for path: {path}")
     
-    def scan_directory(self, directory_path: Path, recursive: bool = False) -> List[MediaEntity]:
-        """Scan directory for media entities with context awareness."""
+    def _get_context_for_path(self, path: str) -> ContextType:
+        """
+        Get the context for a path, reusing the context of a cached ancestor directory.
+        
+        Recursive scans switch path for every directory, but the context only changes
+        at configured user/project paths. A directory's context is cached for its whole
+        subtree when no configured path lies below it.
+        """
+        prefix = path
+        while True:
+            context = self._context_prefix_cache.get(prefix)
+            if context is not None:
+                return context
+            parent = os.path.dirname(prefix)
+            if parent == prefix:
+                break
+            prefix = parent
+        
+        context = self.path_context_manager.get_context_for_path(path)
+        if not self.path_context_manager.has_configured_paths_below(path):
+            self._context_prefix_cache[path] = context
+        return context
+    
+    def scan_directory(self, directory_path: Path, recursive: bool = False,
+                       collect: bool = False, report_completion: bool = True) -> List[MediaEntity]:
+        """
+        Scan directory for media entities with context awareness.
+        
+        Recursive scans report entities through entities_discovered in batches and
+        only return them all when collect is True. Callers scanning several
+        directories as one load pass report_completion=False and finish the load
+        themselves, so scan_completed does not fire once per directory.
+        """
+        # Configured paths may have changed since the last scan
+        self._context_prefix_cache.clear()
+        
         # Set context based on directory being scanned
         self.set_current_path(str(directory_path))
         
-        if recursive:
-            return self.scan_directory_recursive(directory_path)
-        else:
-            return self._scan_single_directory(directory_path)
+        try:
+            if recursive:
+                return self.scan_directory_recursive(directory_path, collect=collect,
+                                                     report_completion=report_completion)
+            else:
+                return self._scan_single_directory(directory_path)
+        finally:
+            # Listings are only valid for the duration of one scan
+            with self._classification_lock:
+                self._classification_cache.clear()
     
-    def _is_folder_sequence(self, folder_path: Path) -> bool:
+    def _classify_directory(self, path: Path, consume: bool = False) -> DirClassification:
         """
-        Check if a folder contains ONLY image sequence files and should be treated as a single sequence.
+        Read a directory once and bucket its entries into a DirClassification.
+        
+        Listings are cached for the duration of a scan so the folder-sequence check,
+        the parent's subdirectory check and the directory's own scan share one read.
+        With consume=True the cached listing is dropped once returned.
         """
-        if not self.folder_sequence_enabled or not folder_path.is_dir():
-            return False
+        key = os.fspath(path)
+        with self._classification_lock:
+            if consume:
+                classification = self._classification_cache.pop(key, None)
+            else:
+                classification = self._classification_cache.get(key)
+        if classification is not None:
+            return classification
         
+        image_exts = self.image_extensions
+        video_exts = self.video_extensions
+        ignored_exts = self.ignored_extensions
+        ignored_names = self.ignored_filenames
+        skip_hidden = not self.show_hidden_files
+        check_hidden_attribute = skip_hidden and os.name == 'nt'
+        
+        classification = DirClassification([], [], [], [], [])
+        subdirs, videos, images, ignored, others = classification
         try:
-            all_items = list(folder_path.iterdir())
-            
-            # Filter out hidden files if configured
-            if not self.show_hidden_files:
-                all_items = [item for item in all_items if not FileUtils.is_hidden_file(item)]
-            
-            # STRICT CHECK: No subdirectories allowed at all
-            subdirs = [item for item in all_items if item.is_dir()]
-            if subdirs:
-                return False
-            
-            # Get all files
-            all_files = [item for item in all_items if item.is_file()]
-            
-            if not all_files:
-                return False
-            
-            # STRICT CATEGORIZATION: Separate all files into categories
-            image_files = []
-            video_files = []
-            ignored_files = []
-            other_files = []
-            
-            for file_path in all_files:
-                file_ext = file_path.suffix.lower()
-                file_name = file_path.name.lower()
-                
-                # First check if it's an ignored file
-                if file_ext in self.ignored_extensions or file_name in self.ignored_filenames:
-                    ignored_files.append(file_path)
-                # Then check if it's an image file
-                elif file_ext in self.image_extensions:
-                    image_files.append(file_path)
-                # Then check if it's a video file
-                elif file_ext in self.video_extensions:
-                    video_files.append(file_path)
-                # Everything else is "other"
-                else:
-                    other_files.append(file_path)
-            
-            # STRICT RULE: If there are ANY video files, not a sequence folder
-            if video_files:
-                return False
-            
-            # STRICT RULE: If there are ANY other non-image, non-ignored files, not a sequence folder
-            if other_files:
-                return False
-            
-            # Must have at least 2 image files to be considered a sequence
-            if len(image_files) < 2:
-                return False
-            
-            return True
-            
-        except Exception as e:
+            # os.scandir gives the file type from the directory listing, so is_file()/is_dir()
+            # only stat symlinks. Everything in this loop runs once per entry, so it avoids
+            # helper calls such as os.path.splitext and tests the common case (files) first.
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if skip_hidden and (name.startswith('.') or
+                                        (check_hidden_attribute and FileUtils.is_hidden_entry(entry))):
+                        continue
+                    
+                    try:
+                        if not entry.is_file():
+                            if entry.is_dir():
+                                subdirs.append(entry)
+                            continue
+                    except OSError:
+                        continue
+                    
+                    # Lowercased extension, with the same rules as os.path.splitext
+                    name = name.lower()
+                    dot = name.rfind('.')
+                    suffix = name[dot:] if dot > 0 and (name[0] != '.' or name[:dot].lstrip('.')) else ''
+                    
+                    if suffix in ignored_exts or name in ignored_names:
+                        ignored.append(entry)
+                    elif suffix in image_exts:
+                        images.append(entry)
+                    elif suffix in video_exts:
+                        videos.append(entry)
+                    else:
+                        others.append(entry)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {path}: {e}")
+            classification = DirClassification([], [], [], [], [])
+        
+        if not consume:
+            with self._classification_lock:
+                self._classification_cache[key] = classification
+        return classification
+    
+    @staticmethod
+    def _is_sequence_classification(classification: DirClassification) -> bool:
+        """Check if a classified folder contains ONLY image sequence files."""
+        # STRICT RULES: no subdirectories, videos or other non-image, non-ignored files,
+        # and at least 2 image files
+        return (not classification.subdirs and not classification.videos
+                and not classification.others and len(classification.images) >= 2)
+    
+    def _is_folder_sequence(self, folder_path: Path) -> bool:
+        """
+        Check if a folder contains ONLY image sequence files and should be treated as a single sequence.
+        """
+        if not self.folder_sequence_enabled:
             return False
+        return self._is_sequence_classification(self._classify_directory(folder_path))
     
-    def _create_folder_sequence_entity(self, folder_path: Path) -> MediaEntity:
+    def _create_folder_sequence_entity(self, folder_path: Path,
+                                       classification: Optional[DirClassification] = None) -> MediaEntity:
         """Create a sequence entity from a folder containing image sequences."""
         try:
-            all_items = list(folder_path.iterdir())
-            
-            # Filter out hidden files if configured
-            if not self.show_hidden_files:
-                all_items = [item for item in all_items if not FileUtils.is_hidden_file(item)]
+            # Image entries from the (usually cached) folder listing
+            if classification is None:
+                classification = self._classify_directory(folder_path, consume=True)
+            image_entries = classification.images
             
-            # Get all files and filter
-            all_files = [item for item in all_items if item.is_file()]
-            
-            # Filter out ignored files and get only image files
-            image_files = []
-            for file_path in all_files:
-                # Skip ignored files
-                if (file_path.suffix.lower() in self.ignored_extensions or
-                    file_path.name.lower() in self.ignored_filenames):
-                    continue
-                # Only include image files
-                if file_path.suffix.lower() in self.image_extensions:
-                    image_files.append(file_path)
-            
-            if not image_files:
+            if not image_entries:
                 raise ValueError(f"No valid image files found in folder {folder_path}")
             
-            # Sort files for consistent ordering
-            image_files.sort()
+            # Sort by name for consistent ordering; all entries share the same parent.
+            # The listing is consumed here, so it is sorted in place rather than copied.
+            image_entries.sort(key=operator.attrgetter('name'))
             
-            # Calculate total size
-            total_size = 0
-            for file_path in image_files:
-                try:
-                    total_size += file_path.stat().st_size
-                except OSError:
-                    pass
+            # Calculate total size and newest modification time from the scandir entries
+            image_files = tuple(Path(entry.path) for entry in image_entries)
+            total_size, mtime = FileUtils.sum_stats(image_entries)
             
-            # Try to detect sequences within the folder to get frame range info
-            frame_range = (1, len(image_files))  # Default frame range
-            sequences = self.sequence_detector.detect_sequences(image_files)
+            # Read the frame range straight from the names when they form one complete sequence
+            frame_range = self.sequence_detector.contiguous_frame_range(
+                entry.name for entry in image_entries
+            )
             
-            if sequences:
-                # Use the first/largest sequence for frame range information
-                primary_sequence = max(sequences, key=lambda s: len(s['files']))
-                frame_range = primary_sequence.get('frame_range', (1, len(image_files)))
+            if frame_range is None:
+                # Try to detect sequences within the folder to get frame range info
+                frame_range = (1, len(image_files))  # Default frame range
+                sequences = self.sequence_detector.detect_sequences(image_files)
+                
+                if sequences:
+                    # Use the first/largest sequence for frame range information
+                    primary_sequence = max(sequences, key=lambda s: len(s['files']))
+                    frame_range = primary_sequence.get('frame_range', (1, len(image_files)))
             
             return MediaEntity(
                 path=folder_path,  # Use folder path as entity path
@@ -222,7 +307,8 @@ class MultiEntityManager(QObject):
                 files=image_files,  # Use all image files sorted
                 frame_range=frame_range,
                 file_size=total_size if total_size > 0 else None,
-                frame_count=len(image_files)
+                frame_count=len(image_files),
+                mtime=mtime
             )
                 
         except Exception as e:
@@ -231,201 +317,256 @@ class MultiEntityManager(QObject):
                 path=folder_path,
                 entity_type=EntityType.VIDEO,
                 name=folder_path.name,
-                files=[],
+                files=(),
                 frame_range=(1, 1),
                 file_size=None,
                 frame_count=0
             )
     
-    def _scan_single_directory(self, directory_path: Path) -> List[MediaEntity]:
-        """Scan a single directory for media entities with context awareness."""
+    def _scan_single_directory(self, directory_path: Path, report_progress: bool = True,
+                               classification: Optional[DirClassification] = None,
+                               sequence_subdirs: Optional[List[Path]] = None) -> List[MediaEntity]:
+        """
+        Scan a single directory for media entities with context awareness.
+        
+        Recursive scans run this on worker threads with report_progress=False and
+        report per-directory progress themselves, passing the classification and
+        the sequence subfolders they already found while walking the tree.
+        """
         entities = []
         
         if not directory_path.exists() or not directory_path.is_dir():
             return entities
         
         try:
+            # Read the directory once for all three steps
+            if classification is None:
+                classification = self._classify_directory(directory_path, consume=True)
+            
             # FIRST: Check if the current directory itself is a sequence folder
-            if self.folder_sequence_enabled:
-                is_sequence_folder = self._is_folder_sequence(directory_path)
-                
-                if is_sequence_folder:
-                    folder_entity = self._create_folder_sequence_entity(directory_path)
-                    return [folder_entity]
+            if self.folder_sequence_enabled and self._is_sequence_classification(classification):
+                folder_entity = self._create_folder_sequence_entity(directory_path, classification)
+                return [folder_entity]
             
             # SECOND: Check for folder-based sequences in subdirectories
             if self.folder_sequence_enabled:
-                subdirs = [item for item in directory_path.iterdir() if item.is_dir()]
-                
-                # Filter hidden directories if configured
-                if not self.show_hidden_files:
-                    subdirs = [d for d in subdirs if not FileUtils.is_hidden_file(d)]
-                
                 # Check each subdirectory to see if it's a sequence folder
-                for subdir in subdirs:
-                    if self._is_folder_sequence(subdir):
-                        folder_entity = self._create_folder_sequence_entity(subdir)
-                        entities.append(folder_entity)
+                if sequence_subdirs is None:
+                    sequence_subdirs = [
+                        Path(entry.path) for entry in classification.subdirs
+                        if self._is_folder_sequence(Path(entry.path))
+                    ]
+                for subdir in sequence_subdirs:
+                    folder_entity = self._create_folder_sequence_entity(subdir)
+                    entities.append(folder_entity)
             
             # THIRD: Process files in current directory
-            all_files = [f for f in directory_path.iterdir() if f.is_file()]
-            
-            # Filter hidden files if configured
-            if not self.show_hidden_files:
-                all_files = [f for f in all_files if not FileUtils.is_hidden_file(f)]
-            
-            # Separate video files and image files
-            video_files, image_files = FileUtils.filter_media_files(
-                all_files, self.video_extensions, self.image_extensions
-            )
+            video_files = [Path(entry.path) for entry in classification.videos]
+            image_files = [Path(entry.path) for entry in classification.images]
             
             total_items = len(video_files) + len(image_files)
             processed = 0
             
             # Process video files
-            for video_file in video_files:
-                entity = self._create_video_entity(video_file)
+            for video_file, entry in zip(video_files, classification.videos):
+                entity = self._create_video_entity(video_file, entry)
                 entities.append(entity)
                 processed += 1
-                self.scan_progress.emit(processed, total_items)
+                if report_progress:
+                    self.scan_progress.emit(processed, total_items)
             
             # Process image sequences
             if image_files:
                 # Check if there are any video files in the same directory
                 if video_files:
                     # When video files are present, treat all images as individual entities
-                    for image_file in image_files:
-                        entity = self._create_individual_image_entity(image_file)
+                    for image_file, entry in zip(image_files, classification.images):
+                        entity = self._create_individual_image_entity(image_file, entry)
                         entities.append(entity)
                         processed += 1
-                        self.scan_progress.emit(processed, total_items)
+                        if report_progress:
+                            self.scan_progress.emit(processed, total_items)
                 else:
                     # No video files present - normal sequence detection
                     sequences = self.sequence_detector.detect_sequences(image_files)
                     
-                    # Create entities for detected sequences
-                    processed_files = set()
+                    # Create entities for detected sequences, marking the files they consume
+                    # in a bitmap indexed by position in image_files
+                    file_index = {os.fspath(f): i for i, f in enumerate(image_files)}
+                    absorbed = bytearray(len(image_files))
+                    entries_by_path = {entry.path: entry for entry in classification.images}
                     for sequence_info in sequences:
-                        entity = self._create_sequence_entity(sequence_info)
+                        entity = self._create_sequence_entity(sequence_info, entries_by_path)
                         entities.append(entity)
-                        processed_files.update(sequence_info['files'])
+                        for f in sequence_info['files']:
+                            absorbed[file_index[os.fspath(f)]] = 1
                     
                     # Create individual entities for unmatched image files
-                    unmatched_files = [f for f in image_files if f not in processed_files]
-                    for image_file in unmatched_files:
-                        entity = self._create_individual_image_entity(image_file)
+                    unmatched_files = [
+                        (f, entry) for f, entry, used in zip(image_files, classification.images, absorbed)
+                        if not used
+                    ]
+                    for image_file, entry in unmatched_files:
+                        entity = self._create_individual_image_entity(image_file, entry)
                         entities.append(entity)
                         processed += 1
-                        self.scan_progress.emit(processed, total_items)
+                        if report_progress:
+                            self.scan_progress.emit(processed, total_items)
             
         except Exception as e:
             logger.error(f"Error scanning directory {directory_path}: {e}")
         
         return entities
     
-    def scan_directory_recursive(self, directory_path: Path) -> List[MediaEntity]:
-        """Recursively scan directory and all subdirectories for media entities."""
+    def scan_directory_recursive(self, directory_path: Path, collect: bool = False,
+                                 report_completion: bool = True) -> List[MediaEntity]:
+        """
+        Recursively scan directory and all subdirectories for media entities.
+        
+        Entities are emitted through entities_discovered in batches as directories
+        complete, followed by scan_completed unless report_completion is False.
+        They are only accumulated into the returned list when collect is True, so
+        large trees need not be held twice.
+        """
         all_entities = []
         
         if not directory_path.exists() or not directory_path.is_dir():
             return all_entities
         
+        discovered_count = 0
         try:
-            # Collect all directories to scan (including root)
-            directories_to_scan = [directory_path]
-            processed_sequence_folders = set()  # Track folders already processed as sequences
-            
-            # Find all subdirectories, but skip those that are sequence folders
-            for item in directory_path.rglob('*'):
-                if item.is_dir() and (self.show_hidden_files or not FileUtils.is_hidden_file(item)):
-                    # Check if this directory is a sequence folder
-                    if self.folder_sequence_enabled and self._is_folder_sequence(item):
-                        processed_sequence_folders.add(item)
-                        logger.debug(f"Directory {item} identified as sequence folder, will be processed by parent")
-                    else:
-                        directories_to_scan.append(item)
+            # Collect all directories to scan (including root) with their listings, depth first
+            # in listing order. Each directory is read once; hidden entries are already left out
+            # of the listing, and sequence folders are not descended into since their parent
+            # processes them. Symlinked directories are not followed. The sequence test of
+            # each subdirectory is made here once and handed to the parent's scan.
+            directories_to_scan = []
+            pending = [directory_path]
+            
+            while pending:
+                dir_path = pending.pop()
+                classification = self._classify_directory(dir_path, consume=True)
+                
+                sequence_subdirs = []
+                subdirs = []
+                for entry in classification.subdirs:
+                    subdir = Path(entry.path)
+                    if self._is_folder_sequence(subdir):
+                        sequence_subdirs.append(subdir)
+                    elif not entry.is_symlink():
+                        subdirs.append(subdir)
+                
+                directories_to_scan.append((dir_path, classification, sequence_subdirs))
+                pending.extend(reversed(subdirs))
             
             total_directories = len(directories_to_scan)
             
-            # Scan each directory
-            for i, dir_path in enumerate(directories_to_scan):
-                try:
-                    # Skip directories that are sequence folders - they will be processed by their parent
-                    if dir_path in processed_sequence_folders:
-                        continue
-                    
+            # Directory reads are I/O bound and release the GIL, so scan in parallel.
+            # Workers only build entities; context, progress and emission happen here,
+            # on the calling thread, in directory order.
+            max_workers = self.config_manager.get('performance.max_scan_workers', 0) or _DEFAULT_SCAN_WORKERS
+            batch = []
+            with ThreadPoolExecutor(max_workers=min(max_workers, total_directories)) as executor:
+                results = executor.map(
+                    lambda item: self._scan_single_directory(item[0], report_progress=False,
+                                                             classification=item[1],
+                                                             sequence_subdirs=item[2]),
+                    directories_to_scan
+                )
+                for i, ((dir_path, _, _), dir_entities) in enumerate(zip(directories_to_scan, results)):
                     # Update context for each directory
                     self.set_current_path(str(dir_path))
                     
-                    # Scan this directory (non-recursive to avoid infinite recursion)
-                    dir_entities = self._scan_single_directory(dir_path)
-                    all_entities.extend(dir_entities)
+                    discovered_count += len(dir_entities)
+                    if collect:
+                        all_entities.extend(dir_entities)
+                    
+                    batch.extend(dir_entities)
+                    if len(batch) >= _ENTITY_BATCH_SIZE:
+                        self.entities_discovered.emit(batch)
+                        batch = []
                     
                     # Update progress
                     self.scan_progress.emit(i + 1, total_directories)
-                    
-                except Exception as e:
-                    continue
-                        
-            # Emit signal with all entities
-            self.entities_discovered.emit(all_entities)
+            
+            # Emit the remaining entities
+            if batch:
+                self.entities_discovered.emit(batch)
             
         except Exception as e:
             logger.error(f"Error during recursive scan of {directory_path}: {e}")
         
+        if report_completion:
+            self.scan_completed.emit(discovered_count)
+        
         return all_entities
     
-    def _create_video_entity(self, video_file: Path) -> MediaEntity:
-        """Create a video entity."""
+    def _create_video_entity(self, video_file: Path, entry: Optional[os.DirEntry] = None) -> MediaEntity:
+        """
+        Create a video entity.
+        
+        When the file's DirEntry from the directory listing is given, its stat result
+        is used instead of stat'ing the path again.
+        """
         try:
-            file_size = video_file.stat().st_size
+            stat = (entry or video_file).stat()
+            file_size, mtime = stat.st_size, stat.st_mtime_ns
         except OSError:
-            file_size = None
+            file_size = mtime = None
         
         return MediaEntity(
             path=video_file,
             entity_type=EntityType.VIDEO,
             name=video_file.stem,
-            files=[video_file],
-            file_size=file_size
+            files=(video_file,),
+            file_size=file_size,
+            mtime=mtime
         )
     
-    def _create_sequence_entity(self, sequence_info: dict) -> MediaEntity:
-        """Create a sequence entity from sequence detection info."""
-        total_size = 0
-        for file_path in sequence_info['files']:
-            try:
-                total_size += file_path.stat().st_size
-            except OSError:
-                pass
+    def _create_sequence_entity(self, sequence_info: dict,
+                                entries_by_path: Optional[Dict[str, os.DirEntry]] = None) -> MediaEntity:
+        """
+        Create a sequence entity from sequence detection info.
+        
+        entries_by_path maps file paths to the DirEntries they were listed from, so
+        their stat results can be reused; files missing from it are stat'ed directly.
+        """
+        files = sequence_info['files']
+        if entries_by_path:
+            files = [entries_by_path.get(os.fspath(f), f) for f in files]
+        total_size, mtime = FileUtils.sum_stats(files)
         
         # Create sequence as VIDEO entity to make it appear as single video entity in Content View
         return MediaEntity(
             path=sequence_info['base_path'],
             entity_type=EntityType.VIDEO,  # Changed from SEQUENCE to VIDEO
             name=sequence_info['name'],
-            files=sequence_info['files'],
+            files=tuple(sequence_info['files']),
             frame_range=sequence_info['frame_range'],
             file_size=total_size if total_size > 0 else None,
-            frame_count=sequence_info['frame_count']
+            frame_count=sequence_info['frame_count'],
+            mtime=mtime
         )
     
-    def _create_individual_image_entity(self, image_file: Path) -> MediaEntity:
-        """Create an entity for an individual image file."""
+    def _create_individual_image_entity(self, image_file: Path,
+                                        entry: Optional[os.DirEntry] = None) -> MediaEntity:
+        """Create an entity for an individual image file, stat'ed through its DirEntry if given."""
         try:
-            file_size = image_file.stat().st_size
+            stat = (entry or image_file).stat()
+            file_size, mtime = stat.st_size, stat.st_mtime_ns
         except OSError:
-            file_size = None
+            file_size = mtime = None
         
         # Create individual image as VIDEO entity to make it appear as single video entity in Content View
         return MediaEntity(
             path=image_file,
             entity_type=EntityType.VIDEO,  # Changed from SEQUENCE to VIDEO
             name=image_file.stem,
-            files=[image_file],
+            files=(image_file,),
             frame_range=(1, 1),
             file_size=file_size,
-            frame_count=1
+            frame_count=1,
+            mtime=mtime
         )
     
     def get_entity_info(self, entity: MediaEntity) -> dict:
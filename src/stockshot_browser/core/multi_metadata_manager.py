@@ -5,73 +5,121 @@ Manages metadata across different contexts (general, user, project) based on pat
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from PySide6.QtCore import QObject, Signal, QThread, QThreadPool, QRunnable, Slot
-import json
+from PySide6.QtCore import QObject, Signal, QThread, QThreadPool, QRunnable, QTimer, Slot
+
+from sqlalchemy import case, func, literal
+from sqlalchemy.orm import joinedload
 
 from ..config.manager import ConfigurationManager
 from ..database.multi_database_manager import MultiDatabaseManager
-from ..database.models import Entity, Metadata
+from ..database.metadata_store import LOOKUP_BATCH_SIZE, METADATA_FIELDS, upsert_entity_metadata
+from ..database.models import Entity, Metadata, custom_field_path
 from ..core.path_context_manager import PathContextManager, ContextType
 from ..utils.ffmpeg_utils import FFmpegExtractor, FFmpegError
 
 
 logger = logging.getLogger(__name__)
 
+# Entities a worker takes from the task queue per acquisition
+_EXTRACTION_BATCH_SIZE = 16
+
+# Writer thread tuning: pending results held in memory, results per drain,
+# and how long (seconds) to wait for more results before storing a short batch
+_WRITE_QUEUE_SIZE = 1000
+_STORE_BATCH_SIZE = 64
+_WRITE_LINGER = 0.05
+
+# Stored results announced together through metadata_extracted_batch: at most
+# this many per emission, and no later than this many milliseconds after storing
+_SIGNAL_BATCH_SIZE = 32
+_SIGNAL_BATCH_INTERVAL_MS = 50
+
+# Metadata dicts kept for repeated get_entity_metadata calls (tooltips, overlays)
+_METADATA_CACHE_SIZE = 1024
+
 
-class ContextAwareMetadataWorker(QRunnable):
-    """Worker for extracting metadata in background thread with context awareness."""
+class BatchMetadataWorker(QRunnable):
+    """Worker extracting metadata for batches of entities taken from a shared queue.
     
-    def __init__(self, entity, ffmpeg_extractor, callback, multi_db_manager, entity_path=None):
+    Runs until the queue is drained; the manager starts workers again as new
+    entities are queued.
+    """
+    
+    def __init__(self, task_queue: queue.SimpleQueue, ffmpeg_extractor, callback, on_idle):
         super().__init__()
-        self.entity = entity
+        self.task_queue = task_queue
         self.ffmpeg_extractor = ffmpeg_extractor
-        self.callback = callback
-        self.multi_db_manager = multi_db_manager
-        self.entity_path = entity_path  # Path to determine context
+        self.callback = callback  # callback([(entity, metadata, error, context), ...])
+        self.on_idle = on_idle  # Returns True when the worker may exit
     
     @Slot()
     def run(self):
-        """Extract metadata for the entity with context awareness."""
+        """Extract metadata for queued (entity, context) tasks in batches."""
+        while True:
+            batch = []
+            for _ in range(_EXTRACTION_BATCH_SIZE):
+                try:
+                    batch.append(self.task_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if not batch:
+                if self.on_idle():
+                    return
+                continue
+            
+            results = []
+            for entity, context in batch:
+                metadata, error = self.extract(entity)
+                results.append((entity, metadata, error, context))
+            self.callback(results)
+    
+    def extract(self, entity) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Extract metadata for a single entity, returning (metadata, error)."""
         try:
-            if self.entity.entity_type.value == "video":
-                metadata = self.ffmpeg_extractor.extract_video_info(self.entity.path)
+            if entity.entity_type.value == "video":
+                metadata = self.ffmpeg_extractor.extract_video_info(entity.path)
             else:  # sequence or image
-                # For sequences, analyze the first frame
-                first_file = self.entity.files[0] if self.entity.files else self.entity.path
-                metadata = self.ffmpeg_extractor.extract_image_info(first_file)
+                # For sequences, analyze the first frame; only header fields are stored
+                first_file = entity.files[0] if entity.files else entity.path
+                metadata = self.ffmpeg_extractor.extract_image_info_fast(first_file)
                 
                 # Add sequence-specific metadata
-                if len(self.entity.files) > 1:
-                    metadata['frame_count'] = len(self.entity.files)
+                if len(entity.files) > 1:
+                    metadata['frame_count'] = len(entity.files)
                     metadata['is_sequence'] = True
-                    if self.entity.frame_range:
-                        metadata['frame_range'] = f"{self.entity.frame_range[0]}-{self.entity.frame_range[1]}"
+                    if entity.frame_range:
+                        metadata['frame_range'] = f"{entity.frame_range[0]}-{entity.frame_range[1]}"
             
             # Add entity-specific metadata
-            metadata['entity_name'] = self.entity.name
-            metadata['entity_type'] = self.entity.entity_type.value
-            metadata['file_count'] = len(self.entity.files)
-            metadata['entity_path'] = self.entity_path  # Include path for context
+            metadata['entity_name'] = entity.name
+            metadata['entity_type'] = entity.entity_type.value
+            metadata['file_count'] = len(entity.files)
             
-            if self.entity.file_size:
-                metadata['total_size'] = self.entity.file_size
+            if entity.file_size:
+                metadata['total_size'] = entity.file_size
             
-            self.callback(self.entity, metadata, None)
+            return metadata, None
             
         except Exception as e:
-            logger.error(f"Error extracting metadata for {self.entity.name}: {e}")
-            self.callback(self.entity, None, str(e))
+            logger.error(f"Error extracting metadata for {entity.name}: {e}")
+            return None, str(e)
 
 
 class MultiMetadataManager(QObject):
     """Context-aware metadata manager that stores metadata in appropriate databases."""
     
     # Signals
-    metadata_extracted = Signal(object, dict)  # entity, metadata
     metadata_extraction_failed = Signal(object, str)  # entity, error
     extraction_progress = Signal(int, int)  # current, total
+    metadata_extracted_batch = Signal(list)  # [(entity, metadata), ...] stored since last emission
+    _signal_batch_pending = Signal()  # Starts the flush timer from worker threads
     
     def __init__(self, config_manager: ConfigurationManager, 
                  multi_database_manager: MultiDatabaseManager,
@@ -81,24 +129,57 @@ class MultiMetadataManager(QObject):
         self.multi_database_manager = multi_database_manager
         self.path_context_manager = path_context_manager
         
-        # Initialize FFmpeg extractor
+        # Initialize FFmpeg extractor; each batch worker reuses a long-lived ffprobe loop
         try:
-            self.ffmpeg_extractor = FFmpegExtractor(config_manager)
+            self.ffmpeg_extractor = FFmpegExtractor(config_manager, persistent_probe=True)
             self.ffmpeg_available = True
         except FFmpegError as e:
             logger.warning(f"FFmpeg not available: {e}")
             self.ffmpeg_extractor = None
             self.ffmpeg_available = False
         
-        # Thread pool for background processing
+        # Thread pool for background processing; a fixed number of batch
+        # workers drain a shared task queue of (entity, context) pairs
         self.thread_pool = QThreadPool()
-        max_threads = self.config_manager.get('performance.max_concurrent_thumbnails', 4)
-        self.thread_pool.setMaxThreadCount(max_threads)
+        self._max_workers = (self.config_manager.get('performance.max_concurrent_thumbnails', 0)
+                             or QThread.idealThreadCount())
+        self.thread_pool.setMaxThreadCount(self._max_workers)
+        self._task_queue: "queue.SimpleQueue[Tuple[Any, ContextType]]" = queue.SimpleQueue()
+        self._active_workers = 0
+        self._worker_lock = threading.Lock()
+        self._shutting_down = False
         
         # Processing state
         self.processing_entities = []
         self.completed_count = 0
         
+        self._outstanding_count = 0  # Queued entities not yet stored or failed, across calls
+        self._progress_lock = threading.Lock()
+        
+        # Extracted results are stored by a single writer thread, since SQLite
+        # allows one writer at a time; None is the shutdown sentinel
+        self._write_queue: "queue.Queue[Optional[Tuple[Any, Dict[str, Any], ContextType]]]" = queue.Queue(
+            maxsize=_WRITE_QUEUE_SIZE
+        )
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="MultiMetadataWriter", daemon=True
+        )
+        self._writer_thread.start()
+        
+        # Stored results not yet announced through metadata_extracted_batch
+        self._pending_signals: List[Tuple[Any, Dict[str, Any]]] = []
+        self._signal_lock = threading.Lock()
+        self._batch_flush_timer = QTimer(self)
+        self._batch_flush_timer.setSingleShot(True)
+        self._batch_flush_timer.setInterval(_SIGNAL_BATCH_INTERVAL_MS)
+        self._batch_flush_timer.timeout.connect(self._emit_pending_signals)
+        self._signal_batch_pending.connect(self._start_flush_timer)
+        
+        # LRU of stored metadata by (entity path, context); invalidated from the writer thread
+        self._metadata_cache: "OrderedDict[Tuple[str, ContextType], Dict[str, Any]]" = OrderedDict()
+        self._cache_generation = 0  # Bumped on every invalidation
+        self._cache_lock = threading.Lock()
+        
         # Current context for batch operations
         self._current_context: ContextType = ContextType.GENERAL
         self._current_path: Optional[str] = None
@@ -123,229 +204,272 @@ class MultiMetadataManager(QObject):
             logger.warning("FFmpeg not available, skipping metadata extraction")
             return
         
+        if not self.config_manager.get('metadata.auto_extract', True):
+            return
+        
         # Use provided path or current path to determine context
         target_path = entity_path or self._current_path or str(entities[0].path)
         context = self.path_context_manager.get_context_for_path(target_path)
         
         logger.info(f"Processing entities in {context.value} metadata context")
         
-        # Filter entities that need metadata extraction
-        entities_to_process = []
-        for entity in entities:
-            if self.config_manager.get('metadata.auto_extract', True):
-                entities_to_process.append(entity)
-        
-        if not entities_to_process:
-            return
+        entities_to_process = list(entities)
         
-        # Reset processing state
-        self.processing_entities = entities_to_process
-        self.completed_count = 0
+        # Reset processing state, or extend it while earlier scan batches are in flight
+        with self._progress_lock:
+            if self._outstanding_count == 0:
+                self.processing_entities = []
+                self.completed_count = 0
+            self.processing_entities.extend(entities_to_process)
+            self._outstanding_count += len(entities_to_process)
         
-        # Start extraction for each entity
+        # Queue extraction for each entity and top up the workers draining the queue
         for entity in entities_to_process:
-            worker = ContextAwareMetadataWorker(
-                entity,
-                self.ffmpeg_extractor,
-                self._on_metadata_extracted,
-                self.multi_database_manager,
-                entity_path=target_path
-            )
-            self.thread_pool.start(worker)
+            self._task_queue.put((entity, context))
+        self._start_workers()
     
-    def _on_metadata_extracted(self, entity, metadata: Optional[Dict], error: Optional[str]):
-        """Handle metadata extraction completion with context awareness."""
-        self.completed_count += 1
-        
-        if error:
-            logger.error(f"Metadata extraction failed for {entity.name}: {error}")
-            self.metadata_extraction_failed.emit(entity, error)
-        elif metadata:
-            logger.debug(f"Metadata extracted for {entity.name}")
+    def _start_workers(self) -> None:
+        """Start batch workers until the configured number are running."""
+        with self._worker_lock:
+            if self._shutting_down:
+                return
+            while self._active_workers < self._max_workers:
+                self._active_workers += 1
+                self.thread_pool.start(BatchMetadataWorker(
+                    self._task_queue,
+                    self.ffmpeg_extractor,
+                    self._on_metadata_extracted,
+                    self._on_worker_idle
+                ))
+    
+    def _on_worker_idle(self) -> bool:
+        """Let a worker exit if the queue is still empty, checked under the start lock."""
+        with self._worker_lock:
+            if self._task_queue.empty() or self._shutting_down:
+                self._active_workers -= 1
+                return True
+            return False
+    
+    def _on_metadata_extracted(self, results: List[Tuple[Any, Optional[Dict], Optional[str], ContextType]]):
+        """Handle completion of a worker's batch with context awareness."""
+        failed = 0
+        for entity, metadata, error, context in results:
+            if error:
+                logger.error(f"Metadata extraction failed for {entity.name}: {error}")
+                self.metadata_extraction_failed.emit(entity, error)
+                failed += 1
+            elif metadata:
+                logger.debug(f"Metadata extracted for {entity.name}")
+                
+                # Hand off to the writer thread; it reports progress once stored
+                self._write_queue.put((entity, metadata, context))
+            else:
+                failed += 1
+        
+        if failed:
+            self._report_progress(failed)
+    
+    def _report_progress(self, count: int) -> None:
+        """Count finished entities and emit progress at roughly 1% steps."""
+        with self._progress_lock:
+            previous = self.completed_count
+            self.completed_count += count
+            completed = self.completed_count
+            total = len(self.processing_entities)
+            self._outstanding_count = max(0, self._outstanding_count - count)
+        
+        step = max(1, total // 100)
+        if completed >= total or completed // step != previous // step:
+            self.extraction_progress.emit(completed, total)
+    
+    def _writer_loop(self) -> None:
+        """Drain extracted metadata from the queue and store it in per-context batches."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            batch = [item]
             
-            # Extract entity path for context determination
-            entity_path = metadata.get('entity_path') if isinstance(metadata, dict) else None
+            # Extraction trickles in a worker batch at a time; coalesce into fewer commits
+            stopping = False
+            deadline = time.monotonic() + _WRITE_LINGER
+            while len(batch) < _STORE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._write_queue.get(timeout=remaining)
+                    else:
+                        item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
             
-            # Store metadata in the appropriate database
-            self._store_metadata(entity, metadata, entity_path)
+            # Group by the database each entity belongs to
+            batches: Dict[ContextType, List[Tuple[Any, Dict[str, Any]]]] = defaultdict(list)
+            for entity, metadata, context in batch:
+                batches[context].append((entity, metadata))
+            for context, context_batch in batches.items():
+                self._flush_batch(context, context_batch)
+            self._report_progress(len(batch))
             
-            # Emit signal
-            self.metadata_extracted.emit(entity, metadata)
-        
-        # Emit progress
-        self.extraction_progress.emit(self.completed_count, len(self.processing_entities))
+            if stopping:
+                return
     
-    def _store_metadata(self, entity, metadata: Dict[str, Any], entity_path: Optional[str] = None) -> None:
-        """Store metadata in the appropriate database based on context."""
+    def _flush_batch(self, context: ContextType, batch: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Store a batch of extracted metadata in one transaction and announce it."""
         try:
-            # Determine which database to use
-            if entity_path:
-                with self.multi_database_manager.get_session_for_path(entity_path) as session:
-                    self._store_in_session(session, entity, metadata)
-            else:
-                # Use current context
-                with self.multi_database_manager.get_session() as session:
-                    self._store_in_session(session, entity, metadata)
+            with self.multi_database_manager.get_session(context=context) as session:
+                upsert_entity_metadata(session, batch)
+            logger.debug(f"Stored metadata for {len(batch)} entities in {context.value} database")
         except Exception as e:
-            logger.error(f"Error storing metadata for {entity.name}: {e}")
-    
-    def _store_in_session(self, session, entity, metadata: Dict[str, Any]) -> None:
-        """Store metadata in the provided database session."""
-        # First, ensure entity exists in database
-        db_entity = session.query(Entity).filter_by(
-            path=str(entity.path),
-            entity_type=entity.entity_type.value
-        ).first()
-        
-        if not db_entity:
-            # Create entity in database with proper type conversion
-            db_entity = Entity(
-                path=str(entity.path),
-                entity_type=entity.entity_type.value,
-                name=str(entity.name),
-                file_size=int(entity.file_size) if entity.file_size else None,
-                file_count=int(len(entity.files)) if hasattr(entity, 'files') and entity.files else 1,
-                metadata_extracted=True,
-                thumbnail_generated=False
-            )
-            session.add(db_entity)
-            session.flush()  # Get the ID
-        
-        # Check if metadata already exists
-        existing_metadata = session.query(Metadata).filter_by(
-            entity_id=db_entity.id
-        ).first()
-        
-        if existing_metadata:
-            # Update existing metadata
-            self._update_metadata_record(existing_metadata, metadata)
+            # Fall back to one transaction per entity so one bad record doesn't drop the batch
+            logger.error(f"Error storing metadata batch of {len(batch)} entities, retrying individually: {e}")
+            for entity, metadata in batch:
+                self._store_metadata(entity, metadata, context)
+        
+        self._invalidate_cache([str(entity.path) for entity, _ in batch], context)
+        
+        # Announced in chunks through metadata_extracted_batch rather than one signal per entity
+        with self._signal_lock:
+            self._pending_signals.extend(batch)
+            ready = len(self._pending_signals) >= _SIGNAL_BATCH_SIZE
+        if ready:
+            self._emit_pending_signals()
         else:
-            # Create new metadata record
-            metadata_record = self._create_metadata_record(db_entity.id, metadata)
-            session.add(metadata_record)
-        
-        # Mark entity as having metadata extracted
-        db_entity.metadata_extracted = True
-        
-        logger.debug(f"Successfully stored metadata for entity: {entity.name}")
+            self._signal_batch_pending.emit()
     
-    def _create_metadata_record(self, entity_id: int, metadata: Dict[str, Any]) -> Metadata:
-        """Create a new metadata record."""
-        # Helper function to safely convert values
-        def safe_convert(value, target_type):
-            if value is None:
-                return None
-            try:
-                if target_type == float:
-                    return float(value)
-                elif target_type == int:
-                    return int(value)
-                elif target_type == bool:
-                    return bool(value)
-                elif target_type == str:
-                    return str(value)
-                else:
-                    return value
-            except (ValueError, TypeError):
-                return None
-        
-        # Separate standard fields from custom fields with proper type conversion
-        standard_fields = {
-            'duration': safe_convert(metadata.get('duration'), float),
-            'fps': safe_convert(metadata.get('fps'), float),
-            'width': safe_convert(metadata.get('width'), int),
-            'height': safe_convert(metadata.get('height'), int),
-            'aspect_ratio': safe_convert(metadata.get('aspect_ratio'), float),
-            'format': safe_convert(metadata.get('format'), str),
-            'codec': safe_convert(metadata.get('codec'), str),
-            'audio_codec': safe_convert(metadata.get('audio_codec'), str),
-            'colorspace': safe_convert(metadata.get('colorspace'), str),
-            'bit_depth': safe_convert(metadata.get('bit_depth'), int),
-            'bitrate': safe_convert(metadata.get('bitrate'), int),
-            'frame_count': safe_convert(metadata.get('frame_count'), int),
-            'has_audio': safe_convert(metadata.get('has_audio', False), bool),
-        }
-        
-        # Remove None values
-        standard_fields = {k: v for k, v in standard_fields.items() if v is not None}
-        
-        # Custom fields (everything else) - exclude context-specific fields
-        excluded_fields = ['duration', 'fps', 'width', 'height', 'aspect_ratio',
-                          'format', 'codec', 'audio_codec', 'colorspace', 'bit_depth',
-                          'bitrate', 'frame_count', 'has_audio', 'entity_path']
-        
-        custom_fields = {k: v for k, v in metadata.items()
-                        if k not in excluded_fields and v is not None}
-        
-        metadata_record = Metadata(
-            entity_id=int(entity_id),
-            custom_fields=json.dumps(custom_fields) if custom_fields else None,
-            **standard_fields
-        )
-        
-        return metadata_record
+    @Slot()
+    def _start_flush_timer(self) -> None:
+        """Schedule announcing stored results that did not fill a signal batch."""
+        if not self._batch_flush_timer.isActive():
+            self._batch_flush_timer.start()
     
-    def _update_metadata_record(self, metadata_record: Metadata, metadata: Dict[str, Any]) -> None:
-        """Update an existing metadata record."""
-        # Update standard fields
-        standard_fields = [
-            'duration', 'fps', 'width', 'height', 'aspect_ratio', 'format',
-            'codec', 'audio_codec', 'colorspace', 'bit_depth', 'bitrate',
-            'frame_count', 'has_audio'
-        ]
-        
-        for field in standard_fields:
-            if field in metadata and metadata[field] is not None:
-                setattr(metadata_record, field, metadata[field])
-        
-        # Update custom fields
-        existing_custom = metadata_record.get_custom_fields()
-        excluded_fields = standard_fields + ['entity_path']
-        custom_fields = {k: v for k, v in metadata.items()
-                        if k not in excluded_fields and v is not None}
-        
-        existing_custom.update(custom_fields)
-        metadata_record.set_custom_fields(existing_custom)
+    @Slot()
+    def _emit_pending_signals(self) -> None:
+        """Announce stored results in chunks of at most _SIGNAL_BATCH_SIZE."""
+        with self._signal_lock:
+            pending, self._pending_signals = self._pending_signals, []
+        for start in range(0, len(pending), _SIGNAL_BATCH_SIZE):
+            self.metadata_extracted_batch.emit(pending[start:start + _SIGNAL_BATCH_SIZE])
+    
+    def _store_metadata(self, entity, metadata: Dict[str, Any], context: Optional[ContextType] = None) -> None:
+        """Store metadata in the database for the given or current context."""
+        try:
+            with self.multi_database_manager.get_session(context=context) as session:
+                upsert_entity_metadata(session, [(entity, metadata)])
+                
+                logger.debug(f"Successfully stored metadata for entity: {entity.name}")
+        except Exception as e:
+            logger.error(f"Error storing metadata for {entity.name}: {e}")
+    
+    def _invalidate_cache(self, entity_paths: List[str], context: ContextType) -> None:
+        """Drop cached metadata for entities just written to a context's database."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            for entity_path in entity_paths:
+                self._metadata_cache.pop((entity_path, context), None)
     
     def get_entity_metadata(self, entity_path: str, context_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get metadata for an entity from the appropriate database."""
+        # Determine which database to use
+        if context_path:
+            context = self.path_context_manager.get_context_for_path(context_path)
+        else:
+            context = self.multi_database_manager.get_current_context()
+        
+        key = (entity_path, context)
+        with self._cache_lock:
+            cached = self._metadata_cache.get(key)
+            if cached is not None:
+                self._metadata_cache.move_to_end(key)
+                return dict(cached)
+            generation = self._cache_generation
+        
         try:
-            # Determine which database to use
-            if context_path:
-                with self.multi_database_manager.get_session_for_path(context_path) as session:
-                    return self._get_metadata_from_session(session, entity_path)
-            else:
-                with self.multi_database_manager.get_session() as session:
-                    return self._get_metadata_from_session(session, entity_path)
+            with self.multi_database_manager.get_session(context=context) as session:
+                metadata = self._get_metadata_from_session(session, entity_path)
         except Exception as e:
             logger.error(f"Error getting metadata for {entity_path}: {e}")
             return None
+        
+        # Entities without metadata yet are not cached; extraction may store it any moment.
+        # A store that landed while querying may have made this result stale
+        if metadata is not None:
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    self._metadata_cache[key] = metadata
+                    if len(self._metadata_cache) > _METADATA_CACHE_SIZE:
+                        self._metadata_cache.popitem(last=False)
+            metadata = dict(metadata)
+        return metadata
+    
+    def get_entity_metadata_bulk(self, entity_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get metadata for many entities, each from the database of its own context.
+        
+        Paths are grouped by context and looked up with one IN (...) query per
+        chunk, instead of one session and query per entity. Entities without
+        stored metadata are left out of the result.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        paths_by_context: Dict[ContextType, List[str]] = defaultdict(list)
+        with self._cache_lock:
+            for entity_path in entity_paths:
+                context = self.path_context_manager.get_context_for_path(entity_path)
+                key = (entity_path, context)
+                cached = self._metadata_cache.get(key)
+                if cached is not None:
+                    self._metadata_cache.move_to_end(key)
+                    results[entity_path] = dict(cached)
+                else:
+                    paths_by_context[context].append(entity_path)
+            generation = self._cache_generation
+        
+        fetched: Dict[Tuple[str, ContextType], Dict[str, Any]] = {}
+        for context, paths in paths_by_context.items():
+            try:
+                with self.multi_database_manager.get_session(context=context) as session:
+                    for start in range(0, len(paths), LOOKUP_BATCH_SIZE):
+                        entities = session.query(Entity).options(
+                            joinedload(Entity.entity_metadata)
+                        ).filter(
+                            Entity.path.in_(paths[start:start + LOOKUP_BATCH_SIZE])
+                        ).all()
+                        for entity in entities:
+                            if entity.entity_metadata:
+                                fetched[(entity.path, context)] = self._metadata_to_dict(entity.entity_metadata)
+            except Exception as e:
+                logger.error(f"Error getting metadata for {len(paths)} entities in {context.value} database: {e}")
+        
+        with self._cache_lock:
+            if generation == self._cache_generation:
+                self._metadata_cache.update(fetched)
+                while len(self._metadata_cache) > _METADATA_CACHE_SIZE:
+                    self._metadata_cache.popitem(last=False)
+        
+        for (entity_path, _), metadata in fetched.items():
+            results[entity_path] = dict(metadata)
+        return results
     
     def _get_metadata_from_session(self, session, entity_path: str) -> Optional[Dict[str, Any]]:
         """Get metadata from database session."""
-        entity = session.query(Entity).filter_by(path=entity_path).first()
+        # Load the metadata row in the same query instead of a lazy second round trip
+        entity = session.query(Entity).options(
+            joinedload(Entity.entity_metadata)
+        ).filter_by(path=entity_path).first()
         if not entity or not entity.entity_metadata:
             return None
         
-        metadata_dict = {
-            'duration': entity.entity_metadata.duration,
-            'fps': entity.entity_metadata.fps,
-            'width': entity.entity_metadata.width,
-            'height': entity.entity_metadata.height,
-            'aspect_ratio': entity.entity_metadata.aspect_ratio,
-            'format': entity.entity_metadata.format,
-            'codec': entity.entity_metadata.codec,
-            'audio_codec': entity.entity_metadata.audio_codec,
-            'colorspace': entity.entity_metadata.colorspace,
-            'bit_depth': entity.entity_metadata.bit_depth,
-            'bitrate': entity.entity_metadata.bitrate,
-            'frame_count': entity.entity_metadata.frame_count,
-            'has_audio': entity.entity_metadata.has_audio,
-        }
+        return self._metadata_to_dict(entity.entity_metadata)
+    
+    def _metadata_to_dict(self, metadata_record: Metadata) -> Dict[str, Any]:
+        """Flatten a metadata record and its custom fields into one dict."""
+        metadata_dict = {field: getattr(metadata_record, field) for field in METADATA_FIELDS}
         
         # Add custom fields
-        custom_fields = entity.entity_metadata.get_custom_fields()
-        metadata_dict.update(custom_fields)
+        metadata_dict.update(metadata_record.get_custom_fields())
         
         # Remove None values
         return {k: v for k, v in metadata_dict.items() if v is not None}
@@ -366,7 +490,7 @@ class MultiMetadataManager(QObject):
     
     def _search_in_session(self, session, filters: Dict[str, Any]) -> List[str]:
         """Search by metadata in database session."""
-        query = session.query(Entity).join(Metadata)
+        query = session.query(Entity.path).join(Metadata)
         
         # Apply filters
         for key, value in filters.items():
@@ -390,16 +514,24 @@ class MultiMetadataManager(QObject):
                 query = query.filter(Metadata.colorspace == value)
             elif key == 'has_audio':
                 query = query.filter(Metadata.has_audio == value)
-        
-        results = query.all()
-        return [entity.path for entity in results]
+            elif key.startswith('custom.'):
+                # Inline the JSON path so SQLite can match the json_extract expression indexes
+                field = key[len('custom.'):]
+                if field and '"' not in field:
+                    query = query.filter(func.json_extract(
+                        Metadata.custom_fields,
+                        literal(custom_field_path(field), literal_execute=True)
+                    ) == value)
+        
+        # Paths only, fetched in chunks rather than as one large result
+        return [path for path, in query.yield_per(1000)]
     
     def get_metadata_summary(self, context: Optional[ContextType] = None) -> Dict[str, Any]:
         """Get summary statistics of metadata in appropriate database."""
         try:
             if context:
                 # Get summary for specific context
-                with self.multi_database_manager.get_session_for_context(context) as session:
+                with self.multi_database_manager.get_session(context=context) as session:
                     return self._get_summary_from_session(session)
             else:
                 # Get summary for current context
@@ -411,17 +543,15 @@ class MultiMetadataManager(QObject):
     
     def _get_summary_from_session(self, session) -> Dict[str, Any]:
         """Get metadata summary from database session."""
-        total_entities = session.query(Entity).count()
-        entities_with_metadata = session.query(Entity).filter(
-            Entity.metadata_extracted == True
-        ).count()
+        total_entities, entities_with_metadata = session.query(
+            func.count(Entity.id),
+            func.count(case((Entity.metadata_extracted == True, 1))),
+        ).one()
         
         # Get format distribution
-        format_query = session.query(Metadata.format,
-                                   session.query(Metadata).filter(
-                                       Metadata.format == Metadata.format
-                                   ).count().label('count')
-                                  ).group_by(Metadata.format).all()
+        format_query = session.query(
+            Metadata.format, func.count(Metadata.id)
+        ).group_by(Metadata.format).all()
         
         format_distribution = {fmt: count for fmt, count in format_query}
         
@@ -432,6 +562,35 @@ class MultiMetadataManager(QObject):
             'format_distribution': format_distribution
         }
     
+    def shutdown(self) -> None:
+        """Stop metadata extraction, dropping entities still waiting in the queue."""
+        logger.info("MultiMetadataManager shutting down")
+        
+        with self._worker_lock:
+            self._shutting_down = True
+        while True:
+            try:
+                self._task_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        # Workers finish the batch they hold, then exit
+        if not self.thread_pool.waitForDone(5000):  # 5 second timeout
+            logger.warning("Some metadata extraction workers did not complete in time")
+        
+        if self.ffmpeg_extractor:
+            self.ffmpeg_extractor.close()
+        
+        # Let the writer store what was already extracted, then stop it
+        self._write_queue.put(None)
+        self._writer_thread.join(5.0)
+        if self._writer_thread.is_alive():
+            logger.warning("Metadata writer did not finish storing in time")
+        
+        # Dropped entities never complete
+        with self._progress_lock:
+            self._outstanding_count = 0
+    
     def get_current_context(self) -> ContextType:
         """Get the current context."""
         return self._current_context
@@ -5,10 +5,15 @@ Manages thumbnails across different contexts (general, user, project) based on p
 """
 
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from PySide6.QtCore import QObject, Signal, QThreadPool, QRunnable, Slot
+from typing import List, Optional, Dict, Any, Tuple
+from PySide6.QtCore import QObject, Signal, QThread, QThreadPool, QRunnable, QTimer, Slot
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from ..config.manager import ConfigurationManager
 from ..database.multi_database_manager import MultiDatabaseManager
@@ -20,13 +25,27 @@ from ..core.path_context_manager import PathContextManager, ContextType
 
 logger = logging.getLogger(__name__)
 
+# Generated thumbnails are recorded in transactions of up to this many entities
+_STORE_BATCH_SIZE = 64
+# Records that do not fill a batch are stored this long after the first of them was queued
+_STORE_FLUSH_INTERVAL_MS = 500
+# Maximum number of paths per IN (...) lookup, well below SQLite's bound parameter limit
+_LOOKUP_BATCH_SIZE = 500
+# Resolved animated thumbnail paths kept for repeated lookups while painting
+_ANIMATED_PATH_CACHE_SIZE = 4096
+# Batches of at least this many entities check thumbnail freshness on several threads
+_PARALLEL_CHECK_MIN_ENTITIES = 256
+# Freshness checks are stat bound and release the GIL, so this can exceed the core count
+_FRESHNESS_CHECK_WORKERS = 16
+
 
 class ContextAwareThumbnailWorker(QRunnable):
     """Worker for generating thumbnails in background thread with context awareness."""
     
     def __init__(self, entity, thumbnail_generator, output_path, resolution, callback,
                  animated=False, config_manager=None, color_manager=None, 
-                 multi_db_manager=None, entity_path=None):
+                 multi_db_manager=None, entity_path=None, is_video=False, is_sequence=False,
+                 cancel_event=None):
         super().__init__()
         self.entity = entity
         self.thumbnail_generator = thumbnail_generator
@@ -38,65 +57,63 @@ class ContextAwareThumbnailWorker(QRunnable):
         self.color_manager = color_manager
         self.multi_db_manager = multi_db_manager
         self.entity_path = entity_path  # Path to determine context
+        self.is_video = is_video  # Single file decoded as a video
+        self.is_sequence = is_sequence  # Multiple image files
+        self.cancel_event = cancel_event  # Set when the batch is no longer wanted
     
     @Slot()
     def run(self):
         """Generate thumbnail for the entity with context awareness."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return
+        
         start_time = time.time()
         
         try:
             success = False
             source_frame = None
             animated_path = None
+            file_size = None
             
-            # Determine entity characteristics
-            is_single_image = (len(self.entity.files) == 1 and self.entity.frame_count == 1)
-            is_sequence = len(self.entity.files) > 1
-            is_actual_video = (len(self.entity.files) == 1 and self.entity.frame_count != 1)
-            
-            
-            if is_actual_video:
+            if self.is_video:
                 # Process video file
                 if self.animated and self.config_manager:
                     animated_enabled = self.config_manager.get('thumbnails.animated.enabled', True)
                     if animated_enabled:
-                        # Generate animated thumbnail
+                        # Generate animated and static thumbnails in a single decode pass
                         animated_path = self.output_path.with_suffix('.gif')
                         frame_count = self.config_manager.get('thumbnails.animated.frame_count', 25)
                         fps = self.config_manager.get('thumbnails.animated.fps', 10)
                         
-                        success = self.thumbnail_generator.generate_animated_thumbnail(
+                        success, source_frame = self.thumbnail_generator.generate_animated_and_static(
                             self.entity.path,
                             animated_path,
+                            self.output_path,
                             frame_count,
                             fps,
                             self.resolution
                         )
-                        
-                        if success:
-                            # Generate static thumbnail as fallback
-                            duration = self.thumbnail_generator.get_video_duration(self.entity.path)
-                            source_frame = (duration * 0.1) if duration else 1.0
-                            self.thumbnail_generator.extract_frame(
-                                self.entity.path,
-                                self.output_path,
-                                source_frame,
-                                self.resolution
-                            )
                 
                 # Generate static thumbnail if animated failed or not enabled
                 if not success:
                     duration = self.thumbnail_generator.get_video_duration(self.entity.path)
                     source_frame = (duration * 0.1) if duration else 1.0
-                    success = self.thumbnail_generator.extract_frame(
+                    frame_data = self.thumbnail_generator.extract_frame_data(
                         self.entity.path,
-                        self.output_path,
                         source_frame,
                         self.resolution
                     )
+                    if frame_data:
+                        # Write the piped frame in one shot; its size is already known
+                        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                        self.output_path.write_bytes(frame_data)
+                        file_size = len(frame_data)
+                        success = True
             else:
                 # Process image or sequence
-                if is_sequence:
+                if self.is_sequence:
+                    static_generated = False
+                    
                     # Generate animated thumbnail for sequence if enabled
                     if self.animated and self.config_manager:
                         animated_enabled = self.config_manager.get('thumbnails.animated.enabled', True)
@@ -105,25 +122,38 @@ class ContextAwareThumbnailWorker(QRunnable):
                             frame_count = self.config_manager.get('thumbnails.animated.frame_count', 25)
                             fps = self.config_manager.get('thumbnails.animated.fps', 10)
                             
-                            success = self.thumbnail_generator.generate_animated_thumbnail_from_sequence(
+                            # Generate both thumbnails in one FFmpeg pass over the sampled frames
+                            success = self.thumbnail_generator.generate_sequence_animated_and_static(
                                 self.entity.files,
                                 animated_path,
+                                self.output_path,
                                 frame_count,
                                 fps,
                                 self.resolution
                             )
+                            static_generated = success
+                            
+                            if not success:
+                                success = self.thumbnail_generator.generate_animated_thumbnail_from_sequence(
+                                    self.entity.files,
+                                    animated_path,
+                                    frame_count,
+                                    fps,
+                                    self.resolution
+                                )
                     
-                    # Generate static thumbnail from middle frame
-                    middle_index = len(self.entity.files) // 2
-                    source_file = self.entity.files[middle_index]
-                    static_success = self.thumbnail_generator.extract_image_thumbnail(
-                        source_file,
-                        self.output_path,
-                        self.resolution
-                    )
-                    
-                    if not success:
-                        success = static_success
+                    if not static_generated:
+                        # Generate static thumbnail from middle frame
+                        middle_index = len(self.entity.files) // 2
+                        source_file = self.entity.files[middle_index]
+                        static_success = self.thumbnail_generator.extract_image_thumbnail(
+                            source_file,
+                            self.output_path,
+                            self.resolution
+                        )
+                        
+                        if not success:
+                            success = static_success
                 else:
                     # Single image
                     source_file = self.entity.files[0] if self.entity.files else self.entity.path
@@ -137,28 +167,38 @@ class ContextAwareThumbnailWorker(QRunnable):
             
             if success:
                 # Get file size
-                try:
-                    file_size = self.output_path.stat().st_size
-                except OSError:
-                    file_size = None
+                if file_size is None:
+                    try:
+                        file_size = self.output_path.stat().st_size
+                    except OSError:
+                        file_size = None
+                
+                # The GIF counts towards the cache size as well
+                animated_size = None
+                if animated_path:
+                    try:
+                        animated_size = animated_path.stat().st_size
+                    except OSError:
+                        animated_path = None
                 
                 # Prepare thumbnail info
                 thumbnail_info = {
                     'static_path': str(self.output_path),
-                    'animated_path': str(animated_path) if animated_path and animated_path.exists() else None,
+                    'animated_path': str(animated_path) if animated_path else None,
+                    'animated_size': animated_size,
                     'entity_path': self.entity_path  # Include path for context
                 }
                 
                 self.callback(self.entity, thumbnail_info, generation_time,
-                            source_frame, file_size, None)
+                            source_frame, file_size, None, self.entity_path)
             else:
                 self.callback(self.entity, None, generation_time, source_frame,
-                            None, "Thumbnail generation failed")
+                            None, "Thumbnail generation failed", self.entity_path)
                 
         except Exception as e:
             generation_time = time.time() - start_time
             logger.error(f"🔍 ContextWorker: Exception in thumbnail generation for {self.entity.name}: {e}")
-            self.callback(self.entity, None, generation_time, None, None, str(e))
+            self.callback(self.entity, None, generation_time, None, None, str(e), self.entity_path)
 
 
 class MultiThumbnailManager(QObject):
@@ -168,6 +208,7 @@ class MultiThumbnailManager(QObject):
     thumbnail_generated = Signal(object, str)  # entity, thumbnail_path
     thumbnail_generation_failed = Signal(object, str)  # entity, error
     generation_progress = Signal(int, int)  # current, total
+    _records_pending = Signal()  # Starts the store timer from worker threads
     
     def __init__(self, config_manager: ConfigurationManager, multi_database_manager: MultiDatabaseManager, 
                  path_context_manager: PathContextManager, color_manager=None):
@@ -190,18 +231,47 @@ class MultiThumbnailManager(QObject):
         self.default_resolution = self.config_manager.get('thumbnails.default_resolution', 128)
         self.max_cache_size_mb = self.config_manager.get('thumbnails.max_cache_size_mb', 1024)
         
-        # Cache directories by context
+        # Cache directories by context, with a running total of their size in bytes
         self._cache_directories = {}
+        # Same directories as plain strings, for building thumbnail paths without Path objects
+        self._cache_directory_strs: Dict[ContextType, str] = {}
+        self._cache_bytes: Dict[ContextType, int] = {}
+        self._cache_bytes_lock = threading.Lock()
         self._initialize_cache_directories()
         
-        # Thread pool for background processing
+        # Thread pool for background processing; each ffmpeg runs single-threaded,
+        # so one worker per core saturates the machine without oversubscribing it
         self.thread_pool = QThreadPool()
-        max_threads = self.config_manager.get('performance.max_concurrent_thumbnails', 4)
+        max_threads = (self.config_manager.get('performance.max_concurrent_thumbnails', 0)
+                       or QThread.idealThreadCount())
         self.thread_pool.setMaxThreadCount(max_threads)
         
-        # Processing state
+        # Processing state, accumulated over the scan batches queued for one target path
         self.processing_entities = []
         self.completed_count = 0
+        self._progress_path: Optional[str] = None
+        self._progress_lock = threading.Lock()  # Workers report completion concurrently
+        
+        # Thumbnail records waiting to be stored, as (context, record) pairs
+        self._pending_records: List[Tuple[ContextType, tuple]] = []
+        self._pending_lock = threading.Lock()
+        self._store_timer = QTimer(self)
+        self._store_timer.setSingleShot(True)
+        self._store_timer.setInterval(_STORE_FLUSH_INTERVAL_MS)
+        self._store_timer.timeout.connect(self._flush_pending_records)
+        self._records_pending.connect(self._start_store_timer)
+        
+        # Each newly visited path gets a higher pool priority than the ones before it, so
+        # its thumbnails run ahead of those still queued for earlier paths; later scan
+        # batches of the same path share its priority and run after its first batch
+        self._batch_priority = 0
+        self._path_priorities: Dict[str, int] = {}
+        # Cancellation flag shared by the queued batches of each target path
+        self._cancel_events: Dict[str, threading.Event] = {}
+        
+        # LRU of animated paths (None when there is none) by (thumbnail key, context)
+        self._animated_path_cache: "OrderedDict[Tuple[str, ContextType], Optional[str]]" = OrderedDict()
+        self._animated_path_lock = threading.Lock()
         
         # Current context for batch operations
         self._current_context: ContextType = ContextType.GENERAL
@@ -219,6 +289,8 @@ class MultiThumbnailManager(QObject):
                 cache_path = Path(cache_dir)
                 FileUtils.ensure_directory(cache_path)
                 self._cache_directories[context] = cache_path
+                self._cache_directory_strs[context] = str(cache_path)
+                self._cache_bytes[context] = FileUtils.get_directory_size(cache_path)
                 logger.debug(f"Initialized {context.value} thumbnail cache: {cache_path}")
     
     def set_current_path(self, path: str) -> None:
@@ -255,29 +327,64 @@ class MultiThumbnailManager(QObject):
         target_path = entity_path or self._current_path or str(entities[0].path)
         context = self.path_context_manager.get_context_for_path(target_path)
         
+        # Stat each source file at most once per batch. The caches belong to this call
+        # alone, so concurrent calls never share or clear them; its check workers only
+        # add entries, at worst computing the same one twice
+        stat_cache: Dict[Path, os.stat_result] = {}
+        dir_mtime_cache: Dict[Path, Dict[str, int]] = {}
+        
         # Filter entities that need thumbnails
+        thumbnail_paths = [self._get_thumbnail_path_str(entity, context) for entity in entities]
+        if len(entities) >= _PARALLEL_CHECK_MIN_ENTITIES:
+            with ThreadPoolExecutor(max_workers=_FRESHNESS_CHECK_WORKERS) as executor:
+                needs_thumbnail = list(executor.map(
+                    lambda item: self._needs_thumbnail(
+                        item[0], context, item[1], stat_cache, dir_mtime_cache
+                    ),
+                    zip(entities, thumbnail_paths)
+                ))
+        else:
+            needs_thumbnail = [
+                self._needs_thumbnail(entity, context, thumbnail_path, stat_cache, dir_mtime_cache)
+                for entity, thumbnail_path in zip(entities, thumbnail_paths)
+            ]
+        
         entities_to_process = []
-        for entity in entities:
-            if self._needs_thumbnail(entity, context):
-                entities_to_process.append(entity)
+        for entity, thumbnail_path, needed in zip(entities, thumbnail_paths, needs_thumbnail):
+            if needed:
+                entities_to_process.append((entity, Path(thumbnail_path)))
+                self._forget_animated_path(entity)
         
         if not entities_to_process:
             return
         
         
-        # Reset processing state
-        self.processing_entities = entities_to_process
-        self.completed_count = 0
-        
-        # Start generation for each entity
-        for entity in entities_to_process:
-            thumbnail_path = self._get_thumbnail_path_for_context(entity, context)
+        # Add to the progress of the target path; a new path or a finished run starts over
+        with self._progress_lock:
+            if target_path != self._progress_path or self.completed_count >= len(self.processing_entities):
+                self._progress_path = target_path
+                self.processing_entities = []
+                self.completed_count = 0
+            self.processing_entities.extend(entity for entity, _ in entities_to_process)
+        
+        animated_enabled = self.config_manager.get('thumbnails.animated.enabled', True)
+        
+        priority = self._path_priorities.get(target_path)
+        if priority is None:
+            self._batch_priority += 1
+            priority = self._path_priorities[target_path] = self._batch_priority
+        cancel_event = self._cancel_events.get(target_path)
+        if cancel_event is None:
+            cancel_event = self._cancel_events[target_path] = threading.Event()
+        
+        # Start generation for each entity, classified once here rather than in each worker
+        for entity, thumbnail_path in entities_to_process:
+            file_count = len(entity.files)
+            is_sequence = file_count > 1
+            is_video = file_count == 1 and entity.frame_count != 1
             
             # Check for animated thumbnail requirements
-            is_video = entity.entity_type.value == "video"
-            is_sequence = len(entity.files) > 1
-            animated_enabled = self.config_manager.get('thumbnails.animated.enabled', True)
-            enable_animated = (is_video or is_sequence) and animated_enabled
+            enable_animated = (entity.entity_type.value == "video" or is_sequence) and animated_enabled
             
             worker = ContextAwareThumbnailWorker(
                 entity,
@@ -289,60 +396,120 @@ class MultiThumbnailManager(QObject):
                 config_manager=self.config_manager,
                 color_manager=self.color_manager,
                 multi_db_manager=self.multi_database_manager,
-                entity_path=target_path
+                entity_path=target_path,
+                is_video=is_video,
+                is_sequence=is_sequence,
+                cancel_event=cancel_event
             )
-            self.thread_pool.start(worker)
+            self.thread_pool.start(worker, priority)
+    
+    def cancel_pending_for_path(self, path: str) -> None:
+        """Skip thumbnails queued for a path that have not started yet, e.g. when leaving its directory."""
+        self._path_priorities.pop(path, None)
+        cancel_event = self._cancel_events.pop(path, None)
+        if cancel_event is not None:
+            cancel_event.set()
+            logger.debug(f"Cancelled pending thumbnail generation for {path}")
     
-    def _needs_thumbnail(self, entity, context: ContextType) -> bool:
-        """Check if entity needs thumbnail generation in the specified context."""
-        thumbnail_path = self._get_thumbnail_path_for_context(entity, context)
+    @staticmethod
+    def _stat_cached(path: Path, stat_cache: Dict[Path, os.stat_result]) -> os.stat_result:
+        """Stat a source file, reusing the result for the rest of the batch."""
+        stat = stat_cache.get(path)
+        if stat is None:
+            stat = path.stat()
+            stat_cache[path] = stat
+        return stat
+    
+    def _newest_source_mtime_ns(self, entity, stat_cache: Dict[Path, os.stat_result],
+                                dir_mtime_cache: Dict[Path, Dict[str, int]]) -> int:
+        """Get the newest st_mtime_ns among the entity's source files."""
+        # The scanner already recorded the newest mtime of the entity
+        if entity.mtime is not None:
+            return entity.mtime
+        
+        # For sequences, check the newest file
+        if len(entity.files) > 1:
+            return self._sequence_newest_mtime_ns(entity.files, stat_cache, dir_mtime_cache)
+        return self._stat_cached(entity.path, stat_cache).st_mtime_ns
+    
+    def _sequence_newest_mtime_ns(self, files: List[Path], stat_cache: Dict[Path, os.stat_result],
+                                  dir_mtime_cache: Dict[Path, Dict[str, int]]) -> int:
+        """Get the newest st_mtime_ns of sequence files with one directory scan per parent."""
+        newest = 0
+        for file_path in files:
+            parent = file_path.parent
+            mtimes = dir_mtime_cache.get(parent)
+            if mtimes is None:
+                mtimes = {}
+                with os.scandir(parent) as entries:
+                    for entry in entries:
+                        try:
+                            mtimes[entry.name] = entry.stat().st_mtime_ns
+                        except OSError:
+                            continue
+                dir_mtime_cache[parent] = mtimes
+            
+            mtime = mtimes.get(file_path.name)
+            if mtime is None:
+                # Not listed (e.g. created after the scan), stat it directly
+                mtime = self._stat_cached(file_path, stat_cache).st_mtime_ns
+            if mtime > newest:
+                newest = mtime
+        return newest
+    
+    def _needs_thumbnail(self, entity, context: ContextType,
+                         thumbnail_path: Optional[str] = None,
+                         stat_cache: Optional[Dict[Path, os.stat_result]] = None,
+                         dir_mtime_cache: Optional[Dict[Path, Dict[str, int]]] = None) -> bool:
+        """Check if entity needs thumbnail generation in the specified context.
+        
+        stat_cache and dir_mtime_cache are the caller's per-batch caches; a
+        single check without them stats the source files afresh.
+        """
+        if thumbnail_path is None:
+            thumbnail_path = self._get_thumbnail_path_str(entity, context)
+        if stat_cache is None:
+            stat_cache = {}
+        if dir_mtime_cache is None:
+            dir_mtime_cache = {}
         
         # Check if thumbnail already exists and is newer than source
-        if thumbnail_path.exists():
-            try:
-                thumb_mtime = thumbnail_path.stat().st_mtime
-                
-                # For sequences, check the newest file
-                if len(entity.files) > 1:
-                    newest_file_mtime = max(f.stat().st_mtime for f in entity.files)
-                else:
-                    newest_file_mtime = entity.path.stat().st_mtime
-                
-                if thumb_mtime > newest_file_mtime:
-                    return False  # Thumbnail is up to date
-                    
-            except OSError:
-                pass  # If we can't check, assume we need to regenerate
+        try:
+            thumb_mtime = os.stat(thumbnail_path).st_mtime_ns
+        except OSError:
+            return True  # Missing thumbnail
+        
+        try:
+            if thumb_mtime > self._newest_source_mtime_ns(entity, stat_cache, dir_mtime_cache):
+                return False  # Thumbnail is up to date
+        except OSError:
+            pass  # If we can't check, assume we need to regenerate
         
         return True
     
-    def _get_thumbnail_path_for_context(self, entity, context: ContextType) -> Path:
-        """Get the thumbnail path for entity in the specified context."""
-        cache_directory = self.get_cache_directory_for_context(context)
+    def _get_thumbnail_path_str(self, entity, context: ContextType) -> str:
+        """Get the thumbnail path for entity in the specified context, as a plain string."""
+        cache_directory = self._cache_directory_strs.get(context)
+        if cache_directory is None:
+            # Fallback to general cache
+            cache_directory = self._cache_directory_strs.get(ContextType.GENERAL, '.thumbnails')
         
-        # Create unique identifier for entity
-        if entity.entity_type.value == "video":
-            identifier = f"{entity.path.stem}_{entity.path.stat().st_mtime}"
-        else:
-            # For sequences, use name and file count
-            identifier = f"{entity.name}_{len(entity.files)}"
-            if entity.files:
-                try:
-                    identifier += f"_{entity.files[0].stat().st_mtime}"
-                except OSError:
-                    pass
-        
-        # Make identifier safe for filename
-        safe_identifier = FileUtils.safe_filename(identifier)
-        thumbnail_name = f"{safe_identifier}_{self.default_resolution}.jpg"
+        # The key hashes the entity's path and newest mtime, and is filename safe
+        thumbnail_name = f"{entity.thumbnail_key}_{self.default_resolution}.jpg"
         
-        return cache_directory / thumbnail_name
+        return os.path.join(cache_directory, thumbnail_name)
     
     def _on_thumbnail_generated(self, entity, thumbnail_info, generation_time: float, 
                                source_frame: Optional[float], file_size: Optional[int], 
-                               error: Optional[str]):
+                               error: Optional[str], target_path: Optional[str] = None):
         """Handle thumbnail generation completion with context awareness."""
-        self.completed_count += 1
+        # Workers still running for a previous path do not count towards the current progress
+        with self._progress_lock:
+            counted = target_path == self._progress_path
+            if counted:
+                self.completed_count += 1
+            completed_count = self.completed_count
+            total_count = len(self.processing_entities)
         
         if error:
             logger.error(f"Thumbnail generation failed for {entity.name}: {error}")
@@ -357,25 +524,162 @@ class MultiThumbnailManager(QObject):
                 
                 logger.debug(f"Thumbnail generated for {entity.name}: static={static_path}, animated={animated_path}")
                 
-                # Store thumbnail info in the appropriate database
-                self._store_thumbnail_info(entity, static_path, generation_time,
-                                         source_frame, file_size, animated_path, entity_path)
+                # Queue thumbnail info for the appropriate database
+                self._queue_thumbnail_record(entity, static_path, generation_time,
+                                             source_frame, file_size, animated_path, entity_path)
+                self._add_cache_bytes(entity_path, (file_size or 0) + (thumbnail_info.get('animated_size') or 0))
+                self._share_with_entity_context(entity, entity_path, static_path, animated_path)
+                self._forget_animated_path(entity)
                 
                 # Emit signal with static path
                 self.thumbnail_generated.emit(entity, static_path)
             else:
                 # Legacy single path
-                self._store_thumbnail_info(entity, thumbnail_info, generation_time,
-                                         source_frame, file_size, None, entity_path)
+                self._queue_thumbnail_record(entity, thumbnail_info, generation_time,
+                                             source_frame, file_size, None, entity_path)
+                self._add_cache_bytes(entity_path, file_size)
                 self.thumbnail_generated.emit(entity, thumbnail_info)
         
         # Emit progress
-        self.generation_progress.emit(self.completed_count, len(self.processing_entities))
+        if counted:
+            self.generation_progress.emit(completed_count, total_count)
+        
+        # Store queued records once a batch is full; the timer stores smaller remainders,
+        # which completion counts cannot tell apart (cancelled workers never report back)
+        with self._pending_lock:
+            pending_count = len(self._pending_records)
+        if pending_count >= _STORE_BATCH_SIZE:
+            self._flush_pending_records()
+        elif pending_count:
+            self._records_pending.emit()
         
         # Check cache size periodically
-        if self.completed_count % 10 == 0:
+        if counted and completed_count % 10 == 0:
             self._check_cache_sizes()
     
+    def _queue_thumbnail_record(self, entity, thumbnail_path: str, generation_time: float,
+                                source_frame: Optional[float], file_size: Optional[int],
+                                animated_path: Optional[str] = None, entity_path: Optional[str] = None):
+        """Queue thumbnail information to be stored with the next batch."""
+        if entity_path:
+            context = self.path_context_manager.get_context_for_path(entity_path)
+        else:
+            context = self.multi_database_manager.get_current_context()
+        
+        record = (entity, thumbnail_path, generation_time, source_frame, file_size, animated_path)
+        with self._pending_lock:
+            self._pending_records.append((context, record))
+    
+    @Slot()
+    def _start_store_timer(self) -> None:
+        """Schedule storing queued records that did not fill a batch."""
+        if not self._store_timer.isActive():
+            self._store_timer.start()
+    
+    @Slot()
+    def _flush_pending_records(self):
+        """Store all queued thumbnail records, one transaction per context."""
+        with self._pending_lock:
+            pending, self._pending_records = self._pending_records, []
+        
+        records_by_context: Dict[ContextType, List[tuple]] = {}
+        for context, record in pending:
+            records_by_context.setdefault(context, []).append(record)
+        
+        for context, records in records_by_context.items():
+            try:
+                with self.multi_database_manager.get_session(context=context) as session:
+                    self._store_batch_in_session(session, records)
+                logger.debug(f"Stored {len(records)} thumbnail records in {context.value} database")
+            except Exception as e:
+                # Fall back to one transaction per entity so one bad record doesn't drop the batch
+                logger.error(f"Error storing batch of {len(records)} thumbnail records, retrying individually: {e}")
+                for record in records:
+                    try:
+                        with self.multi_database_manager.get_session(context=context) as session:
+                            self._store_in_session(session, *record)
+                    except Exception as e:
+                        logger.error(f"Error storing thumbnail info for {record[0].name}: {e}")
+    
+    def _store_batch_in_session(self, session, records: List[tuple]):
+        """Upsert entities and their thumbnail records in the provided database session.
+        
+        Each table is written with one INSERT ... ON CONFLICT statement run
+        executemany-style over the whole batch.
+        """
+        # Later results for the same entity replace earlier ones
+        pending = {}
+        for record in records:
+            entity = record[0]
+            pending[(str(entity.path), entity.entity_type.value)] = record
+        
+        entity_rows = [
+            {
+                'path': path_str,
+                'entity_type': type_str,
+                'name': str(record[0].name),
+                'file_size': int(record[0].file_size) if record[0].file_size else None,
+                'file_count': int(len(record[0].files)),
+                'thumbnail_generated': True,
+                'metadata_extracted': False,
+            }
+            for (path_str, type_str), record in pending.items()
+        ]
+        
+        # Insert entities or flag existing rows not yet marked as having a thumbnail
+        entity_stmt = sqlite_insert(Entity).on_conflict_do_update(
+            index_elements=['path', 'entity_type'],
+            set_={'thumbnail_generated': True},
+            where=Entity.thumbnail_generated.is_not(True),
+        ).returning(Entity.id, Entity.path, Entity.entity_type)
+        entity_ids = {
+            (path_str, type_str): entity_id
+            for entity_id, path_str, type_str in session.execute(entity_stmt, entity_rows)
+        }
+        
+        # Already flagged rows skip the update and return nothing; look their ids up
+        missing = [key for key in pending if key not in entity_ids]
+        for start in range(0, len(missing), _LOOKUP_BATCH_SIZE):
+            chunk = missing[start:start + _LOOKUP_BATCH_SIZE]
+            rows = session.query(Entity.id, Entity.path, Entity.entity_type).filter(
+                Entity.path.in_([path_str for path_str, _ in chunk])
+            )
+            for entity_id, path_str, type_str in rows:
+                if (path_str, type_str) in pending:
+                    entity_ids.setdefault((path_str, type_str), entity_id)
+        
+        # Only rows with an animated thumbnail touch extra_data; binding None to the
+        # JSON column would store a JSON null over a previously recorded path
+        static_rows, animated_rows = [], []
+        for key, (_, thumbnail_path, generation_time, source_frame, file_size, animated_path) in pending.items():
+            row = {
+                'entity_id': int(entity_ids[key]),
+                'path': str(thumbnail_path),
+                'resolution': int(self.default_resolution),
+                'generation_time': float(generation_time) if generation_time else None,
+                'source_frame': float(source_frame) if source_frame else None,
+                'file_size': int(file_size) if file_size else None,
+                'is_valid': True,
+            }
+            if animated_path:
+                row['extra_data'] = {'animated_path': str(animated_path)}
+                animated_rows.append(row)
+            else:
+                static_rows.append(row)
+        
+        for rows in (static_rows, animated_rows):
+            if not rows:
+                continue
+            thumbnail_stmt = sqlite_insert(Thumbnail)
+            update_fields = {
+                field: thumbnail_stmt.excluded[field]
+                for field in rows[0] if field not in ('entity_id', 'resolution')
+            }
+            session.execute(thumbnail_stmt.on_conflict_do_update(
+                index_elements=['entity_id', 'resolution'],
+                set_=update_fields,
+            ), rows)
+    
     def _store_thumbnail_info(self, entity, thumbnail_path: str, generation_time: float,
                              source_frame: Optional[float], file_size: Optional[int],
                              animated_path: Optional[str] = None, entity_path: Optional[str] = None):
@@ -459,12 +763,9 @@ class MultiThumbnailManager(QObject):
         else:
             context = self._current_context
         
-        thumbnail_path = self._get_thumbnail_path_for_context(entity, context)
-        
-        if thumbnail_path.exists():
-            return str(thumbnail_path)
+        thumbnail_path = self._get_thumbnail_path_str(entity, context)
         
-        return None
+        return self._existing_path(thumbnail_path)
     
     def get_animated_thumbnail_path(self, entity, entity_path: Optional[str] = None) -> Optional[str]:
         """Get animated thumbnail path for entity, considering context."""
@@ -481,57 +782,141 @@ class MultiThumbnailManager(QObject):
         else:
             context = self._current_context
         
-        # Check for GIF version
-        thumbnail_path = self._get_thumbnail_path_for_context(entity, context)
-        animated_path = thumbnail_path.with_suffix('.gif')
-        
-        if animated_path.exists():
-            return str(animated_path)
+        key = (entity.thumbnail_key, context)
+        with self._animated_path_lock:
+            if key in self._animated_path_cache:
+                self._animated_path_cache.move_to_end(key)
+                return self._animated_path_cache[key]
         
-        # Check database for stored animated path
-        try:
-            if entity_path:
-                with self.multi_database_manager.get_session_for_path(entity_path) as session:
-                    return self._get_animated_path_from_session(session, entity)
-            else:
-                with self.multi_database_manager.get_session() as session:
-                    return self._get_animated_path_from_session(session, entity)
-        except Exception as e:
-            logger.error(f"Error getting animated thumbnail path: {e}")
+        # Check for GIF version
+        thumbnail_path = self._get_thumbnail_path_str(entity, context)
+        animated_path = self._existing_path(os.path.splitext(thumbnail_path)[0] + '.gif')
         
-        return None
+        if not animated_path:
+            # Check database for stored animated path
+            try:
+                if entity_path:
+                    with self.multi_database_manager.get_session_for_path(entity_path) as session:
+                        animated_path = self._get_animated_path_from_session(session, entity)
+                else:
+                    with self.multi_database_manager.get_session() as session:
+                        animated_path = self._get_animated_path_from_session(session, entity)
+            except Exception as e:
+                logger.error(f"Error getting animated thumbnail path: {e}")
+                return None
+        
+        # Misses are cached too; generation invalidates the entity's entries
+        with self._animated_path_lock:
+            self._animated_path_cache[key] = animated_path
+            if len(self._animated_path_cache) > _ANIMATED_PATH_CACHE_SIZE:
+                self._animated_path_cache.popitem(last=False)
+        return animated_path
+    
+    def _forget_animated_path(self, entity):
+        """Drop cached animated path lookups of an entity in every context."""
+        with self._animated_path_lock:
+            for context in ContextType:
+                self._animated_path_cache.pop((entity.thumbnail_key, context), None)
     
     def _get_animated_path_from_session(self, session, entity) -> Optional[str]:
         """Get animated thumbnail path from database session."""
-        db_entity = session.query(Entity).filter_by(
-            path=str(entity.path),
-            entity_type=entity.entity_type.value
+        # One indexed join instead of looking up the entity and its thumbnail separately
+        row = session.query(Thumbnail.extra_data).join(
+            Entity, Thumbnail.entity_id == Entity.id
+        ).filter(
+            Entity.path == str(entity.path),
+            Entity.entity_type == entity.entity_type.value,
+            Thumbnail.resolution == self.default_resolution
         ).first()
         
-        if db_entity:
-            thumbnail = session.query(Thumbnail).filter_by(
-                entity_id=db_entity.id,
-                resolution=self.default_resolution
-            ).first()
-            
-            if thumbnail and hasattr(thumbnail, 'extra_data') and thumbnail.extra_data:
-                animated_path = thumbnail.extra_data.get('animated_path')
-                if animated_path and Path(animated_path).exists():
-                    return animated_path
+        if row and row.extra_data:
+            animated_path = row.extra_data.get('animated_path')
+            if animated_path:
+                return self._existing_path(animated_path)
         
         return None
     
+    @staticmethod
+    def _existing_path(path) -> Optional[str]:
+        """Return the path as a string if a file exists there, with a single stat call."""
+        path = os.fspath(path)
+        try:
+            os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return path
+    
+    def _add_cache_bytes(self, entity_path: Optional[str], file_size: Optional[int]):
+        """Account for a newly generated thumbnail in its context's cache size."""
+        if entity_path:
+            context = self.path_context_manager.get_context_for_path(entity_path)
+        else:
+            context = self._current_context
+        
+        with self._cache_bytes_lock:
+            if context in self._cache_bytes:
+                self._cache_bytes[context] += file_size or 0
+    
+    def _share_with_entity_context(self, entity, entity_path: Optional[str],
+                                   static_path: Optional[str], animated_path: Optional[str]):
+        """Link a new thumbnail into the cache of the context of the entity's own path.
+        
+        A recursive view generates thumbnails in the context of the browsed root,
+        while browsing the entity's own folder may use another context. Hard links
+        share the file's blocks, so they are not added to that cache's size;
+        symbolic links are used where hard links are not possible.
+        """
+        if entity_path:
+            context = self.path_context_manager.get_context_for_path(entity_path)
+        else:
+            context = self._current_context
+        
+        entity_context = self.path_context_manager.get_context_for_path(str(entity.path))
+        if entity_context == context:
+            return
+        target_directory = self.get_cache_directory_for_context(entity_context)
+        if target_directory == self.get_cache_directory_for_context(context):
+            return
+        
+        for source in (static_path, animated_path):
+            if not source:
+                continue
+            target = os.path.join(target_directory, os.path.basename(source))
+            if self._existing_path(target):
+                continue
+            try:
+                os.link(source, target)
+            except OSError:
+                try:
+                    os.symlink(os.path.abspath(source), target)
+                except OSError as e:
+                    logger.debug(f"Could not share thumbnail {source} with {entity_context.value} cache: {e}")
+    
+    def _refresh_cache_bytes(self, context: ContextType):
+        """Recount a context's cache size from disk, e.g. after files were removed."""
+        size = FileUtils.get_directory_size(self._cache_directories[context])
+        with self._cache_bytes_lock:
+            self._cache_bytes[context] = size
+    
     def _check_cache_sizes(self):
-        """Check and manage cache sizes for all contexts."""
-        for context, cache_dir in self._cache_directories.items():
+        """Check and manage cache sizes for all contexts.
+        
+        Compares the running byte counts against the limit; the cache
+        directories are only walked again after an eviction.
+        """
+        max_cache_bytes = self.max_cache_size_mb * 1024 * 1024
+        with self._cache_bytes_lock:
+            cache_sizes = list(self._cache_bytes.items())
+        
+        for context, cache_size_bytes in cache_sizes:
+            if cache_size_bytes <= max_cache_bytes:
+                continue
             try:
-                cache_size_bytes = FileUtils.get_directory_size(cache_dir)
                 cache_size_mb = cache_size_bytes / (1024 * 1024)
+                logger.info(f"{context.value} cache size ({cache_size_mb:.1f} MB) exceeds limit")
+                self._cleanup_old_thumbnails_in_context(context)
+                self._refresh_cache_bytes(context)
                 
-                if cache_size_mb > self.max_cache_size_mb:
-                    logger.info(f"{context.value} cache size ({cache_size_mb:.1f} MB) exceeds limit")
-                    self._cleanup_old_thumbnails_in_context(context)
-                    
             except Exception as e:
                 logger.error(f"Error checking {context.value} cache size: {e}")
     
@@ -539,15 +924,18 @@ class MultiThumbnailManager(QObject):
         """Remove old thumbnails from specific context cache."""
         try:
             cache_dir = self._cache_directories[context]
-            thumbnail_files = list(cache_dir.glob("*.jpg"))
-            thumbnail_files.sort(key=lambda f: f.stat().st_mtime)
+            # DirEntry.stat() is served from the directory listing where the platform allows
+            thumbnail_files = sorted(
+                (entry.stat(follow_symlinks=False).st_mtime, entry.path)
+                for entry in self._scan_thumbnails(cache_dir)
+            )
             
             # Remove oldest 25% of files
             files_to_remove = len(thumbnail_files) // 4
             
-            for thumbnail_file in thumbnail_files[:files_to_remove]:
+            for _, thumbnail_file in thumbnail_files[:files_to_remove]:
                 try:
-                    thumbnail_file.unlink()
+                    os.unlink(thumbnail_file)
                     logger.debug(f"Removed old {context.value} thumbnail: {thumbnail_file}")
                 except OSError as e:
                     logger.warning(f"Could not remove thumbnail {thumbnail_file}: {e}")
@@ -557,6 +945,14 @@ class MultiThumbnailManager(QObject):
         except Exception as e:
             logger.error(f"Error cleaning up {context.value} thumbnails: {e}")
     
+    @staticmethod
+    def _scan_thumbnails(cache_dir: Path) -> List[os.DirEntry]:
+        """List the static thumbnail files of a cache directory."""
+        with os.scandir(cache_dir) as entries:
+            # Symbolic links shared from other caches are listed even when dangling
+            return [entry for entry in entries
+                    if entry.name.endswith('.jpg') and not entry.is_dir(follow_symlinks=False)]
+    
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about thumbnail caches for all contexts."""
         cache_info = {}
@@ -564,7 +960,7 @@ class MultiThumbnailManager(QObject):
         for context, cache_dir in self._cache_directories.items():
             try:
                 cache_size_bytes = FileUtils.get_directory_size(cache_dir)
-                thumbnail_count = len(list(cache_dir.glob("*.jpg")))
+                thumbnail_count = len(self._scan_thumbnails(cache_dir))
                 
                 cache_info[context.value] = {
                     'cache_directory': str(cache_dir),
@@ -589,18 +985,22 @@ class MultiThumbnailManager(QObject):
         
         contexts_to_clear = [context] if context else list(self._cache_directories.keys())
         
+        with self._animated_path_lock:
+            self._animated_path_cache.clear()
+        
         for ctx in contexts_to_clear:
             if ctx in self._cache_directories:
                 try:
                     cache_dir = self._cache_directories[ctx]
-                    thumbnail_files = list(cache_dir.glob("*.jpg"))
+                    thumbnail_files = self._scan_thumbnails(cache_dir)
                     
                     for thumbnail_file in thumbnail_files:
                         try:
-                            thumbnail_file.unlink()
+                            os.unlink(thumbnail_file.path)
                         except OSError as e:
-                            logger.warning(f"Could not remove thumbnail {thumbnail_file}: {e}")
+                            logger.warning(f"Could not remove thumbnail {thumbnail_file.path}: {e}")
                     
+                    self._refresh_cache_bytes(ctx)
                     logger.info(f"Cleared {len(thumbnail_files)} thumbnails from {ctx.value} cache")
                     results[ctx.value] = True
                     
@@ -616,4 +1016,8 @@ class MultiThumbnailManager(QObject):
         
         # Wait for all workers to complete (with timeout)
         if not self.thread_pool.waitForDone(5000):  # 5 second timeout
-            logger.warning("Some thumbnail generation workers did not complete in time")
\ No newline at end of file
+            logger.warning("Some thumbnail generation workers did not complete in time")
+        
+        # Store records still waiting for a full batch
+        self._store_timer.stop()
+        self._flush_pending_records()
\ No newline at end of file
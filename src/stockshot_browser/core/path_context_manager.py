@@ -6,7 +6,7 @@ Determines the appropriate database and thumbnail context based on the current p
 
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, FrozenSet, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -25,8 +25,12 @@ class PathContextManager:
     def __init__(self, config_manager):
         self.config_manager = config_manager
         self._context_cache = {}  # Cache for path-to-context mappings
+        self._last_lookup: Optional[Tuple[str, 'ContextType']] = None  # Hot-key fast path
         self._user_paths = []
         self._project_paths = []
+        self._user_prefixes: FrozenSet[str] = frozenset()
+        self._project_prefixes: FrozenSet[str] = frozenset()
+        self._configured_path_objs: Tuple[Path, ...] = ()
         self._reload_configured_paths()
         
         logger.info("PathContextManager initialized")
@@ -46,22 +50,49 @@ class PathContextManager:
             
             logger.info(f"Loaded {len(self._user_paths)} user paths and {len(self._project_paths)} project paths")
             
-            # Clear cache when paths change
-            self._context_cache.clear()
-            
         except Exception as e:
             logger.error(f"Error reloading configured paths: {e}")
             self._user_paths = []
             self._project_paths = []
+        
+        self._build_prefix_index()
+        
+        # Clear cache when paths change
+        self._context_cache.clear()
+        self._last_lookup = None
+    
+    def _build_prefix_index(self):
+        """Resolve configured paths once so lookups only walk the queried path's ancestors."""
+        user_objs = self._resolve_configured_paths(self._user_paths)
+        project_objs = self._resolve_configured_paths(self._project_paths)
+        self._user_prefixes = frozenset(str(path_obj) for path_obj in user_objs)
+        self._project_prefixes = frozenset(str(path_obj) for path_obj in project_objs)
+        self._configured_path_objs = tuple(user_objs + project_objs)
+    
+    def _resolve_configured_paths(self, paths) -> list:
+        """Resolve configured paths, skipping entries that cannot be resolved."""
+        resolved = []
+        for configured_path in paths:
+            try:
+                resolved.append(Path(configured_path).resolve())
+            except Exception as e:
+                logger.debug(f"Error resolving configured path {configured_path}: {e}")
+        return resolved
     
     def get_context_for_path(self, path: str) -> ContextType:
         """Determine the context type for a given path."""
         if not path:
             return ContextType.GENERAL
         
+        last_lookup = self._last_lookup
+        if last_lookup is not None and last_lookup[0] == path:
+            return last_lookup[1]
+        
         # Check cache first
-        if path in self._context_cache:
-            return self._context_cache[path]
+        context = self._context_cache.get(path)
+        if context is not None:
+            self._last_lookup = (path, context)
+            return context
         
         try:
             path_obj = Path(path).resolve()
@@ -69,6 +100,7 @@ class PathContextManager:
             
             # Cache the result
             self._context_cache[path] = context
+            self._last_lookup = (path, context)
             return context
             
         except Exception as e:
@@ -78,33 +110,43 @@ class PathContextManager:
     def _determine_context(self, path_obj: Path) -> ContextType:
         """Determine context based on path matching."""
         path_str = str(path_obj)
+        # The path and each of its ancestors are the only prefixes it can be under
+        ancestors = [path_str]
+        ancestors.extend(str(parent) for parent in path_obj.parents)
         
-        # Check if path is under any user-configured paths
-        for user_path in self._user_paths:
-            try:
-                user_path_obj = Path(user_path).resolve()
-                if self._is_path_under(path_obj, user_path_obj):
-                    logger.debug(f"Path {path_str} matches user context (under {user_path})")
-                    return ContextType.USER
-            except Exception as e:
-                logger.debug(f"Error checking user path {user_path}: {e}")
-                continue
+        # User-configured paths take precedence over project-configured ones
+        for ancestor in ancestors:
+            if ancestor in self._user_prefixes:
+                logger.debug(f"Path {path_str} matches user context (under {ancestor})")
+                return ContextType.USER
         
-        # Check if path is under any project-configured paths
-        for project_path in self._project_paths:
-            try:
-                project_path_obj = Path(project_path).resolve()
-                if self._is_path_under(path_obj, project_path_obj):
-                    logger.debug(f"Path {path_str} matches project context (under {project_path})")
-                    return ContextType.PROJECT
-            except Exception as e:
-                logger.debug(f"Error checking project path {project_path}: {e}")
-                continue
+        for ancestor in ancestors:
+            if ancestor in self._project_prefixes:
+                logger.debug(f"Path {path_str} matches project context (under {ancestor})")
+                return ContextType.PROJECT
         
         # Default to general context
         logger.debug(f"Path {path_str} uses general context (no specific match)")
         return ContextType.GENERAL
     
+    def has_configured_paths_below(self, path: str) -> bool:
+        """
+        Check if any user or project configured path lies strictly below a path.
+        
+        When none does, every descendant of the path shares its context.
+        """
+        try:
+            path_obj = Path(path).resolve()
+        except Exception as e:
+            logger.debug(f"Error resolving path {path}: {e}")
+            return True
+        
+        for configured_path_obj in self._configured_path_objs:
+            if configured_path_obj != path_obj and self._is_path_under(configured_path_obj, path_obj):
+                return True
+        
+        return False
+    
     def _is_path_under(self, path: Path, parent: Path) -> bool:
         """Check if path is under parent directory."""
         try:
@@ -6,7 +6,7 @@ import logging
 import time
 from pathlib import Path
 from typing import List, Optional, Dict
-from PySide6.QtCore import QObject, Signal, QThreadPool, QRunnable, Slot
+from PySide6.QtCore import QObject, Signal, QThread, QThreadPool, QRunnable, Slot
 
 from ..config.manager import ConfigurationManager
 from ..database.connection import DatabaseManager, database_retry
@@ -202,7 +202,8 @@ class ThumbnailManager(QObject):
         
         # Thread pool for background processing
         self.thread_pool = QThreadPool()
-        max_threads = self.config_manager.get('performance.max_concurrent_thumbnails', 4)
+        max_threads = (self.config_manager.get('performance.max_concurrent_thumbnails', 0)
+                       or QThread.idealThreadCount())
         self.thread_pool.setMaxThreadCount(max_threads)
         
         # Processing state
@@ -13,6 +13,7 @@ from .models import (
     Tag,
     Favorite,
     Thumbnail,
+    ProbeCacheEntry,
     entity_tags,
 )
 from .connection import DatabaseManager, get_session
@@ -25,6 +26,7 @@ __all__ = [
     "Tag",
     "Favorite",
     "Thumbnail",
+    "ProbeCacheEntry",
     "entity_tags",
     "DatabaseManager",
     "get_session",
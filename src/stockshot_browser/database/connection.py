@@ -185,7 +185,9 @@ class DatabaseManager:
     
     def _configure_sqlite(self) -> None:
         """Configure SQLite for optimal performance."""
-        @event.listens_for(Engine, "connect")
+        # Scoped to this engine: a listener on the Engine class would run once per
+        # DatabaseManager for every connection of every context database
+        @event.listens_for(self.engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record):
             """Set SQLite pragmas for better performance."""
             cursor = dbapi_connection.cursor()
@@ -193,7 +195,7 @@ class DatabaseManager:
             # Performance optimizations
             cursor.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
             cursor.execute("PRAGMA synchronous=NORMAL")  # Faster writes
-            cursor.execute("PRAGMA cache_size=10000")  # Larger cache
+            cursor.execute("PRAGMA cache_size=-64000")  # 64MB page cache
             cursor.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
             cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory mapping
             
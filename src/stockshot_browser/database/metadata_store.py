@@ -0,0 +1,181 @@
+"""
+Batched storage of extracted entity metadata for Stockshot Browser.
+
+Shared by the metadata managers, which store their extraction results with
+upsert_entity_metadata from their writer threads.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .models import Entity, Metadata
+
+
+# Paths or ids per IN (...) lookup, below SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+# Bind name for extracted has_audio values; binding the column directly would let its
+# Python default turn a missing value into False, which then overwrites a stored True
+_HAS_AUDIO_PARAM = 'extracted_has_audio'
+
+_TRUE_STRINGS = frozenset({'1', 'true', 'yes', 'y', 't'})
+
+
+def _to_bool(value) -> bool:
+    """Coerce a flag that may arrive as a string, e.g. "false" from ffprobe JSON."""
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+# Standard metadata columns with their coercions, in Metadata model order
+_STANDARD_COERCERS = (
+    ('duration', float),
+    ('fps', float),
+    ('width', int),
+    ('height', int),
+    ('aspect_ratio', float),
+    ('format', str),
+    ('codec', str),
+    ('audio_codec', str),
+    ('colorspace', str),
+    ('bit_depth', int),
+    ('bitrate', int),
+    ('frame_count', int),
+    ('has_audio', _to_bool),
+)
+METADATA_FIELDS = tuple(key for key, _ in _STANDARD_COERCERS)
+_STANDARD_KEYS = frozenset(METADATA_FIELDS)
+
+
+def _safe_convert(value, convert):
+    """Convert an extracted value for its column, or None if it does not convert."""
+    if value is None:
+        return None
+    try:
+        return convert(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _metadata_row(entity_id: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the metadata table row for an entity's extracted metadata."""
+    row = {key: _safe_convert(metadata.get(key), convert) for key, convert in _STANDARD_COERCERS}
+    
+    # Custom fields (everything else)
+    custom_fields = {k: v for k, v in metadata.items()
+                    if v is not None and k not in _STANDARD_KEYS}
+    
+    row[_HAS_AUDIO_PARAM] = row.pop('has_audio')
+    row['entity_id'] = int(entity_id)
+    row['custom_fields'] = Metadata.encode_custom_fields(custom_fields) if custom_fields else None
+    return row
+
+
+def upsert_entity_metadata(session, batch: List[Tuple[Any, Dict[str, Any]]]) -> None:
+    """Upsert entities and their extracted metadata in the given session.
+    
+    Each table is written with one INSERT ... ON CONFLICT statement run
+    executemany-style over the whole batch. Stored values the new extraction
+    has none for are kept, and custom fields are merged into the stored ones.
+    """
+    # Later results for the same entity replace earlier ones
+    pending = {}
+    for entity, metadata in batch:
+        pending[(str(entity.path), entity.entity_type.value)] = (entity, metadata)
+    
+    entity_rows = [
+        {
+            'path': path_str,
+            'entity_type': type_str,
+            'name': str(entity.name),
+            'file_size': int(entity.file_size) if entity.file_size else None,
+            'file_count': len(entity.files) or 1,
+            'mtime': entity.mtime,
+            'metadata_extracted': True,
+            'thumbnail_generated': False,
+        }
+        for (path_str, type_str), (entity, _) in pending.items()
+    ]
+    
+    # Insert entities, or flag existing rows and record a changed source mtime.
+    # RETURNING (SQLite 3.35+) yields ids for inserted and updated rows alike
+    entity_stmt = sqlite_insert(Entity)
+    entity_excluded = entity_stmt.excluded
+    entity_stmt = entity_stmt.on_conflict_do_update(
+        index_elements=['path', 'entity_type'],
+        set_={
+            'metadata_extracted': True,
+            'mtime': func.coalesce(entity_excluded.mtime, Entity.mtime),
+        },
+        where=or_(
+            Entity.metadata_extracted.is_not(True),
+            and_(entity_excluded.mtime.is_not(None), entity_excluded.mtime.is_not(Entity.mtime)),
+        ),
+    ).returning(Entity.id, Entity.path, Entity.entity_type)
+    entity_ids: Dict[Tuple[str, str], Optional[int]] = {
+        (path_str, type_str): entity_id
+        for entity_id, path_str, type_str in session.execute(entity_stmt, entity_rows)
+    }
+    
+    # Unchanged rows skip the update and return nothing; look their ids up
+    missing = [key for key in pending if key not in entity_ids]
+    for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+        chunk = missing[start:start + LOOKUP_BATCH_SIZE]
+        rows = session.query(Entity.id, Entity.path, Entity.entity_type).filter(
+            Entity.path.in_([path_str for path_str, _ in chunk])
+        )
+        for entity_id, path_str, type_str in rows:
+            if (path_str, type_str) in pending:
+                entity_ids.setdefault((path_str, type_str), entity_id)
+    
+    metadata_rows = [
+        _metadata_row(entity_ids[key], metadata)
+        for key, (_, metadata) in pending.items()
+    ]
+    
+    metadata_stmt = sqlite_insert(Metadata).values(has_audio=bindparam(_HAS_AUDIO_PARAM))
+    excluded = metadata_stmt.excluded
+    columns = Metadata.__table__.c
+    update_fields = {
+        field: func.coalesce(excluded[field], columns[field])
+        for field in METADATA_FIELDS
+    }
+    update_fields['custom_fields'] = func.coalesce(
+        func.json_patch(columns.custom_fields, excluded.custom_fields),
+        excluded.custom_fields,
+        columns.custom_fields,
+    )
+    update_fields['has_audio'] = func.coalesce(excluded.has_audio, columns.has_audio, False)
+    update_fields['updated_at'] = func.now()
+    # Only rewrite rows the new extraction actually changes
+    changed = or_(
+        *(
+            and_(excluded[field].is_not(None), excluded[field].is_not(columns[field]))
+            for field in METADATA_FIELDS
+        ),
+        and_(
+            excluded.custom_fields.is_not(None),
+            or_(
+                # json_patch(NULL, ...) is NULL, so rows without custom fields yet always change
+                columns.custom_fields.is_(None),
+                func.json_patch(columns.custom_fields, excluded.custom_fields).is_not(columns.custom_fields),
+            ),
+        ),
+    )
+    session.execute(metadata_stmt.on_conflict_do_update(
+        index_elements=['entity_id'],
+        set_=update_fields,
+        where=changed,
+    ), metadata_rows)
+    
+    # Absent audio info means no audio, but only for rows that had no stored value;
+    # it is left NULL above so it never overwrites a stored True
+    entity_id_list = [row['entity_id'] for row in metadata_rows if row[_HAS_AUDIO_PARAM] is None]
+    for start in range(0, len(entity_id_list), LOOKUP_BATCH_SIZE):
+        session.query(Metadata).filter(
+            Metadata.entity_id.in_(entity_id_list[start:start + LOOKUP_BATCH_SIZE]),
+            Metadata.has_audio.is_(None),
+        ).update({Metadata.has_audio: False}, synchronize_session=False)
@@ -85,6 +85,8 @@ def apply_migrations(engine):
     migrations = {
         1: migrate_v1_to_v2,  # Add extra_data column to thumbnails
         2: migrate_v2_to_v3,  # Add last_accessed to entities and category to metadata
+        3: migrate_v3_to_v4,  # Add unique (path, entity_type) index to entities
+        4: migrate_v4_to_v5,  # Add mtime to entities
     }
     
     for version, migration_func in sorted(migrations.items()):
@@ -161,4 +163,77 @@ def migrate_v2_to_v3(engine):
                     if "duplicate column name" in str(e).lower():
                         logger.debug("Column 'category' already exists")
                     else:
-                        raise
\ No newline at end of file
+                        raise
+
+
+# Tables whose entity_id rows are moved to the kept entity when duplicates are merged
+_ENTITY_DEPENDENT_TABLES = ('metadata', 'thumbnails', 'favorites', 'entity_tags')
+
+
+def migrate_v3_to_v4(engine):
+    """
+    Migration from v3 to v4: Add unique (path, entity_type) index to entities table.
+    
+    The index backs the ON CONFLICT upserts used when storing extracted metadata.
+    Duplicate rows left by older concurrent inserts are merged into the oldest
+    one first; its metadata, thumbnails, favorites and tags win over the copies'.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS temp.entity_duplicates"))
+        conn.execute(text("""
+            CREATE TEMP TABLE entity_duplicates AS
+            SELECT e.id AS old_id, k.keep_id AS keep_id
+            FROM entities e
+            JOIN (
+                SELECT path, entity_type, MIN(id) AS keep_id
+                FROM entities
+                GROUP BY path, entity_type
+                HAVING COUNT(*) > 1
+            ) k ON e.path = k.path AND e.entity_type = k.entity_type
+            WHERE e.id <> k.keep_id
+        """))
+        duplicate_count = conn.execute(text("SELECT COUNT(*) FROM entity_duplicates")).scalar()
+        
+        if duplicate_count:
+            existing_tables = set(inspect(conn).get_table_names())
+            for table in _ENTITY_DEPENDENT_TABLES:
+                if table not in existing_tables:
+                    continue
+                # Move rows the kept entity has no counterpart for, then drop the rest
+                conn.execute(text(f"""
+                    UPDATE OR IGNORE {table}
+                    SET entity_id = (SELECT keep_id FROM entity_duplicates WHERE old_id = {table}.entity_id)
+                    WHERE entity_id IN (SELECT old_id FROM entity_duplicates)
+                """))
+                conn.execute(text(f"""
+                    DELETE FROM {table} WHERE entity_id IN (SELECT old_id FROM entity_duplicates)
+                """))
+            conn.execute(text("DELETE FROM entities WHERE id IN (SELECT old_id FROM entity_duplicates)"))
+            logger.info(f"Merged {duplicate_count} duplicate entity rows before adding ix_entity_path_type")
+        
+        conn.execute(text("DROP TABLE temp.entity_duplicates"))
+        
+        # Without this index every metadata upsert fails, so let errors abort the migration
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ix_entity_path_type
+            ON entities (path, entity_type)
+        """))
+        conn.commit()
+
+
+def migrate_v4_to_v5(engine):
+    """
+    Migration from v4 to v5: Add mtime column to entities table.
+    """
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE entities
+                ADD COLUMN mtime INTEGER
+            """))
+            conn.commit()
+        except OperationalError as e:
+            if "duplicate column name" in str(e).lower():
+                logger.debug("Column 'mtime' already exists")
+            else:
+                raise
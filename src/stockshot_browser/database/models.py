@@ -17,6 +17,18 @@ from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Reused for custom fields; json.dumps builds a new encoder whenever options are passed
+_CUSTOM_FIELDS_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_CUSTOM_FIELDS_DECODER = json.JSONDecoder()
+
+# Custom fields with json_extract expression indexes, for search filters
+INDEXED_CUSTOM_FIELDS = ('entity_type', 'is_sequence', 'pixel_format')
+
+
+def custom_field_path(field: str) -> str:
+    """JSON path of a custom field; index and query expressions must match exactly."""
+    return f'$."{field}"'
+
 
 # Association table for many-to-many relationship between entities and tags
 entity_tags = Table(
@@ -83,6 +95,7 @@ class Entity(Base):
     # File system metadata
     file_size = Column(Integer)  # Total size in bytes
     file_count = Column(Integer, default=1)  # Number of files (for sequences)
+    mtime = Column(Integer)  # Source st_mtime_ns when metadata was extracted
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     last_scanned = Column(DateTime, default=func.now())
@@ -104,6 +117,7 @@ class Entity(Base):
     __table_args__ = (
         Index('idx_entity_project_type', 'project_id', 'entity_type'),
         Index('idx_entity_path_hash', 'path'),
+        Index('ix_entity_path_type', 'path', 'entity_type', unique=True),
         UniqueConstraint('path', 'project_id', name='uq_entity_path_project'),
     )
     
@@ -194,18 +208,23 @@ class Metadata(Base):
     def __repr__(self) -> str:
         return f"<Metadata(id={self.id}, entity_id={self.entity_id})>"
     
+    @staticmethod
+    def encode_custom_fields(fields_dict: Dict[str, Any]) -> str:
+        """Serialize custom fields to the stored JSON string."""
+        return _CUSTOM_FIELDS_ENCODER.encode(fields_dict)
+    
     def get_custom_fields(self) -> Dict[str, Any]:
         """Get custom fields as dictionary."""
         if self.custom_fields:
             try:
-                return json.loads(self.custom_fields)
+                return _CUSTOM_FIELDS_DECODER.decode(self.custom_fields)
             except json.JSONDecodeError:
                 return {}
         return {}
     
     def set_custom_fields(self, fields_dict: Dict[str, Any]) -> None:
         """Set custom fields from dictionary."""
-        self.custom_fields = json.dumps(fields_dict, ensure_ascii=False)
+        self.custom_fields = self.encode_custom_fields(fields_dict)
     
     def add_custom_field(self, key: str, value: Any) -> None:
         """Add or update a single custom field."""
@@ -375,6 +394,21 @@ class Thumbnail(Base):
         self.extra_data['animated_path'] = path
 
 
+class ProbeCacheEntry(Base):
+    """Cached FFprobe result for a media file, valid while mtime and size match."""
+    
+    __tablename__ = 'probe_cache'
+    
+    path = Column(Text, primary_key=True)
+    mtime = Column(Integer, nullable=False)  # st_mtime_ns of the probed file
+    size = Column(Integer, nullable=False)  # st_size of the probed file
+    payload = Column(Text, nullable=False)  # JSON-encoded extractor result
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<ProbeCacheEntry(path='{self.path}', mtime={self.mtime}, size={self.size})>"
+
+
 # Create indexes for better query performance
 def create_additional_indexes(engine):
     """Create additional database indexes for performance."""
@@ -398,6 +432,19 @@ def create_additional_indexes(engine):
                 CREATE INDEX IF NOT EXISTS idx_metadata_resolution ON metadata (width, height)
             """))
             
+            # Indexes for metadata search filters (width is covered by the resolution index)
+            for column in ('duration', 'height', 'format', 'codec', 'colorspace'):
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS idx_metadata_{column} ON metadata ({column})"
+                ))
+            
+            # Expression indexes for custom field search filters (JSON1)
+            for field in INDEXED_CUSTOM_FIELDS:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS idx_metadata_custom_{field} "
+                    f"ON metadata (json_extract(custom_fields, '{custom_field_path(field)}'))"
+                ))
+            
             conn.commit()
             
         except Exception as e:
@@ -3,6 +3,7 @@ Export dialog for metadata and project data in Stockshot Browser.
 """
 
 import logging
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Optional, List, Any
 
@@ -13,7 +14,7 @@ from PySide6.QtWidgets import (
     QFormLayout, QSpacerItem, QSizePolicy, QMessageBox,
     QRadioButton, QButtonGroup
 )
-from PySide6.QtCore import Qt, Signal, Slot, QThread, QTimer
+from PySide6.QtCore import Qt, Signal, Slot, QTimer
 from PySide6.QtGui import QFont
 
 from ..core.metadata_exporter import MetadataExporter
@@ -21,63 +22,13 @@ from ..core.metadata_exporter import MetadataExporter
 logger = logging.getLogger(__name__)
 
 
-class ExportWorker(QThread):
-    """Worker thread for export operations."""
-    
-    # Signals
-    progress_updated = Signal(int, str)  # progress, status
-    export_completed = Signal(bool, str)  # success, message
-    
-    def __init__(self, exporter: MetadataExporter, export_params: dict):
-        super().__init__()
-        self.exporter = exporter
-        self.export_params = export_params
-    
-    def run(self):
-        """Run the export operation."""
-        try:
-            self.progress_updated.emit(10, "Preparing export...")
-            
-            output_path = Path(self.export_params['output_path'])
-            format_type = self.export_params['format']
-            export_type = self.export_params['export_type']
-            
-            self.progress_updated.emit(30, "Collecting data...")
-            
-            success = False
-            if export_type == 'project':
-                success = self.exporter.export_project_data(
-                    output_path=output_path,
-                    format=format_type,
-                    project_name=self.export_params.get('project_name'),
-                    include_thumbnails=self.export_params.get('include_thumbnails', False),
-                    include_favorites=self.export_params.get('include_favorites', True),
-                    include_tags=self.export_params.get('include_tags', True)
-                )
-            elif export_type == 'entities':
-                entities = self.export_params.get('entities', [])
-                success = self.exporter.export_entity_list(
-                    entities=entities,
-                    output_path=output_path,
-                    format=format_type
-                )
-            
-            self.progress_updated.emit(90, "Finalizing export...")
-            
-            if success:
-                self.progress_updated.emit(100, "Export completed successfully")
-                self.export_completed.emit(True, f"Export completed: {output_path}")
-            else:
-                self.export_completed.emit(False, "Export failed")
-                
-        except Exception as e:
-            logger.error(f"Export worker error: {e}")
-            self.export_completed.emit(False, f"Export error: {e}")
-
-
 class ExportDialog(QDialog):
     """Dialog for exporting metadata and project data."""
     
+    # Emitted from the exporter's background thread, delivered in the GUI thread
+    export_progress = Signal(int, str)  # progress, status
+    export_completed = Signal(bool, str)  # success, message
+    
     def __init__(self, app_controller, entities: Optional[List[Any]] = None):
         super().__init__()
         self.app_controller = app_controller
@@ -89,8 +40,8 @@ class ExportDialog(QDialog):
             database_manager=app_controller.database_manager
         )
         
-        # Worker thread
-        self.export_worker: Optional[ExportWorker] = None
+        # Export running on the exporter's background thread
+        self.export_future: Optional[Future] = None
         
         self._setup_ui()
         self._load_export_summary()
@@ -289,6 +240,8 @@ class ExportDialog(QDialog):
         """Connect dialog signals."""
         self.project_radio.toggled.connect(self._on_export_type_changed)
         self.entities_radio.toggled.connect(self._on_export_type_changed)
+        self.export_progress.connect(self._on_export_progress)
+        self.export_completed.connect(self._on_export_completed)
     
     def _load_export_summary(self):
         """Load and display export summary."""
@@ -415,11 +368,28 @@ class ExportDialog(QDialog):
             self.progress_bar.setValue(0)
             self.progress_label.setText("Starting export...")
             
-            # Start export worker
-            self.export_worker = ExportWorker(self.exporter, export_params)
-            self.export_worker.progress_updated.connect(self._on_export_progress)
-            self.export_worker.export_completed.connect(self._on_export_completed)
-            self.export_worker.start()
+            # Run the export on the exporter's background thread
+            if export_params['export_type'] == 'project':
+                self.export_future = self.exporter.export_project_data_async(
+                    output_path=output_path,
+                    format=export_params['format'],
+                    project_name=export_params.get('project_name'),
+                    include_thumbnails=export_params.get('include_thumbnails', False),
+                    include_favorites=export_params.get('include_favorites', True),
+                    include_tags=export_params.get('include_tags', True),
+                    progress_callback=self.export_progress.emit
+                )
+            else:
+                self.progress_bar.setValue(30)
+                self.progress_label.setText("Collecting data...")
+                self.export_future = self.exporter.export_entity_list_async(
+                    entities=export_params.get('entities', []),
+                    output_path=output_path,
+                    format=export_params['format']
+                )
+            self.export_future.add_done_callback(
+                lambda future: self._report_export_result(future, output_path)
+            )
             
         except Exception as e:
             logger.error(f"Error starting export: {e}")
@@ -458,6 +428,21 @@ class ExportDialog(QDialog):
         self.preview_button.setEnabled(enabled)
         self.export_button.setEnabled(enabled)
     
+    def _report_export_result(self, future: Future, output_path: Path):
+        """Announce a finished export; called from the exporter's background thread."""
+        try:
+            success = future.result()
+        except Exception as e:
+            logger.error(f"Export error: {e}")
+            self.export_completed.emit(False, f"Export error: {e}")
+            return
+        
+        if success:
+            self.export_progress.emit(100, "Export completed successfully")
+            self.export_completed.emit(True, f"Export completed: {output_path}")
+        else:
+            self.export_completed.emit(False, "Export failed")
+    
     @Slot(int, str)
     def _on_export_progress(self, progress: int, status: str):
         """Handle export progress update."""
@@ -477,26 +462,21 @@ class ExportDialog(QDialog):
         else:
             QMessageBox.critical(self, "Export Failed", message)
         
-        # Clean up worker
-        if self.export_worker:
-            self.export_worker.deleteLater()
-            self.export_worker = None
+        self.export_future = None
     
-    def closeEvent(self, event):
-        """Handle dialog close event."""
-        if self.export_worker and self.export_worker.isRunning():
+    def done(self, result: int):
+        """Close the dialog once no export is running, then stop the export thread."""
+        if self.export_future and not self.export_future.done():
             reply = QMessageBox.question(
                 self, "Export in Progress",
-                "Export is currently running. Do you want to cancel it?",
+                "Export is currently running. Close the dialog when it finishes?",
                 QMessageBox.Yes | QMessageBox.No,
                 QMessageBox.No
             )
             
-            if reply == QMessageBox.Yes:
-                self.export_worker.terminate()
-                self.export_worker.wait()
-                event.accept()
-            else:
-                event.ignore()
-        else:
-            event.accept()
\ No newline at end of file
+            if reply != QMessageBox.Yes:
+                return
+        
+        # Waits for a running export so its output file is complete
+        self.exporter.close()
+        super().done(result)
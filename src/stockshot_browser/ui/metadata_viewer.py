@@ -5,7 +5,7 @@ Metadata viewer widget for Stockshot Browser.
 import logging
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
@@ -37,6 +37,11 @@ class MetadataViewerWidget(QWidget):
         
         self._setup_ui()
         
+        # Refresh the shown entity once its extracted metadata is stored
+        multi_metadata_manager = getattr(app_controller, 'multi_metadata_manager', None)
+        if multi_metadata_manager:
+            multi_metadata_manager.metadata_extracted_batch.connect(self._on_metadata_extracted_batch)
+        
         logger.info("MetadataViewerWidget initialized")
     
     def _setup_ui(self):
@@ -150,6 +155,15 @@ class MetadataViewerWidget(QWidget):
         # Load metadata
         self._load_entity_metadata()
     
+    def _on_metadata_extracted_batch(self, batch: List[Tuple[MediaEntity, Dict[str, Any]]]):
+        """Reload the displayed metadata if the current entity is in the stored batch."""
+        if not self.current_entity:
+            return
+        
+        current_path = str(self.current_entity.path)
+        if any(str(entity.path) == current_path for entity, _ in batch):
+            self._load_entity_metadata()
+    
     def _load_entity_metadata(self):
         """Load and display metadata for current entity."""
         if not self.current_entity:
@@ -6,7 +6,7 @@ Context-aware content view that switches database and thumbnail contexts based o
 
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QScrollArea,
@@ -1200,6 +1200,7 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
         self.current_entities: List[MediaEntity] = []
         self.filtered_entities: List[MediaEntity] = []
         self.entity_widgets: Dict[str, EntityThumbnailWidget] = {}  # Key format: "path::name"
+        self.details_items: Dict[str, QTreeWidgetItem] = {}  # Details view rows by entity path
         self.selected_entities: List[MediaEntity] = []  # Track selected entities
         self.current_directory: Optional[str] = None
         self.current_context: ContextType = ContextType.GENERAL
@@ -1336,6 +1337,9 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
             self.multi_entity_manager.scan_progress.connect(
                 self._on_scan_progress
             )
+            self.multi_entity_manager.scan_completed.connect(
+                self._on_scan_completed
+            )
         
         # Connect to multi-thumbnail manager signals
         if self.multi_thumbnail_manager:
@@ -1345,6 +1349,12 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
             self.multi_thumbnail_manager.generation_progress.connect(
                 self._on_thumbnail_progress
             )
+        
+        # Connect to multi-metadata manager signals
+        if self.multi_metadata_manager:
+            self.multi_metadata_manager.metadata_extracted_batch.connect(
+                self._on_metadata_extracted_batch
+            )
     
     def _update_context_display(self, context: ContextType, path: str):
         """Update the context display in the UI."""
@@ -1415,6 +1425,10 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
             not self.progress_bar.isVisible()):
             return
         
+        # Thumbnails still queued for the previous directory are no longer visible
+        if self.multi_thumbnail_manager and self.current_directory and self.current_directory != directory_path:
+            self.multi_thumbnail_manager.cancel_pending_for_path(self.current_directory)
+        
         self.current_directory = directory_path
         self.status_label.setText(f"Scanning: {directory_path}")
         self.progress_bar.setVisible(True)
@@ -1474,9 +1488,12 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
                         # Set context for each directory
                         self._set_path_context(str(directory))
                         
-                        # Scan each directory recursively
+                        # Scan each directory recursively; the load is finished below, once
                         recursive_scan = self.config.get('ui.recursive_scan', True)
-                        entities = self.multi_entity_manager.scan_directory(directory, recursive=recursive_scan)
+                        entities = self.multi_entity_manager.scan_directory(
+                            directory, recursive=recursive_scan, collect=True,
+                            report_completion=False
+                        )
                         all_entities.extend(entities)
                         
                         # Update progress
@@ -1534,25 +1551,30 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
         self.selected_entities.clear()  # Clear selection when clearing content
     
     def _on_entities_discovered(self, entities: List[MediaEntity]):
-        """Handle entities discovered."""
+        """Handle a batch of entities discovered by an ongoing scan."""
+        
+        self.current_entities.extend(entities)
+        self.status_label.setText(f"Found {len(self.current_entities)} media files...")
+        
+        # Queue thumbnail generation using multi-thumbnail manager
+        if self.multi_thumbnail_manager:
+            self.multi_thumbnail_manager.queue_thumbnail_generation(entities, self.current_directory)
+    
+    def _on_scan_completed(self, total: int):
+        """Handle the end of a scan once all entity batches were delivered."""
         
-        self.current_entities = entities
         self.progress_bar.setVisible(False)
         
-        if not entities:
+        if not self.current_entities:
             self.status_label.setText("No media files found in this directory")
             return
         
-        self.status_label.setText(f"Found {len(entities)} media files")
+        self.status_label.setText(f"Found {len(self.current_entities)} media files")
         
         # SIMPLE APPROACH: Allow discovery but make widget creation idempotent
         
         # Create widgets - the _create_entity_widgets method should handle duplicates
         self._create_entity_widgets()
-        
-        # Queue thumbnail generation using multi-thumbnail manager
-        if self.multi_thumbnail_manager:
-            self.multi_thumbnail_manager.queue_thumbnail_generation(entities, self.current_directory)
     
     def _create_entity_widgets(self):
         """Create widgets for entities based on current view mode."""
@@ -1764,6 +1786,13 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
     
     def _create_details_widgets(self, entities: List[MediaEntity]):
         """Create details view widgets."""
+        # Read the metadata of all rows at once rather than two lookups per entity
+        metadata_by_path = {}
+        if self.multi_metadata_manager:
+            metadata_by_path = self.multi_metadata_manager.get_entity_metadata_bulk(
+                [str(entity.path) for entity in entities]
+            )
+        
         for entity in entities:
             # Create tree item
             item = QTreeWidgetItem()
@@ -1808,12 +1837,16 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
             else:
                 item.setText(2, "Unknown")
             
-            # Duration - get from metadata for videos and sequences
-            duration = self._get_entity_duration(entity)
+            metadata = metadata_by_path.get(str(entity.path))
+            
+            # Duration - from metadata for videos and sequences only
+            duration = None
+            if not (len(entity.files) == 1 and entity.frame_count == 1):
+                duration = self._format_entity_duration(metadata)
             item.setText(3, duration if duration else "N/A")
             
             # Resolution
-            resolution = self._get_entity_resolution(entity)
+            resolution = self._format_entity_resolution(metadata)
             item.setText(4, resolution if resolution else "N/A")
             
             # Favorites - show appropriate icon based on favorite status
@@ -1841,6 +1874,7 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
             item.setToolTip(0, tooltip)
 # Add to tree
             self.details_widget.addTopLevelItem(item)
+            self.details_items[str(entity.path)] = item
     
     def _get_entity_tooltip(self, entity: MediaEntity) -> str:
         """Get tooltip text for entity."""
@@ -1878,56 +1912,40 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
         
         return "\n".join(tooltip_parts)
     
-    def _get_entity_resolution(self, entity: MediaEntity) -> Optional[str]:
-        """Get resolution for an entity from metadata using multi-database manager."""
-        if not self.multi_metadata_manager:
-            return None
-        
-        try:
-            metadata = self.multi_metadata_manager.get_entity_metadata(
-                str(entity.path), 
-                context_path=self.current_directory
-            )
-            
-            if metadata and 'width' in metadata and 'height' in metadata:
-                return f"{metadata['width']}×{metadata['height']}"
+    def _format_entity_resolution(self, metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Format the resolution stored in an entity's metadata."""
+        if metadata and 'width' in metadata and 'height' in metadata:
+            return f"{metadata['width']}×{metadata['height']}"
+        return None
+    
+    def _format_entity_duration(self, metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Format the duration stored in an entity's metadata as HH:MM:SS or MM:SS."""
+        if metadata and 'duration' in metadata:
+            duration = metadata['duration']
+            hours = int(duration // 3600)
+            minutes = int((duration % 3600) // 60)
+            seconds = int(duration % 60)
             
-        except Exception as e:
-            logger.debug(f"Error getting resolution for {entity.name}: {e}")
-        
+            if hours > 0:
+                return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            else:
+                return f"{minutes:02d}:{seconds:02d}"
         return None
     
-    def _get_entity_duration(self, entity: MediaEntity) -> Optional[str]:
-        """Get duration for an entity from metadata using multi-database manager."""
-        # Skip duration for single images (frame_count == 1 indicates single image)
-        if len(entity.files) == 1 and entity.frame_count == 1:
-            return None
-        
-        if not self.multi_metadata_manager:
-            return None
-        
-        try:
-            metadata = self.multi_metadata_manager.get_entity_metadata(
-                str(entity.path),
-                context_path=self.current_directory
-            )
+    def _on_metadata_extracted_batch(self, batch: List[Tuple[MediaEntity, Dict[str, Any]]]):
+        """Fill in the duration and resolution of details rows whose metadata was just stored."""
+        for entity, metadata in batch:
+            item = self.details_items.get(str(entity.path))
+            if item is None:
+                continue
             
-            if metadata and 'duration' in metadata:
-                duration = metadata['duration']
-                # Format duration as HH:MM:SS or MM:SS
-                hours = int(duration // 3600)
-                minutes = int((duration % 3600) // 60)
-                seconds = int(duration % 60)
-                
-                if hours > 0:
-                    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                else:
-                    return f"{minutes:02d}:{seconds:02d}"
+            # Single images show no duration, as when the row was created
+            if not (len(entity.files) == 1 and entity.frame_count == 1):
+                duration = self._format_entity_duration(metadata)
+                item.setText(3, duration if duration else "N/A")
             
-        except Exception as e:
-            logger.debug(f"Error getting duration for {entity.name}: {e}")
-        
-        return None
+            resolution = self._format_entity_resolution(metadata)
+            item.setText(4, resolution if resolution else "N/A")
     
     def _get_entity_favorites_display(self, entity: MediaEntity) -> str:
         """Get favorites display text for an entity in details view using SVG icons."""
@@ -2053,6 +2071,7 @@ class MultiContentViewWidget(QWidget, DragDropMixin):
         
         # Clear details widget
         self.details_widget.clear()
+        self.details_items.clear()
         
         self.entity_widgets.clear()
         
@@ -4,32 +4,145 @@ FFmpeg integration utilities for Stockshot Browser.
 
 import json
 import logging
+import os
+import queue
+import select
+import signal
 import subprocess
-import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 import shutil
 
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+    Image = None
+
 logger = logging.getLogger(__name__)
 
+# Header-only probe of an image's first video stream: small probe window, no
+# stream analysis, and only the entries _parse_image_metadata reads
+_FAST_IMAGE_PROBE_ARGS = (
+    '-v', 'quiet', '-print_format', 'json',
+    '-probesize', '32k', '-analyzeduration', '0', '-fflags', 'nobuffer',
+    '-select_streams', 'v:0',
+    '-show_entries', 'format=format_name,size:stream=codec_name,width,height,pix_fmt,color_space,color_range',
+)
+
+# Thumbnail workers already run one ffmpeg per core, so each decodes single-threaded
+_FFMPEG_THREAD_ARGS = ('-threads', '1')
+
+# Decode only the keyframe at or before an input-side seek instead of every frame up to it
+_KEYFRAME_SEEK_ARGS = ('-skip_frame', 'nokey', '-noaccurate_seek')
+
+# Probed video durations kept per thumbnail generator, keyed by (path, st_mtime_ns)
+_DURATION_CACHE_SIZE = 4096
+
+# Plain 8-bit formats thumbnailed in-process with Pillow; EXR, DPX, TIFF etc. still go through FFmpeg
+_PILLOW_THUMBNAIL_SUFFIXES = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.webp'})
+_PILLOW_THUMBNAIL_MODES = frozenset({'1', 'L', 'LA', 'P', 'RGB', 'RGBA', 'CMYK', 'YCbCr'})
+# Roughly matches the '-q:v 2' used for FFmpeg thumbnails
+_PILLOW_JPEG_QUALITY = 90
+
 
 class FFmpegError(Exception):
     """Exception raised for FFmpeg-related errors."""
     pass
 
 
+class FFprobeProcess:
+    """
+    Long-lived shell loop that runs ffprobe for each path written to its stdin.
+    
+    Spawning ffprobe from a tiny shell is much cheaper than forking the GUI
+    process for every file, and the pipes are reused across probes. Each
+    result is followed by a record separator line carrying the exit code.
+    """
+    
+    _SEPARATOR = b'\x1e'
+    _SCRIPT = 'while IFS= read -r f; do "$0" "$@" -i "$f" </dev/null; printf \'\\036%d\\n\' "$?"; done'
+    
+    def __init__(self, ffprobe_path: str, probe_args: Sequence[str], timeout: float):
+        self.timeout = timeout
+        self._process = subprocess.Popen(
+            ['sh', '-c', self._SCRIPT, ffprobe_path, *probe_args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            start_new_session=True,
+        )
+        self._buffer = b''
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """Check whether persistent probing can be used on this platform."""
+        return os.name == 'posix' and shutil.which('sh') is not None
+    
+    def is_alive(self) -> bool:
+        """Check whether the shell loop is still running."""
+        return self._process.poll() is None
+    
+    def probe(self, path: Path) -> subprocess.CompletedProcess:
+        """Probe a single path, returning the ffprobe output and exit code."""
+        self._process.stdin.write(os.fsencode(str(path)) + b'\n')
+        
+        deadline = time.monotonic() + self.timeout
+        fd = self._process.stdout.fileno()
+        while True:
+            start = self._buffer.find(self._SEPARATOR)
+            end = self._buffer.find(b'\n', start) if start != -1 else -1
+            if end != -1:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                self.close()
+                raise subprocess.TimeoutExpired(str(path), self.timeout)
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise FFmpegError("FFprobe process exited unexpectedly")
+            self._buffer += chunk
+        
+        output = self._buffer[:start]
+        returncode = int(self._buffer[start + 1:end])
+        self._buffer = self._buffer[end + 1:]
+        return subprocess.CompletedProcess(str(path), returncode, output.decode('utf-8', 'replace'), '')
+    
+    def close(self) -> None:
+        """Terminate the shell loop and any ffprobe it is running."""
+        if self.is_alive():
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self._process.wait()
+
+
 class FFmpegExtractor:
     """Extracts metadata and generates thumbnails using FFmpeg."""
     
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, persistent_probe: bool = False,
+                 probe_args: Optional[Sequence[str]] = None):
         self.config_manager = config_manager
         self.ffmpeg_path = self.config_manager.get('ffmpeg.executable_path', 'ffmpeg')
         self.ffprobe_path = self.config_manager.get('ffmpeg.ffprobe_path', 'ffprobe')
         self.timeout = self.config_manager.get('ffmpeg.timeout', 30)
         
+        # Extra ffprobe input options, e.g. to shorten stream analysis
+        self.probe_args = list(probe_args or [])
+        
         # Verify FFmpeg installation
         self._verify_ffmpeg()
         
+        # Idle persistent ffprobe processes by argument list, one per concurrent caller at most
+        self.persistent_probe = persistent_probe and FFprobeProcess.is_supported()
+        self._probe_processes: "Dict[Tuple[str, ...], queue.LifoQueue[FFprobeProcess]]" = {}
+        
     
     def _verify_ffmpeg(self) -> None:
         """Verify that FFmpeg and FFprobe are available."""
@@ -70,22 +183,7 @@ class FFmpegExtractor:
         """
         
         try:
-            # Use ffprobe to get detailed information
-            cmd = [
-                self.ffprobe_path,
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                str(video_path)
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
+            result = self._run_ffprobe(video_path)
             
             if result.returncode != 0:
                 raise FFmpegError(f"FFprobe failed: {result.stderr}")
@@ -112,21 +210,33 @@ class FFmpegExtractor:
         """
         
         try:
-            cmd = [
-                self.ffprobe_path,
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                str(image_path)
-            ]
+            result = self._run_ffprobe(image_path)
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
+            if result.returncode != 0:
+                raise FFmpegError(f"FFprobe failed: {result.stderr}")
+            
+            probe_data = json.loads(result.stdout)
+            return self._parse_image_metadata(probe_data)
+            
+        except Exception as e:
+            return self._get_basic_file_info(image_path)
+    
+    def extract_image_info_fast(self, image_path: Path) -> Dict[str, Any]:
+        """
+        Extract basic image metadata from container headers only.
+        
+        Reads just the fields stored for images and sequence frames (size,
+        codec, pixel format, color info) without ffprobe's stream analysis.
+        
+        Args:
+            image_path: Path to image file
+            
+        Returns:
+            Dictionary containing image metadata
+        """
+        
+        try:
+            result = self._run_ffprobe(image_path, _FAST_IMAGE_PROBE_ARGS)
             
             if result.returncode != 0:
                 raise FFmpegError(f"FFprobe failed: {result.stderr}")
@@ -137,6 +247,46 @@ class FFmpegExtractor:
         except Exception as e:
             return self._get_basic_file_info(image_path)
     
+    def _run_ffprobe(self, media_path: Path, probe_args: Optional[Sequence[str]] = None) -> subprocess.CompletedProcess:
+        """Run ffprobe on a file, through a persistent process when enabled."""
+        if probe_args is None:
+            probe_args = ('-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', *self.probe_args)
+        
+        # Line-based protocol cannot carry paths containing newlines
+        if not self.persistent_probe or '\n' in str(media_path):
+            return subprocess.run(
+                [self.ffprobe_path, *probe_args, str(media_path)],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        
+        # Persistent processes run with fixed arguments; keep one pool per argument list
+        idle_processes = self._probe_processes.setdefault(tuple(probe_args), queue.LifoQueue())
+        try:
+            process = idle_processes.get_nowait()
+        except queue.Empty:
+            process = FFprobeProcess(self.ffprobe_path, probe_args, self.timeout)
+        
+        try:
+            result = process.probe(media_path)
+        except Exception:
+            process.close()
+            raise
+        
+        if process.is_alive():
+            idle_processes.put(process)
+        return result
+    
+    def close(self) -> None:
+        """Shut down any persistent ffprobe processes."""
+        for idle_processes in list(self._probe_processes.values()):
+            while True:
+                try:
+                    idle_processes.get_nowait().close()
+                except queue.Empty:
+                    break
+    
     def _parse_video_metadata(self, probe_data: Dict) -> Dict[str, Any]:
         """Parse FFprobe output for video files."""
         metadata = {}
@@ -303,6 +453,10 @@ class FFmpegThumbnailGenerator:
         self.timeout = self.config_manager.get('ffmpeg.timeout', 30)
         self.thumbnail_time_offset = self.config_manager.get('ffmpeg.thumbnail_time_offset', 0.1)
         
+        # Durations are probed at most once per file version, shared by all workers
+        self._duration_cache: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._duration_lock = threading.Lock()
+        
     
     def extract_frame(self, video_path: Path, output_path: Path, 
                      timestamp: float, resolution: int) -> bool:
@@ -318,42 +472,73 @@ class FFmpegThumbnailGenerator:
         Returns:
             True if successful
         """
+        data = self.extract_frame_data(video_path, timestamp, resolution)
+        if not data:
+            return False
+        
         try:
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(data)
+            return True
+        except OSError as e:
+            logger.debug(f"Could not write frame to {output_path}: {e}")
+            return False
+    
+    def extract_frame_data(self, video_path: Path, timestamp: float,
+                           resolution: int) -> Optional[bytes]:
+        """
+        Extract a frame from video at specified timestamp as JPEG bytes.
+        
+        FFmpeg writes the frame to its stdout, so callers can store it with a
+        single write and know its size without stat-ing the output. The nearest
+        keyframe is tried first, then an exact seek if that yields nothing.
+        
+        Args:
+            video_path: Path to video file
+            timestamp: Time in seconds to extract frame
+            resolution: Target resolution (height or width)
             
-            cmd = [
-                self.ffmpeg_path,
-                '-ss', str(timestamp),
-                '-i', str(video_path),
-                '-vframes', '1',
-                '-vf', f'scale=-1:{resolution}',
-                '-q:v', '2',  # High quality
-                '-y',  # Overwrite output
-                str(output_path)
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
+        Returns:
+            JPEG data, or None if extraction failed
+        """
+        try:
+            for seek_args in (_KEYFRAME_SEEK_ARGS, ()):
+                cmd = [
+                    self.ffmpeg_path,
+                    *_FFMPEG_THREAD_ARGS,
+                    '-ss', str(timestamp),
+                    *seek_args,
+                    '-i', str(video_path),
+                    '-an',
+                    '-vframes', '1',
+                    '-vf', f'scale=-1:{resolution}',
+                    '-q:v', '2',  # High quality
+                    '-f', 'image2pipe',
+                    '-vcodec', 'mjpeg',
+                    '-'  # Write to stdout
+                ]
+                
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    timeout=self.timeout
+                )
+                
+                if result.returncode == 0 and result.stdout:
+                    return result.stdout
             
-            if result.returncode == 0 and output_path.exists():
-                return True
-            else:
-                return False
+            return None
                 
         except subprocess.TimeoutExpired:
-            return False
+            return None
         except Exception as e:
-            return False
+            return None
     
     def extract_image_thumbnail(self, image_path: Path, output_path: Path,
                                resolution: int) -> bool:
         """
-        Generate thumbnail from image file using FFmpeg exclusively.
+        Generate thumbnail from image file, using Pillow for common formats and FFmpeg otherwise.
         
         Supports a wide variety of image formats and handles alpha channels properly
         by compositing against a black background when needed.
@@ -370,6 +555,11 @@ class FFmpegThumbnailGenerator:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Decode common formats in-process, saving an FFmpeg process spawn per image
+        if (PILLOW_AVAILABLE and image_path.suffix.lower() in _PILLOW_THUMBNAIL_SUFFIXES
+                and self._extract_image_thumbnail_pillow(image_path, output_path, resolution)):
+            return True
+        
         # Try FFmpeg with alpha handling (most comprehensive approach)
         if self._extract_image_thumbnail_ffmpeg_with_alpha(image_path, output_path, resolution):
             return True
@@ -390,6 +580,35 @@ class FFmpegThumbnailGenerator:
 
         return False
     
+    def _extract_image_thumbnail_pillow(self, image_path: Path, output_path: Path, resolution: int) -> bool:
+        """Pillow method, scaled to the target height and composited on black like the FFmpeg path."""
+        try:
+            with Image.open(image_path) as img:
+                if img.mode not in _PILLOW_THUMBNAIL_MODES or img.height <= 0:
+                    logger.debug(f"Pillow method skipped for {image_path} (mode {img.mode})")
+                    return False
+                
+                width = max(1, round(img.width * resolution / img.height))
+                # Let libjpeg downscale during decode, keeping at least 2x the target for resampling
+                img.draft('RGB', (width * 2, resolution * 2))
+                
+                if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+                    rgba = img.convert('RGBA')
+                    frame = Image.new('RGB', rgba.size, (0, 0, 0))
+                    frame.paste(rgba, mask=rgba.getchannel('A'))
+                else:
+                    frame = img.convert('RGB')
+                
+                frame = frame.resize((width, resolution), Image.LANCZOS)
+                frame.save(output_path, 'JPEG', quality=_PILLOW_JPEG_QUALITY)
+            
+            logger.debug(f"Pillow method succeeded for: {image_path}")
+            return True
+            
+        except Exception as e:
+            logger.debug(f"Pillow method exception: {e}")
+            return False
+    
     def _extract_image_thumbnail_ffmpeg_with_alpha(self, image_path: Path, output_path: Path, resolution: int) -> bool:
         """FFmpeg method with proper alpha channel handling."""
         try:
@@ -403,6 +622,7 @@ class FFmpegThumbnailGenerator:
             # This composites the image against a black background, ignoring alpha
             cmd = [
                 self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
                 '-i', str(image_path),
                 '-vf', (
                     f'scale=-1:{resolution}:flags=lanczos,'  # Scale to target resolution
@@ -444,6 +664,7 @@ class FFmpegThumbnailGenerator:
             # Use simple approach - treat as single image, not video stream
             cmd = [
                 self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
                 '-i', str(image_path),
                 '-vf', f'scale=-1:{resolution}:flags=lanczos',
                 '-frames:v', '1',
@@ -482,6 +703,7 @@ class FFmpegThumbnailGenerator:
             
             cmd = [
                 self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
                 '-f', input_format,
                 '-i', str(image_path),
                 '-vf', f'scale=-1:{resolution}:flags=lanczos',
@@ -516,6 +738,30 @@ class FFmpegThumbnailGenerator:
             logger.debug(f"Skipping duration extraction for image file: {video_path}")
             return None
         
+        try:
+            key = (str(video_path), video_path.stat().st_mtime_ns)
+        except OSError:
+            key = None
+        
+        if key is not None:
+            with self._duration_lock:
+                duration = self._duration_cache.get(key)
+                if duration is not None:
+                    self._duration_cache.move_to_end(key)
+                    return duration
+        
+        duration = self._probe_duration(video_path)
+        
+        # Failed probes are not cached so transient errors can be retried
+        if key is not None and duration is not None:
+            with self._duration_lock:
+                self._duration_cache[key] = duration
+                if len(self._duration_cache) > _DURATION_CACHE_SIZE:
+                    self._duration_cache.popitem(last=False)
+        return duration
+    
+    def _probe_duration(self, video_path: Path) -> Optional[float]:
+        """Run ffprobe to read a video's duration in seconds."""
         try:
             cmd = [
                 'ffprobe',
@@ -588,6 +834,7 @@ class FFmpegThumbnailGenerator:
             
             cmd = [
                 self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
                 '-i', str(video_path),
                 '-filter_complex', filter_complex,
                 '-r', str(fps),  # Output frame rate
@@ -627,6 +874,99 @@ class FFmpegThumbnailGenerator:
             logger.error(f"Error generating animated thumbnail for {video_path}: {e}")
             return False
     
+    def generate_animated_and_static(self, video_path: Path, animated_path: Path,
+                                     static_path: Path, frame_count: int = 25,
+                                     fps: int = 10, resolution: int = 128) -> Tuple[bool, Optional[float]]:
+        """
+        Generate the animated (GIF) and static (JPG) thumbnails of a video in one FFmpeg pass.
+        
+        The decoded stream is split in two: one branch feeds the GIF palette chain,
+        the other keeps the frame at 10% of the duration for the static thumbnail.
+        
+        Args:
+            video_path: Path to video file
+            animated_path: Path for output animated thumbnail (should be .gif)
+            static_path: Path for output static thumbnail
+            frame_count: Number of frames to extract
+            fps: Frames per second for the output GIF
+            resolution: Target resolution (height)
+        
+        Returns:
+            Tuple of (True if the animated thumbnail was generated, source frame time in seconds)
+        """
+        try:
+            duration = self.get_video_duration(video_path)
+            if not duration or duration <= 0:
+                logger.debug(f"Could not get duration for {video_path} - may be an image file")
+                return False, None
+            
+            source_frame = duration * 0.1
+            
+            # Ensure output directories exist
+            animated_path.parent.mkdir(parents=True, exist_ok=True)
+            static_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            filter_complex = (
+                f"[0:v]split=2[anim][still];"  # One decode feeds both outputs
+                f"[anim]fps=fps={frame_count}/{duration},"  # Extract frames at calculated rate
+                f"scale=-1:{resolution}:flags=lanczos,"  # Scale to target resolution
+                f"split=2[s0][s1];"  # Split for alpha handling and palette generation
+                f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
+                f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
+                f"[comp]split[s3][s4];"  # Split composited stream for palette generation
+                f"[s3]palettegen=max_colors=128:stats_mode=single[p];"  # Generate optimized palette
+                f"[s4][p]paletteuse=dither=bayer:bayer_scale=5[gif];"  # Apply palette with dithering
+                f"[still]trim=start={source_frame},setpts=PTS-STARTPTS,"  # Skip to the static frame
+                f"scale=-1:{resolution}[jpg]"
+            )
+            
+            cmd = [
+                self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
+                '-i', str(video_path),
+                '-filter_complex', filter_complex,
+                '-y',  # Overwrite outputs
+                '-map', '[gif]',
+                '-r', str(fps),  # Output frame rate
+                '-loop', '0',  # Infinite loop
+                str(animated_path),
+                '-map', '[jpg]',
+                '-frames:v', '1',
+                '-q:v', '2',  # High quality
+                str(static_path)
+            ]
+            
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+            
+            if result.returncode == 0 and animated_path.exists():
+                # Check file size and optimize if needed
+                file_size_kb = animated_path.stat().st_size / 1024
+                max_size_kb = self.config_manager.get('thumbnails.animated.max_size_kb', 500)
+                
+                if file_size_kb > max_size_kb:
+                    logger.debug(f"Animated thumbnail too large ({file_size_kb:.1f}KB), optimizing...")
+                    success = self._optimize_animated_thumbnail(video_path, animated_path,
+                                                                frame_count, fps, resolution)
+                    return success, source_frame
+                
+                logger.debug(f"Generated animated and static thumbnails: {animated_path}, {static_path}")
+                return True, source_frame
+            else:
+                logger.error(f"FFmpeg combined thumbnail generation failed: {result.stderr}")
+                return False, source_frame
+        
+        except subprocess.TimeoutExpired:
+            logger.error(f"FFmpeg combined thumbnail generation timeout after {self.timeout} seconds")
+            return False, None
+        except Exception as e:
+            logger.error(f"Error generating thumbnails for {video_path}: {e}")
+            return False, None
+    
     def _optimize_animated_thumbnail(self, video_path: Path, output_path: Path,
                                    frame_count: int, fps: int, resolution: int) -> bool:
         """
@@ -651,6 +991,7 @@ class FFmpegThumbnailGenerator:
             
             cmd = [
                 self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
                 '-i', str(video_path),
                 '-filter_complex', filter_complex,
                 '-r', str(fps),
@@ -677,6 +1018,162 @@ class FFmpegThumbnailGenerator:
             logger.error(f"Error optimizing animated thumbnail: {e}")
             return False
     
+    @staticmethod
+    def _sample_sequence(image_files: Sequence[Path], frame_count: int) -> List[Path]:
+        """Pick up to frame_count files spread evenly through a sequence, in order."""
+        # Sort files to ensure proper sequence order
+        sorted_files = sorted(image_files)
+        
+        # Use all files if we have fewer than requested
+        if len(sorted_files) <= frame_count:
+            return sorted_files
+        
+        # Sample evenly throughout the sequence
+        interval = len(sorted_files) / frame_count
+        return [sorted_files[int(i * interval)] for i in range(frame_count)]
+    
+    @staticmethod
+    def _concat_file_line(path: Path) -> str:
+        """Format a concat demuxer file directive, quoting the absolute path."""
+        # A listing read from pipe:0 has no directory of its own to resolve relative entries against
+        quoted = str(Path(path).resolve()).replace("'", "'\\''")
+        return f"file '{quoted}'"
+    
+    @classmethod
+    def _concat_listing(cls, sampled_files: Sequence[Path], fps: int) -> str:
+        """Build a concat demuxer listing that shows each file for one GIF frame."""
+        # The last file is listed again because the concat demuxer ignores the final duration
+        listing = ['ffconcat version 1.0']
+        for image_file in sampled_files:
+            listing.append(cls._concat_file_line(image_file))
+            listing.append(f"duration {1.0 / fps}")
+        listing.append(cls._concat_file_line(sampled_files[-1]))
+        return '\n'.join(listing) + '\n'
+    
+    def _run_sequence_gif(self, sampled_files: Sequence[Path], output_path: Path,
+                          fps: int, filter_complex: str) -> subprocess.CompletedProcess:
+        """Run one FFmpeg pass turning sampled sequence frames into a GIF, fed through the concat demuxer."""
+        cmd = [
+            self.ffmpeg_path,
+            *_FFMPEG_THREAD_ARGS,
+            '-f', 'concat',
+            '-safe', '0',
+            '-protocol_whitelist', 'file,pipe',
+            '-i', 'pipe:0',  # Listing of sampled frames
+            '-filter_complex', filter_complex,
+            '-loop', '0',  # Infinite loop
+            '-y',  # Overwrite output
+            str(output_path)
+        ]
+        
+        return subprocess.run(
+            cmd,
+            input=self._concat_listing(sampled_files, fps),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout
+        )
+    
+    def generate_sequence_animated_and_static(self, image_files: Sequence[Path], animated_path: Path,
+                                              static_path: Path, frame_count: int = 25,
+                                              fps: int = 10, resolution: int = 128) -> bool:
+        """
+        Generate the animated (GIF) and static (JPG) thumbnails of an image sequence in one FFmpeg pass.
+        
+        The sampled frames are fed through the concat demuxer with a listing
+        written to FFmpeg's stdin, and the middle frame of the sequence is a
+        second input for the static thumbnail, so no intermediate frames are
+        written to disk.
+        
+        Args:
+            image_files: List of image file paths in the sequence
+            animated_path: Path for output animated thumbnail (should be .gif)
+            static_path: Path for output static thumbnail
+            frame_count: Maximum number of frames to include
+            fps: Frames per second for the output GIF
+            resolution: Target resolution (height)
+        
+        Returns:
+            True if both thumbnails were generated
+        """
+        try:
+            if not image_files or len(image_files) < 2:
+                logger.debug(f"Not enough images for animation: {len(image_files) if image_files else 0}")
+                return False
+            
+            sorted_files = sorted(image_files)
+            sampled_files = self._sample_sequence(sorted_files, frame_count)
+            middle_file = sorted_files[len(sorted_files) // 2]
+            
+            # Ensure output directories exist
+            animated_path.parent.mkdir(parents=True, exist_ok=True)
+            static_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            filter_complex = (
+                f"[0:v]fps={fps},"  # Set frame rate
+                f"scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,"  # Ensure consistent scaling
+                f"split=2[s0][s1];"  # Split for alpha handling and palette generation
+                f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
+                f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
+                f"[comp]split[s3][s4];"  # Split composited stream for palette generation
+                f"[s3]palettegen=max_colors=128:stats_mode=single[p];"  # Generate optimized palette
+                f"[s4][p]paletteuse=dither=bayer:bayer_scale=5[gif];"  # Apply palette with dithering
+                f"[1:v]scale=-1:{resolution}:flags=lanczos,"  # Middle frame for the static thumbnail
+                f"split=2[still_bg][still];"
+                f"[still_bg]format=rgb24,drawbox=c=black:t=fill[still_bg];"  # Create black background
+                f"[still_bg][still]overlay=alpha=straight[jpg]"  # Overlay image on black background, ignoring alpha
+            )
+            
+            cmd = [
+                self.ffmpeg_path,
+                *_FFMPEG_THREAD_ARGS,
+                '-f', 'concat',
+                '-safe', '0',
+                '-protocol_whitelist', 'file,pipe',
+                '-i', 'pipe:0',  # Listing of sampled frames
+                *_FFMPEG_THREAD_ARGS,
+                '-i', str(middle_file),
+                '-filter_complex', filter_complex,
+                '-y',  # Overwrite outputs
+                '-map', '[gif]',
+                '-loop', '0',  # Infinite loop
+                str(animated_path),
+                '-map', '[jpg]',
+                '-frames:v', '1',
+                '-q:v', '2',  # High quality
+                str(static_path)
+            ]
+            
+            result = subprocess.run(
+                cmd,
+                input=self._concat_listing(sampled_files, fps),
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+            
+            if result.returncode == 0 and animated_path.exists() and static_path.exists():
+                # Check file size and optimize if needed
+                file_size_kb = animated_path.stat().st_size / 1024
+                max_size_kb = self.config_manager.get('thumbnails.animated.max_size_kb', 500)
+                
+                if file_size_kb > max_size_kb:
+                    logger.debug(f"Sequence animated thumbnail too large ({file_size_kb:.1f}KB), optimizing...")
+                    return self._optimize_sequence_animated_thumbnail(sampled_files, animated_path, fps, resolution)
+                
+                logger.debug(f"Generated sequence animated and static thumbnails: {animated_path}, {static_path}")
+                return True
+            else:
+                logger.debug(f"FFmpeg combined sequence thumbnail generation failed: {result.stderr}")
+                return False
+                
+        except subprocess.TimeoutExpired:
+            logger.error(f"FFmpeg combined sequence thumbnail generation timeout after {self.timeout} seconds")
+            return False
+        except Exception as e:
+            logger.error(f"Error generating thumbnails from sequence: {e}")
+            return False
+    
     def generate_animated_thumbnail_from_sequence(self, image_files: List[Path], output_path: Path,
                                                  frame_count: int = 25, fps: int = 10,
                                                  resolution: int = 128) -> bool:
@@ -698,116 +1195,47 @@ class FFmpegThumbnailGenerator:
                 logger.debug(f"Not enough images for animation: {len(image_files) if image_files else 0}")
                 return False
             
-            # Sort files to ensure proper sequence order
-            sorted_files = sorted(image_files)
-            
-            # Calculate sampling interval to get desired frame count
-            if len(sorted_files) <= frame_count:
-                # Use all files if we have fewer than requested
-                sampled_files = sorted_files
-            else:
-                # Sample evenly throughout the sequence
-                interval = len(sorted_files) / frame_count
-                sampled_files = []
-                for i in range(frame_count):
-                    index = int(i * interval)
-                    if index < len(sorted_files):
-                        sampled_files.append(sorted_files[index])
+            sampled_files = self._sample_sequence(image_files, frame_count)
             
-            logger.debug(f"Creating animated thumbnail from {len(sampled_files)} frames (out of {len(sorted_files)} total)")
+            logger.debug(f"Creating animated thumbnail from {len(sampled_files)} frames (out of {len(image_files)} total)")
             
             # Ensure output directory exists
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Create a temporary directory for processed frames
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                processed_frames = []
-                
-                # Process each selected frame with alpha handling
-                for i, image_file in enumerate(sampled_files):
-                    frame_output = temp_path / f"frame_{i:04d}.jpg"
-                    
-                    # Scale each frame to target resolution with alpha compositing on black background
-                    # This handles transparency properly by ignoring alpha channels
-                    cmd = [
-                        self.ffmpeg_path,
-                        '-i', str(image_file),
-                        '-vf', (
-                            f'scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,'
-                            f'split=2[bg][img];'  # Split the input into two streams
-                            f'[bg]format=yuv420p,drawbox=c=black:t=fill[bg];'  # Create black background
-                            f'[bg][img]overlay=alpha=straight'  # Overlay image on black background, ignoring alpha
-                        ),
-                        '-q:v', '2',
-                        '-y',
-                        str(frame_output)
-                    ]
-                    
-                    result = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    
-                    if result.returncode == 0 and frame_output.exists():
-                        processed_frames.append(frame_output)
-                    else:
-                        logger.warning(f"Failed to process frame: {image_file}")
-                
-                if not processed_frames:
-                    logger.error("No frames were successfully processed")
-                    return False
-                
-                # Create input pattern for FFmpeg
-                input_pattern = temp_path / "frame_%04d.jpg"
-                
-                # Generate GIF with palette optimization, aspect ratio preservation, and alpha handling
-                filter_complex = (
-                    f"fps={fps},"  # Set frame rate
-                    f"scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,"  # Ensure consistent scaling
-                    f"split=2[s0][s1];"  # Split for alpha handling and palette generation
-                    f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
-                    f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
-                    f"[comp]split[s3][s4];"  # Split composited stream for palette generation
-                    f"[s3]palettegen=max_colors=128:stats_mode=single[p];"  # Generate optimized palette
-                    f"[s4][p]paletteuse=dither=bayer:bayer_scale=5"  # Apply palette with dithering
-                )
+            # Generate GIF with palette optimization, aspect ratio preservation, and alpha handling,
+            # decoding the sampled frames in the same pass instead of pre-scaling them to temp files
+            filter_complex = (
+                f"fps={fps},"  # Set frame rate
+                f"scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,"  # Ensure consistent scaling
+                f"split=2[s0][s1];"  # Split for alpha handling and palette generation
+                f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
+                f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
+                f"[comp]split[s3][s4];"  # Split composited stream for palette generation
+                f"[s3]palettegen=max_colors=128:stats_mode=single[p];"  # Generate optimized palette
+                f"[s4][p]paletteuse=dither=bayer:bayer_scale=5"  # Apply palette with dithering
+            )
+            
+            result = self._run_sequence_gif(sampled_files, output_path, fps, filter_complex)
+            
+            if result.returncode == 0 and output_path.exists():
+                # Check file size and optimize if needed
+                file_size_kb = output_path.stat().st_size / 1024
+                max_size_kb = self.config_manager.get('thumbnails.animated.max_size_kb', 500)
                 
-                cmd = [
-                    self.ffmpeg_path,
-                    '-framerate', str(fps),
-                    '-i', str(input_pattern),
-                    '-filter_complex', filter_complex,
-                    '-loop', '0',  # Infinite loop
-                    '-y',  # Overwrite output
-                    str(output_path)
-                ]
+                if file_size_kb > max_size_kb:
+                    # Try to optimize by reducing colors
+                    logger.debug(f"Sequence animated thumbnail too large ({file_size_kb:.1f}KB), optimizing...")
+                    return self._optimize_sequence_animated_thumbnail(sampled_files, output_path, fps, resolution)
                 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout
-                )
+                logger.debug(f"Generated sequence animated thumbnail: {output_path} ({file_size_kb:.1f}KB)")
+                return True
+            else:
+                logger.error(f"FFmpeg sequence animated thumbnail generation failed: {result.stderr}")
+                return False
                 
-                if result.returncode == 0 and output_path.exists():
-                    # Check file size and optimize if needed
-                    file_size_kb = output_path.stat().st_size / 1024
-                    max_size_kb = self.config_manager.get('thumbnails.animated.max_size_kb', 500)
-                    
-                    if file_size_kb > max_size_kb:
-                        # Try to optimize by reducing colors
-                        logger.debug(f"Sequence animated thumbnail too large ({file_size_kb:.1f}KB), optimizing...")
-                        return self._optimize_sequence_animated_thumbnail(sampled_files, output_path, fps, resolution)
-                    
-                    logger.debug(f"Generated sequence animated thumbnail: {output_path} ({file_size_kb:.1f}KB)")
-                    return True
-                else:
-                    logger.error(f"FFmpeg sequence animated thumbnail generation failed: {result.stderr}")
-                    return False
-                    
+        except subprocess.TimeoutExpired:
+            logger.error(f"FFmpeg sequence animated thumbnail generation timeout after {self.timeout} seconds")
+            return False
         except Exception as e:
             logger.error(f"Error generating animated thumbnail from sequence: {e}")
             return False
@@ -818,79 +1246,27 @@ class FFmpegThumbnailGenerator:
         Optimize sequence animated thumbnail by reducing quality/colors.
         """
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                processed_frames = []
-                
-                # Process frames with lower quality and alpha handling
-                for i, image_file in enumerate(image_files):
-                    frame_output = temp_path / f"frame_{i:04d}.jpg"
-                    
-                    cmd = [
-                        self.ffmpeg_path,
-                        '-i', str(image_file),
-                        '-vf', (
-                            f'scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,'
-                            f'split=2[bg][img];'  # Split the input into two streams
-                            f'[bg]format=yuv420p,drawbox=c=black:t=fill[bg];'  # Create black background
-                            f'[bg][img]overlay=alpha=straight'  # Overlay image on black background, ignoring alpha
-                        ),
-                        '-q:v', '5',  # Lower quality
-                        '-y',
-                        str(frame_output)
-                    ]
-                    
-                    result = subprocess.run(
-                        cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    
-                    if result.returncode == 0 and frame_output.exists():
-                        processed_frames.append(frame_output)
-                
-                if not processed_frames:
-                    return False
-                
-                input_pattern = temp_path / "frame_%04d.jpg"
-                
-                # More aggressive optimization with aspect ratio preservation and alpha handling
-                filter_complex = (
-                    f"fps={fps},"
-                    f"scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,"  # Ensure consistent scaling
-                    f"split=2[s0][s1];"  # Split for alpha handling and palette generation
-                    f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
-                    f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
-                    f"[comp]split[s3][s4];"  # Split composited stream for palette generation
-                    f"[s3]palettegen=max_colors=64:stats_mode=single[p];"  # Fewer colors
-                    f"[s4][p]paletteuse=dither=none"  # No dithering for smaller size
-                )
-                
-                cmd = [
-                    self.ffmpeg_path,
-                    '-framerate', str(fps),
-                    '-i', str(input_pattern),
-                    '-filter_complex', filter_complex,
-                    '-loop', '0',
-                    '-y',
-                    str(output_path)
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout
-                )
-                
-                if result.returncode == 0 and output_path.exists():
-                    file_size_kb = output_path.stat().st_size / 1024
-                    logger.debug(f"Optimized sequence animated thumbnail: {output_path} ({file_size_kb:.1f}KB)")
-                    return True
-                
-                return False
-                
+            # More aggressive optimization with aspect ratio preservation and alpha handling
+            filter_complex = (
+                f"fps={fps},"
+                f"scale=-1:{resolution}:flags=lanczos:force_original_aspect_ratio=decrease,"  # Ensure consistent scaling
+                f"split=2[s0][s1];"  # Split for alpha handling and palette generation
+                f"[s0]format=yuv420p,drawbox=c=black:t=fill[bg];"  # Create black background
+                f"[bg][s1]overlay=alpha=straight[comp];"  # Overlay on black background, ignoring alpha
+                f"[comp]split[s3][s4];"  # Split composited stream for palette generation
+                f"[s3]palettegen=max_colors=64:stats_mode=single[p];"  # Fewer colors
+                f"[s4][p]paletteuse=dither=none"  # No dithering for smaller size
+            )
+            
+            result = self._run_sequence_gif(image_files, output_path, fps, filter_complex)
+            
+            if result.returncode == 0 and output_path.exists():
+                file_size_kb = output_path.stat().st_size / 1024
+                logger.debug(f"Optimized sequence animated thumbnail: {output_path} ({file_size_kb:.1f}KB)")
+                return True
+            
+            return False
+            
         except Exception as e:
             logger.error(f"Error optimizing sequence animated thumbnail: {e}")
             return False
@@ -926,6 +1302,7 @@ class FFmpegThumbnailGenerator:
                 
                 cmd = [
                     self.ffmpeg_path,
+                    *_FFMPEG_THREAD_ARGS,
                     '-ss', str(timestamp),
                     '-i', str(video_path),
                     '-vframes', '1',
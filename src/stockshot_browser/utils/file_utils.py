@@ -4,6 +4,7 @@ File system utilities for Stockshot Browser.
 
 import logging
 import os
+import stat
 from pathlib import Path
 from typing import List, Set, Optional, Tuple
 import hashlib
@@ -105,6 +106,31 @@ class FileUtils:
         
         return False
     
+    @staticmethod
+    def is_hidden_entry(entry: os.DirEntry) -> bool:
+        """
+        Check if a directory entry from os.scandir is hidden.
+        
+        Unlike is_hidden_file, this never stats outside Windows, and on Windows the
+        attributes come from the directory listing itself.
+        
+        Args:
+            entry: Entry to check
+            
+        Returns:
+            True if the entry is hidden
+        """
+        if entry.name.startswith('.'):
+            return True
+        
+        if os.name == 'nt':
+            try:
+                return bool(entry.stat().st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+            except (AttributeError, OSError):
+                pass
+        
+        return False
+    
     @staticmethod
     def filter_media_files(files: List[Path], video_extensions: Set[str],
                           image_extensions: Set[str]) -> Tuple[List[Path], List[Path]]:
@@ -203,6 +229,34 @@ class FileUtils:
         
         return total_size
     
+    @staticmethod
+    def sum_stats(entries) -> Tuple[int, Optional[int]]:
+        """
+        Get the total size and newest st_mtime_ns of DirEntries (or Paths).
+        
+        Entries that can no longer be stat'ed are skipped.
+        
+        Args:
+            entries: DirEntries or Paths, e.g. the frames of a sequence
+            
+        Returns:
+            Tuple of (total size in bytes, newest st_mtime_ns or None if none could be stat'ed)
+        """
+        try:
+            stats = [entry.stat() for entry in entries]
+        except OSError:
+            # A file vanished or is unreadable; stat the rest one by one
+            stats = []
+            for entry in entries:
+                try:
+                    stats.append(entry.stat())
+                except OSError:
+                    continue
+        
+        if not stats:
+            return 0, None
+        return sum(stat.st_size for stat in stats), max(stat.st_mtime_ns for stat in stats)
+    
     @staticmethod
     def find_files_by_pattern(directory: Path, pattern: str, recursive: bool = True) -> List[Path]:
         """
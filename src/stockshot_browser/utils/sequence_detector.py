@@ -3,11 +3,13 @@ Image sequence detection for Stockshot Browser.
 """
 
 import logging
+import os
 import re
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Set
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +27,16 @@ class SequenceInfo:
 
 
 class SequenceDetector:
-    """Detects and groups image sequences using configurable patterns."""
+    """Detects and groups image sequences using configurable patterns.
+    
+    Detection may run from several scan threads at once. Each call works on
+    one snapshot of the compiled patterns, which pattern edits replace as a
+    whole under a lock instead of modifying in place.
+    """
     
     def __init__(self, config_manager):
         self.config_manager = config_manager
+        self._pattern_lock = threading.Lock()
         
         # Get patterns from configuration
         self.default_patterns = self.config_manager.get('sequence_detection.default_patterns', [
@@ -41,6 +49,7 @@ class SequenceDetector:
         
         # Combine all patterns
         self.patterns = self.default_patterns + self.custom_patterns
+        self._compile_patterns()
         
         # Configuration
         self.min_sequence_length = self.config_manager.get('sequence_detection.min_sequence_length', 2)
@@ -50,6 +59,18 @@ class SequenceDetector:
                 '.exr', '.png', '.jpg', '.jpeg', '.tiff', '.tif', '.dpx'
             ])
         )
+    
+    def _compile_patterns(self) -> None:
+        """Compile the active patterns once instead of on every filename match."""
+        compiled_patterns = []
+        for pattern in self.patterns:
+            try:
+                compiled_patterns.append((pattern, re.compile(pattern, re.IGNORECASE).match))
+            except re.error as e:
+                logger.warning(f"Ignoring invalid sequence pattern {pattern!r}: {e}")
+        
+        # Rebind in one step so running detections keep the snapshot they started with
+        self._compiled_patterns = tuple(compiled_patterns)
             
     def detect_sequences(self, image_files: List[Path]) -> List[Dict]:
         """
@@ -74,7 +95,7 @@ class SequenceDetector:
             return []
         
         # Group files by sequence patterns
-        sequence_groups = self._group_files_by_pattern(supported_files)
+        sequence_groups = self._group_files_by_pattern(supported_files, self._compiled_patterns)
         
         # Process each group to create sequence info
         sequences = []
@@ -85,49 +106,102 @@ class SequenceDetector:
         
         return sequences
     
-    def _group_files_by_pattern(self, files: List[Path]) -> Dict[str, List[Dict]]:
+    def contiguous_frame_range(self, file_names: Iterable[str]) -> Optional[Tuple[int, int]]:
+        """
+        Get the frame range of file names forming a single gapless sequence.
+        
+        This is a cheap alternative to detect_sequences for folders expected to hold
+        one sequence. It only parses names and returns None whenever the names do not
+        form exactly one complete sequence, in which case detect_sequences is needed.
+        
+        Args:
+            file_names: File names (not paths) to check, as any iterable
+            
+        Returns:
+            (first_frame, last_frame) tuple, or None
+        """
+        compiled_patterns = self._compiled_patterns
+        sequence_key = None
+        frames = set()
+        file_count = 0
+        
+        for file_name in file_names:
+            file_count += 1
+            
+            if os.path.splitext(file_name)[1].lower() not in self.supported_extensions:
+                return None
+            
+            for pattern, match_pattern in compiled_patterns:
+                match = match_pattern(file_name)
+                if match and len(match.groups()) >= 3:
+                    base_name, frame_str, extension = match.groups()[:3]
+                    try:
+                        frame_number = int(frame_str)
+                    except ValueError:
+                        continue
+                    break
+            else:
+                return None
+            
+            # All files must belong to the same sequence
+            key = (base_name, extension, len(frame_str), pattern)
+            if sequence_key is None:
+                sequence_key = key
+            elif key != sequence_key:
+                return None
+            
+            frames.add(frame_number)
+        
+        if file_count < max(self.min_sequence_length, 1):
+            return None
+        
+        first_frame, last_frame = min(frames), max(frames)
+        if len(frames) != file_count or last_frame - first_frame + 1 != len(frames):
+            return None
+        
+        return first_frame, last_frame
+    
+    def _group_files_by_pattern(self, files: List[Path],
+                                compiled_patterns: Tuple[Tuple[str, Callable], ...]) -> Dict[str, List[Dict]]:
         """Group files by sequence patterns."""
         sequence_groups = defaultdict(list)
         unmatched_files = []
         
         for file_path in files:
             matched = False
+            file_name = file_path.name
             
-            for pattern in self.patterns:
-                try:
-                    match = re.match(pattern, file_path.name, re.IGNORECASE)
-                    if match:
-                        groups = match.groups()
-                        if len(groups) >= 3:  # base_name, frame_number, extension
-                            base_name = groups[0]
-                            frame_str = groups[1]
-                            extension = groups[2]
+            for pattern, match_pattern in compiled_patterns:
+                match = match_pattern(file_name)
+                if match:
+                    groups = match.groups()
+                    if len(groups) >= 3:  # base_name, frame_number, extension
+                        base_name = groups[0]
+                        frame_str = groups[1]
+                        extension = groups[2]
+                        
+                        try:
+                            frame_number = int(frame_str)
+                            padding = len(frame_str)
+                            
+                            # Create unique key for this sequence
+                            sequence_key = f"{base_name}_{extension}_{padding}_{pattern}"
                             
-                            try:
-                                frame_number = int(frame_str)
-                                padding = len(frame_str)
-                                
-                                # Create unique key for this sequence
-                                sequence_key = f"{base_name}_{extension}_{padding}_{pattern}"
-                                
-                                sequence_groups[sequence_key].append({
-                                    'file_path': file_path,
-                                    'base_name': base_name,
-                                    'frame_number': frame_number,
-                                    'frame_str': frame_str,
-                                    'extension': extension,
-                                    'padding': padding,
-                                    'pattern': pattern
-                                })
-                                
-                                matched = True
-                                break
-                                
-                            except ValueError:
-                                continue
-                                
-                except re.error as e:
-                    continue
+                            sequence_groups[sequence_key].append({
+                                'file_path': file_path,
+                                'base_name': base_name,
+                                'frame_number': frame_number,
+                                'frame_str': frame_str,
+                                'extension': extension,
+                                'padding': padding,
+                                'pattern': pattern
+                            })
+                            
+                            matched = True
+                            break
+                            
+                        except ValueError:
+                            continue
             
             if not matched:
                 unmatched_files.append(file_path)
@@ -217,16 +291,18 @@ class SequenceDetector:
             # Test the pattern
             re.compile(pattern)
             
-            if pattern not in self.patterns:
+            with self._pattern_lock:
+                if pattern in self.patterns:
+                    return False
                 self.patterns.append(pattern)
                 self.custom_patterns.append(pattern)
-                
-                # Update configuration
-                self.config_manager.set('sequence_detection.custom_patterns', self.custom_patterns, persist=True)
-                
-                return True
-            else:
-                return False
+                self._compile_patterns()
+                custom_patterns = list(self.custom_patterns)
+            
+            # Update configuration
+            self.config_manager.set('sequence_detection.custom_patterns', custom_patterns, persist=True)
+            
+            return True
                 
         except re.error as e:
             return False
@@ -241,16 +317,18 @@ class SequenceDetector:
         Returns:
             True if pattern was removed successfully
         """
-        if pattern in self.custom_patterns:
+        with self._pattern_lock:
+            if pattern not in self.custom_patterns:
+                return False
             self.custom_patterns.remove(pattern)
             self.patterns.remove(pattern)
-            
-            # Update configuration
-            self.config_manager.set('sequence_detection.custom_patterns', self.custom_patterns, persist=True)
-            
-            return True
-        else:
-            return False
+            self._compile_patterns()
+            custom_patterns = list(self.custom_patterns)
+        
+        # Update configuration
+        self.config_manager.set('sequence_detection.custom_patterns', custom_patterns, persist=True)
+        
+        return True
     
     def get_patterns(self) -> Dict[str, List[str]]:
         """Get all sequence detection patterns."""
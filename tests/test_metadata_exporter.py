@@ -0,0 +1,99 @@
+"""
+Tests that the JSON, CSV and XML project exports carry the same records.
+"""
+
+import csv
+import json
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from stockshot_browser.core.metadata_exporter import MetadataExporter
+from stockshot_browser.core.multi_entity_manager import EntityType, MediaEntity
+from stockshot_browser.database.metadata_store import upsert_entity_metadata
+from stockshot_browser.database.models import Base
+
+
+class _Database:
+    """Database manager stand-in handing out sessions on one engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @contextmanager
+    def get_session(self):
+        with Session(self.engine) as session:
+            yield session
+            session.commit()
+
+
+class _Config:
+    def get(self, key, default=None):
+        return default
+
+
+@pytest.fixture
+def exporter():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    extractions = [
+        ('/shots/a & b.mov', {'width': 1920, 'height': 1080, 'fps': 24.0, 'has_audio': True,
+                              'timecode': '01:00:00:00'}),
+        ('/shots/<plate>.mov', {'width': 4096, 'height': 2160, 'codec': 'prores'}),
+    ]
+    with Session(engine) as session:
+        upsert_entity_metadata(session, [
+            (MediaEntity(path=Path(path), entity_type=EntityType.VIDEO, name=Path(path).name,
+                         files=[Path(path)], mtime=1), metadata)
+            for path, metadata in extractions
+        ])
+        session.commit()
+    return MetadataExporter(_Database(engine), _Config())
+
+
+def _export(exporter, tmp_path, format):
+    output_path = tmp_path / f"export.{format}"
+    assert exporter.export_project_data(output_path, format=format)
+    return output_path
+
+
+@pytest.mark.unit
+def test_formats_export_the_same_entities(exporter, tmp_path):
+    with open(_export(exporter, tmp_path, 'json'), encoding='utf-8') as f:
+        json_entities = json.load(f)['entities']
+    with open(_export(exporter, tmp_path, 'csv'), newline='', encoding='utf-8') as f:
+        csv_entities = list(csv.DictReader(f))
+    xml_entities = [
+        {child.tag: child.text or '' for child in element}
+        for element in ET.parse(_export(exporter, tmp_path, 'xml')).getroot().find('entities')
+    ]
+
+    expected = [(str(entity['id']), entity['path'], entity['name']) for entity in json_entities]
+    assert [entity[1] for entity in expected] == ['/shots/a & b.mov', '/shots/<plate>.mov']
+    assert [(row['id'], row['path'], row['name']) for row in csv_entities] == expected
+    assert [(row['id'], row['path'], row['name']) for row in xml_entities] == expected
+    assert list(csv_entities[0]) == list(xml_entities[0]) == list(json_entities[0])
+
+
+@pytest.mark.unit
+def test_json_and_xml_export_the_same_metadata(exporter, tmp_path):
+    with open(_export(exporter, tmp_path, 'json'), encoding='utf-8') as f:
+        json_metadata = json.load(f)['metadata']
+    xml_metadata = [
+        {child.tag: child.text or '' for child in element}
+        for element in ET.parse(_export(exporter, tmp_path, 'xml')).getroot().find('metadata')
+    ]
+
+    # Stored custom fields are spliced into the JSON output as objects
+    assert json_metadata[0]['custom_fields'] == {'timecode': '01:00:00:00'}
+    assert json_metadata[1]['custom_fields'] is None
+    assert json.loads(xml_metadata[0]['custom_fields']) == {'timecode': '01:00:00:00'}
+
+    for json_row, xml_row in zip(json_metadata, xml_metadata):
+        for key in ('entity_id', 'width', 'height', 'codec', 'has_audio'):
+            value = json_row[key]
+            assert xml_row[key] == ('' if value is None else str(value))
@@ -0,0 +1,82 @@
+"""
+Regression tests for the batched metadata upserts.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from stockshot_browser.core.multi_entity_manager import EntityType, MediaEntity
+from stockshot_browser.database.metadata_store import upsert_entity_metadata
+from stockshot_browser.database.models import Base, Entity, Metadata
+
+
+@pytest.fixture
+def store_sequence():
+    """Store metadata dicts one after another for the same entity and return its row."""
+    def store(*extractions, mtimes=None):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        for index, metadata in enumerate(extractions):
+            entity = MediaEntity(
+                path=Path('/shots/a.mov'),
+                entity_type=EntityType.VIDEO,
+                name='a.mov',
+                files=[Path('/shots/a.mov')],
+                mtime=mtimes[index] if mtimes else None,
+            )
+            with Session(engine) as session:
+                upsert_entity_metadata(session, [(entity, metadata)])
+                session.commit()
+        with Session(engine) as session:
+            row = session.query(Metadata).one()
+            store.entity_mtime = session.query(Entity.mtime).scalar()
+            return row.has_audio, row.get_custom_fields()
+    return store
+
+
+@pytest.mark.unit
+def test_custom_fields_added_to_row_without_any(store_sequence):
+    has_audio, custom_fields = store_sequence(
+        {'width': 100, 'has_audio': True},
+        {'width': 100, 'has_audio': True, 'pix_fmt': 'yuv420p'},
+    )
+    assert custom_fields == {'pix_fmt': 'yuv420p'}
+
+
+@pytest.mark.unit
+def test_custom_fields_are_merged(store_sequence):
+    _, custom_fields = store_sequence(
+        {'width': 100, 'pix_fmt': 'yuv420p'},
+        {'width': 100, 'timecode': '01:00:00:00'},
+    )
+    assert custom_fields == {'pix_fmt': 'yuv420p', 'timecode': '01:00:00:00'}
+
+
+@pytest.mark.unit
+def test_missing_audio_info_keeps_stored_has_audio(store_sequence):
+    has_audio, _ = store_sequence(
+        {'width': 100, 'has_audio': True},
+        {'width': 100, 'foo': 'bar'},
+    )
+    assert has_audio is True
+
+
+@pytest.mark.unit
+def test_missing_audio_info_defaults_to_no_audio(store_sequence):
+    has_audio, _ = store_sequence({'width': 100})
+    assert has_audio is False
+
+
+@pytest.mark.unit
+def test_has_audio_string_flag_is_coerced(store_sequence):
+    has_audio, _ = store_sequence({'width': 100, 'has_audio': 'false'})
+    assert has_audio is False
+
+
+@pytest.mark.unit
+def test_changed_source_mtime_is_recorded(store_sequence):
+    store_sequence({'width': 100}, {'width': 100}, mtimes=[1, 2])
+    assert store_sequence.entity_mtime == 2
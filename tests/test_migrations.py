@@ -0,0 +1,103 @@
+"""
+Tests for the schema migrations that back the metadata upserts.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from stockshot_browser.core.multi_entity_manager import EntityType, MediaEntity
+from stockshot_browser.database.metadata_store import upsert_entity_metadata
+from stockshot_browser.database.migrations import apply_migrations, migrate_v4_to_v5
+from stockshot_browser.database.models import Base, Entity, Favorite, Metadata, Thumbnail
+
+
+@pytest.fixture
+def v3_engine():
+    """A database from before migrate_v3_to_v4: no unique (path, entity_type) index and no mtime.
+    
+    schema_version records the last applied migration, which was migrate_v2_to_v3.
+    """
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_entity_path_type"))
+
+    with Session(engine) as session:
+        kept = Entity(id=1, path='/shots/a.mov', entity_type='video', name='a.mov')
+        other = Entity(id=2, path='/shots/b.mov', entity_type='video', name='b.mov')
+        duplicate = Entity(id=3, path='/shots/a.mov', entity_type='video', name='a.mov')
+        session.add_all([kept, other, duplicate])
+        session.flush()
+
+        # The kept row's metadata wins; rows only the duplicate has are moved over
+        session.add_all([
+            Metadata(entity_id=1, width=1920),
+            Metadata(entity_id=3, width=640),
+            Thumbnail(entity_id=3, path='/cache/a_256.jpg', resolution=256),
+            Favorite(entity_id=3, user_id='artist'),
+        ])
+        session.commit()
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE entities DROP COLUMN mtime"))
+        conn.execute(text("CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at TIMESTAMP)"))
+        conn.execute(text("INSERT INTO schema_version (version) VALUES (2)"))
+    return engine
+
+
+@pytest.mark.unit
+def test_v3_duplicates_are_merged_into_oldest_entity(v3_engine):
+    apply_migrations(v3_engine)
+
+    with Session(v3_engine) as session:
+        assert session.query(Entity.id).order_by(Entity.id).all() == [(1,), (2,)]
+        assert session.query(Metadata.entity_id, Metadata.width).all() == [(1, 1920)]
+        assert session.query(Thumbnail.entity_id).all() == [(1,)]
+        assert session.query(Favorite.entity_id, Favorite.user_id).all() == [(1, 'artist')]
+
+
+@pytest.mark.unit
+def test_v4_unique_index_rejects_duplicates(v3_engine):
+    apply_migrations(v3_engine)
+
+    indexes = {index['name']: index for index in inspect(v3_engine).get_indexes('entities')}
+    assert indexes['ix_entity_path_type']['unique']
+
+    with pytest.raises(IntegrityError):
+        with v3_engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO entities (path, entity_type, name, created_at, updated_at)
+                VALUES ('/shots/b.mov', 'video', 'b.mov', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            """))
+
+
+@pytest.mark.unit
+def test_v5_adds_mtime_used_by_upserts(v3_engine):
+    apply_migrations(v3_engine)
+
+    columns = {column['name'] for column in inspect(v3_engine).get_columns('entities')}
+    assert 'mtime' in columns
+    with v3_engine.connect() as conn:
+        assert conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() == 4
+
+    # Re-running the migration on an up-to-date table is a no-op
+    migrate_v4_to_v5(v3_engine)
+
+    entity = MediaEntity(
+        path=Path('/shots/a.mov'),
+        entity_type=EntityType.VIDEO,
+        name='a.mov',
+        files=[Path('/shots/a.mov')],
+        mtime=1234,
+    )
+    with Session(v3_engine) as session:
+        upsert_entity_metadata(session, [(entity, {'width': 1280})])
+        session.commit()
+
+    with Session(v3_engine) as session:
+        assert session.query(Entity.id, Entity.mtime).filter(Entity.path == '/shots/a.mov').all() == [(1, 1234)]
+        assert session.query(Metadata.width).filter(Metadata.entity_id == 1).scalar() == 1280
@@ -0,0 +1,67 @@
+"""
+Tests for the configured-path prefix index of the path context manager.
+"""
+
+import pytest
+
+from stockshot_browser.core.path_context_manager import ContextType, PathContextManager
+
+
+class _Config:
+    """Configuration stand-in with user and project configured paths."""
+
+    def __init__(self, user_paths, project_paths):
+        self.user_config = {'directory_tree': {'configured_paths': user_paths}}
+        self.project_config = {'directory_tree': {'configured_paths': project_paths}}
+
+    def get_user_config(self):
+        return self.user_config
+
+    def get_project_config(self):
+        return self.project_config
+
+    def get(self, key, default=None):
+        return default
+
+
+@pytest.fixture
+def library(tmp_path):
+    """A tree with a project path that contains a user path."""
+    for directory in ('shows/show_a/user_picks', 'shows/show_b', 'other'):
+        (tmp_path / directory).mkdir(parents=True)
+    manager = PathContextManager(_Config(
+        user_paths=[str(tmp_path / 'shows/show_a/user_picks')],
+        project_paths=[str(tmp_path / 'shows')],
+    ))
+    return tmp_path, manager
+
+
+@pytest.mark.unit
+def test_configured_paths_below(library):
+    root, manager = library
+
+    assert manager.has_configured_paths_below(str(root))
+    assert manager.has_configured_paths_below(str(root / 'shows'))
+    assert manager.has_configured_paths_below(str(root / 'shows/show_a'))
+
+
+@pytest.mark.unit
+def test_no_configured_paths_below(library):
+    root, manager = library
+
+    # A configured path itself does not count as being below it
+    assert not manager.has_configured_paths_below(str(root / 'shows/show_a/user_picks'))
+    assert not manager.has_configured_paths_below(str(root / 'shows/show_b'))
+    assert not manager.has_configured_paths_below(str(root / 'other'))
+    # Sibling names sharing a string prefix are not descendants
+    assert not manager.has_configured_paths_below(str(root / 'shows/show'))
+
+
+@pytest.mark.unit
+def test_context_follows_nearest_configured_prefix(library):
+    root, manager = library
+
+    assert manager.get_context_for_path(str(root / 'shows/show_a/user_picks/clip.mov')) == ContextType.USER
+    assert manager.get_context_for_path(str(root / 'shows/show_b/clip.mov')) == ContextType.PROJECT
+    assert manager.get_context_for_path(str(root / 'shows_old/clip.mov')) == ContextType.GENERAL
+    assert manager.get_context_for_path(str(root / 'other')) == ContextType.GENERAL
@@ -0,0 +1,70 @@
+"""
+Tests for the single-sequence fast path of the sequence detector.
+"""
+
+import pytest
+
+from stockshot_browser.utils.sequence_detector import SequenceDetector
+
+
+class _Config:
+    """Configuration stand-in that returns the caller's default for unset keys."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value, persist=False):
+        self.values[key] = value
+
+
+@pytest.fixture
+def detector():
+    return SequenceDetector(_Config())
+
+
+@pytest.mark.unit
+def test_gapless_sequence_gives_its_range(detector):
+    names = [f"shot.{frame:04d}.exr" for frame in range(1001, 1011)]
+    assert detector.contiguous_frame_range(reversed(names)) == (1001, 1010)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('names', [
+    # Missing frame
+    ['shot.1001.exr', 'shot.1002.exr', 'shot.1004.exr'],
+    # Two sequences in one folder
+    ['shot.1001.exr', 'shot.1002.exr', 'plate.1001.exr', 'plate.1002.exr'],
+    # Mixed frame padding
+    ['shot.1001.exr', 'shot.01002.exr'],
+    # A file that is not a frame
+    ['shot.1001.exr', 'shot.1002.exr', 'notes.txt'],
+    # Shorter than min_sequence_length
+    ['shot.1001.exr'],
+    [],
+])
+def test_anything_but_one_complete_sequence_gives_none(detector, names):
+    assert detector.contiguous_frame_range(names) is None
+
+
+@pytest.mark.unit
+def test_range_agrees_with_detect_sequences(detector, tmp_path):
+    files = [tmp_path / f"shot_{frame:04d}.png" for frame in range(1, 25)]
+    sequences = detector.detect_sequences(files)
+
+    assert len(sequences) == 1
+    assert detector.contiguous_frame_range(f.name for f in files) == tuple(sequences[0]['frame_range'])
+
+
+@pytest.mark.unit
+def test_custom_pattern_edits_apply_to_later_calls(detector):
+    names = ['shot-f001.exr', 'shot-f002.exr']
+    assert detector.contiguous_frame_range(names) is None
+
+    assert detector.add_custom_pattern(r"(.+)-f(\d{3})\.(exr)$")
+    assert detector.contiguous_frame_range(names) == (1, 2)
+
+    assert detector.remove_custom_pattern(r"(.+)-f(\d{3})\.(exr)$")
+    assert detector.contiguous_frame_range(names) is None
@@ -0,0 +1,70 @@
+"""
+Tests for the batched thumbnail record upserts.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from stockshot_browser.core.multi_entity_manager import EntityType, MediaEntity
+from stockshot_browser.core.multi_thumbnail_manager import MultiThumbnailManager
+from stockshot_browser.database.models import Base, Entity, Thumbnail
+
+
+def _entity(name):
+    path = Path('/shots') / name
+    return MediaEntity(path=path, entity_type=EntityType.VIDEO, name=name, files=[path])
+
+
+@pytest.fixture
+def store_batches():
+    """Store batches of (entity, thumbnail_path, generation_time, source_frame,
+    file_size, animated_path) records and return the stored thumbnail rows."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    manager = SimpleNamespace(default_resolution=256)
+
+    def store(*batches):
+        for records in batches:
+            with Session(engine) as session:
+                MultiThumbnailManager._store_batch_in_session(manager, session, records)
+                session.commit()
+        with Session(engine) as session:
+            assert session.query(Entity).filter(Entity.thumbnail_generated.is_not(True)).count() == 0
+            return {
+                entity_path: (thumbnail_path, source_frame, extra_data)
+                for entity_path, thumbnail_path, source_frame, extra_data in session.query(
+                    Entity.path, Thumbnail.path, Thumbnail.source_frame, Thumbnail.extra_data
+                ).join(Thumbnail, Thumbnail.entity_id == Entity.id)
+            }
+    return store
+
+
+@pytest.mark.unit
+def test_one_row_per_entity_and_last_record_wins(store_batches):
+    rows = store_batches([
+        (_entity('a.mov'), '/cache/a_1.jpg', 0.5, 1.0, 100, None),
+        (_entity('b.mov'), '/cache/b.jpg', 0.5, 2.0, 100, '/cache/b.gif'),
+        (_entity('a.mov'), '/cache/a_2.jpg', 0.5, 3.0, 100, None),
+    ])
+    assert rows == {
+        '/shots/a.mov': ('/cache/a_2.jpg', 3.0, None),
+        '/shots/b.mov': ('/cache/b.jpg', 2.0, {'animated_path': '/cache/b.gif'}),
+    }
+
+
+@pytest.mark.unit
+def test_later_batches_update_existing_rows(store_batches):
+    rows = store_batches(
+        [(_entity('a.mov'), '/cache/a.jpg', 0.5, 1.0, 100, '/cache/a.gif')],
+        # Regenerated without an animated thumbnail: the stored animated path is kept
+        [(_entity('a.mov'), '/cache/a.jpg', 0.5, 4.0, 100, None),
+         (_entity('c.mov'), '/cache/c.jpg', 0.5, 1.0, 100, None)],
+    )
+    assert rows == {
+        '/shots/a.mov': ('/cache/a.jpg', 4.0, {'animated_path': '/cache/a.gif'}),
+        '/shots/c.mov': ('/cache/c.jpg', 1.0, None),
+    }